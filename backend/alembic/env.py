@@ -8,16 +8,21 @@ from alembic import context
 from app.core.config import get_settings
 from app.db.base import Base
 from app.models import (  # noqa: F401
+    cache_version,
+    explore_poi_heat,
     itinerary,
     itinerary_collab,
     itinerary_diff_action,
     itinerary_fork,
     itinerary_item,
+    itinerary_popularity,
     itinerary_snapshot,
+    job_watermark,
     poi,
     poi_correction,
     poi_correction_notification,
     poi_correction_type,
+    poi_resolution_cache,
     poi_ticket_rule,
     pricing_audience,
     territory,
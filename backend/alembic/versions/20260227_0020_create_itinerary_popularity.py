@@ -0,0 +1,73 @@
+"""create itinerary popularity
+
+Revision ID: 20260227_0020
+Revises: 20260226_0019
+Create Date: 2026-02-27 00:20:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260227_0020"
+down_revision: str | None = "20260226_0019"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "itinerary_popularity",
+        sa.Column("itinerary_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("forked_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("view_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_viewed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["itinerary_id"], ["itineraries.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("itinerary_id"),
+    )
+    op.create_index(
+        "ix_itinerary_popularity_rank",
+        "itinerary_popularity",
+        ["forked_count", "view_count"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_itineraries_public_created_at",
+        "itineraries",
+        [sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("status = 'published' AND visibility = 'public'"),
+    )
+    op.execute(
+        """
+        INSERT INTO itinerary_popularity (itinerary_id, forked_count, view_count, last_viewed_at)
+        SELECT
+            i.id,
+            COALESCE(f.forked_count, 0),
+            COALESCE(v.view_count, 0),
+            v.last_viewed_at
+        FROM itineraries i
+        LEFT JOIN (
+            SELECT source_itinerary_id, COUNT(*) AS forked_count
+            FROM itinerary_forks
+            GROUP BY source_itinerary_id
+        ) f ON f.source_itinerary_id = i.id
+        LEFT JOIN (
+            SELECT itinerary_id, SUM(view_count) AS view_count, MAX(last_viewed_at) AS last_viewed_at
+            FROM itinerary_visit_logs
+            GROUP BY itinerary_id
+        ) v ON v.itinerary_id = i.id
+        WHERE f.forked_count IS NOT NULL OR v.view_count IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_itineraries_public_created_at", table_name="itineraries")
+    op.drop_index("ix_itinerary_popularity_rank", table_name="itinerary_popularity")
+    op.drop_table("itinerary_popularity")
@@ -0,0 +1,31 @@
+"""itinerary popularity score index
+
+Revision ID: 20260227_0021
+Revises: 20260227_0020
+Create Date: 2026-02-27 00:21:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260227_0021"
+down_revision: str | None = "20260227_0020"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_itinerary_popularity_score",
+        "itinerary_popularity",
+        [sa.text("(forked_count + view_count)")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_itinerary_popularity_score", table_name="itinerary_popularity")
@@ -0,0 +1,53 @@
+"""create explore poi heat aggregate
+
+Revision ID: 20260228_0022
+Revises: 20260227_0021
+Create Date: 2026-02-28 00:22:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260228_0022"
+down_revision: str | None = "20260227_0021"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "explore_poi_heat",
+        sa.Column("poi_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.Column("longitude", sa.Numeric(10, 7), nullable=False),
+        sa.Column("latitude", sa.Numeric(10, 7), nullable=False),
+        sa.Column("heat_score", sa.Integer(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["poi_id"], ["pois.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("poi_id"),
+    )
+    op.create_index(op.f("ix_explore_poi_heat_heat_score"), "explore_poi_heat", ["heat_score"], unique=False)
+    op.create_index("ix_explore_poi_heat_lon_lat", "explore_poi_heat", ["longitude", "latitude"], unique=False)
+    op.execute(
+        """
+        INSERT INTO explore_poi_heat (poi_id, name, longitude, latitude, heat_score)
+        SELECT p.id, p.name, ST_X(p.geom), ST_Y(p.geom), SUM(v.view_count)
+        FROM pois p
+        JOIN itinerary_items ii ON ii.poi_id = p.id
+        JOIN itineraries i ON i.id = ii.itinerary_id
+        JOIN itinerary_visit_logs v ON v.itinerary_id = i.id
+        WHERE i.status = 'published' AND i.visibility = 'public'
+        GROUP BY p.id, p.name, p.geom
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_explore_poi_heat_lon_lat", table_name="explore_poi_heat")
+    op.drop_index(op.f("ix_explore_poi_heat_heat_score"), table_name="explore_poi_heat")
+    op.drop_table("explore_poi_heat")
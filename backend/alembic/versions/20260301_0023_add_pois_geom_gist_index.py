@@ -0,0 +1,30 @@
+"""add pois geom gist index
+
+Revision ID: 20260301_0023
+Revises: 20260228_0022
+Create Date: 2026-03-01 00:23:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260301_0023"
+down_revision: str | None = "20260228_0022"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_pois_geom_gist",
+        "pois",
+        ["geom"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pois_geom_gist", table_name="pois")
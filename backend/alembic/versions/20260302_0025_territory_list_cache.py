@@ -0,0 +1,43 @@
+"""territory list cache versions and precomputed region wkt
+
+Revision ID: 20260302_0025
+Revises: 20260301_0024
+Create Date: 2026-03-02 00:25:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260302_0025"
+down_revision: str | None = "20260301_0024"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_versions",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.add_column("territory_regions", sa.Column("boundary_wkt", sa.Text(), nullable=True))
+    op.add_column("territory_regions", sa.Column("centroid_wkt", sa.Text(), nullable=True))
+    op.execute(
+        """
+        UPDATE territory_regions
+        SET boundary_wkt = ST_AsText(boundary_geom),
+            centroid_wkt = ST_AsText(centroid_geom)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("territory_regions", "centroid_wkt")
+    op.drop_column("territory_regions", "boundary_wkt")
+    op.drop_table("cache_versions")
@@ -0,0 +1,25 @@
+"""add pois geography gist index for nearby search
+
+Revision ID: 20260303_0026
+Revises: 20260302_0025
+Create Date: 2026-03-03 00:26:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260303_0026"
+down_revision: str | None = "20260302_0025"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Matches CAST(pois.geom AS GEOGRAPHY) so ST_DWithin / <-> in meters can use the index.
+    op.execute("CREATE INDEX ix_pois_geog_gist ON pois USING gist ((geom::geography))")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pois_geog_gist", table_name="pois")
@@ -0,0 +1,36 @@
+"""add bounty task keyset pagination indexes
+
+Revision ID: 20260303_0027
+Revises: 20260303_0026
+Create Date: 2026-03-03 00:27:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260303_0027"
+down_revision: str | None = "20260303_0026"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_bounty_tasks_status_generated",
+        "bounty_tasks",
+        ["status", "generated_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_bounty_tasks_claimer_generated",
+        "bounty_tasks",
+        ["claimed_by_user_id", "generated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bounty_tasks_claimer_generated", table_name="bounty_tasks")
+    op.drop_index("ix_bounty_tasks_status_generated", table_name="bounty_tasks")
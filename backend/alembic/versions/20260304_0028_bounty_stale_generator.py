@@ -0,0 +1,59 @@
+"""unique active bounty task per poi and pois updated_at index
+
+Revision ID: 20260304_0028
+Revises: 20260303_0027
+Create Date: 2026-03-04 00:28:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260304_0028"
+down_revision: str | None = "20260303_0027"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # The partial unique index allows one active task per POI. For POIs with several, keep
+    # the one furthest along (submitted, then claimed, then open; oldest first on ties) and
+    # expire the rest, whatever their status.
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT
+                id,
+                row_number() OVER (
+                    PARTITION BY poi_id
+                    ORDER BY
+                        CASE status WHEN 'submitted' THEN 0 WHEN 'claimed' THEN 1 ELSE 2 END,
+                        generated_at,
+                        id
+                ) AS position
+            FROM bounty_tasks
+            WHERE status IN ('open', 'claimed', 'submitted')
+        )
+        UPDATE bounty_tasks AS t
+        SET status = 'expired'
+        FROM ranked
+        WHERE ranked.id = t.id
+          AND ranked.position > 1
+        """
+    )
+    op.create_index(
+        "uq_bounty_tasks_active_poi",
+        "bounty_tasks",
+        ["poi_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('open', 'claimed', 'submitted')"),
+    )
+    op.create_index("ix_pois_updated_at", "pois", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pois_updated_at", table_name="pois")
+    op.drop_index("uq_bounty_tasks_active_poi", table_name="bounty_tasks")
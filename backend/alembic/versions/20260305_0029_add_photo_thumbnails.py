@@ -0,0 +1,32 @@
+"""add photo thumbnail columns to bounty submissions and poi corrections
+
+Revision ID: 20260305_0029
+Revises: 20260304_0028
+Create Date: 2026-03-05 00:29:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260305_0029"
+down_revision: str | None = "20260304_0028"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_TABLES = ("bounty_submissions", "poi_corrections")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.add_column(table, sa.Column("photo_thumbnail_url", sa.String(length=512), nullable=True))
+        op.add_column(table, sa.Column("photo_thumbnail_storage_key", sa.String(length=512), nullable=True))
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_column(table, "photo_thumbnail_storage_key")
+        op.drop_column(table, "photo_thumbnail_url")
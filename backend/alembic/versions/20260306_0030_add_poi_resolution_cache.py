@@ -0,0 +1,46 @@
+"""add poi resolution cache and lower(name) index on pois
+
+Revision ID: 20260306_0030
+Revises: 20260305_0029
+Create Date: 2026-03-06 00:30:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260306_0030"
+down_revision: str | None = "20260305_0029"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Matches lower(pois.name) IN (...) in the AI preview batch lookup.
+    op.execute("CREATE INDEX ix_pois_lower_name ON pois (lower(name))")
+
+    op.create_table(
+        "poi_resolution_cache",
+        sa.Column("name_key", sa.String(length=128), nullable=False),
+        sa.Column("city_key", sa.String(length=64), nullable=False),
+        sa.Column("found", sa.Boolean(), nullable=False),
+        sa.Column("resolved_name", sa.String(length=128), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("address", sa.String(length=255), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("name_key", "city_key"),
+    )
+    op.create_index(
+        "ix_poi_resolution_cache_expires_at", "poi_resolution_cache", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_poi_resolution_cache_expires_at", table_name="poi_resolution_cache")
+    op.drop_table("poi_resolution_cache")
+    op.drop_index("ix_pois_lower_name", table_name="pois")
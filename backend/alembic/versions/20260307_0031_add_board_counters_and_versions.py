@@ -0,0 +1,75 @@
+"""add board lane counters, board versions and tombstones for delta polling
+
+Revision ID: 20260307_0031
+Revises: 20260306_0030
+Create Date: 2026-03-07 00:31:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260307_0031"
+down_revision: str | None = "20260306_0030"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "itinerary_board_lanes",
+        sa.Column("itinerary_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("lane_key", sa.String(length=32), nullable=False),
+        sa.Column("block_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("done_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("blocked_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["itinerary_id"], ["itineraries.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("itinerary_id", "lane_key"),
+    )
+    op.execute(
+        """
+        INSERT INTO itinerary_board_lanes (itinerary_id, lane_key, block_count, done_count, blocked_count)
+        SELECT itinerary_id,
+               lane_key,
+               count(*),
+               count(*) FILTER (WHERE status = 'done'),
+               count(*) FILTER (WHERE status = 'blocked')
+        FROM itinerary_blocks
+        GROUP BY itinerary_id, lane_key
+        """
+    )
+
+    op.create_table(
+        "itinerary_board_tombstones",
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("itinerary_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("entity_type", sa.String(length=8), nullable=False),
+        sa.Column("board_version", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["itinerary_id"], ["itineraries.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("entity_id"),
+    )
+    op.create_index(
+        "ix_itinerary_board_tombstones_itinerary_version",
+        "itinerary_board_tombstones",
+        ["itinerary_id", "board_version"],
+        unique=False,
+    )
+
+    for table in ("itinerary_blocks", "itinerary_block_edges"):
+        op.add_column(table, sa.Column("board_version", sa.BigInteger(), server_default="0", nullable=False))
+        op.create_index(f"ix_{table}_itinerary_board_version", table, ["itinerary_id", "board_version"])
+
+
+def downgrade() -> None:
+    for table in ("itinerary_block_edges", "itinerary_blocks"):
+        op.drop_index(f"ix_{table}_itinerary_board_version", table_name=table)
+        op.drop_column(table, "board_version")
+    op.drop_index("ix_itinerary_board_tombstones_itinerary_version", table_name="itinerary_board_tombstones")
+    op.drop_table("itinerary_board_tombstones")
+    op.drop_table("itinerary_board_lanes")
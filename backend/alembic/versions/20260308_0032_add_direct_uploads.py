@@ -0,0 +1,51 @@
+"""add direct_uploads for single-use upload tokens
+
+Revision ID: 20260308_0032
+Revises: 20260307_0031
+Create Date: 2026-03-08 00:32:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260308_0032"
+down_revision: str | None = "20260307_0031"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "direct_uploads",
+        sa.Column("jti", sa.String(length=64), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("content_type", sa.String(length=32), nullable=False),
+        sa.Column("storage_key", sa.String(length=512), nullable=True),
+        sa.Column("url", sa.String(length=512), nullable=True),
+        sa.Column("thumbnail_storage_key", sa.String(length=512), nullable=True),
+        sa.Column("thumbnail_url", sa.String(length=512), nullable=True),
+        sa.Column("size", sa.Integer(), nullable=True),
+        sa.Column("exif_captured_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("exif_longitude", sa.Float(), nullable=True),
+        sa.Column("exif_latitude", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(
+        "ix_direct_uploads_user_storage_key",
+        "direct_uploads",
+        ["user_id", "storage_key"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_direct_uploads_user_storage_key", table_name="direct_uploads")
+    op.drop_table("direct_uploads")
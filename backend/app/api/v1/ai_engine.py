@@ -16,12 +16,12 @@ router = APIRouter(prefix="/ai", tags=["ai"])
 
 
 @router.post("/preview", response_model=AiPreviewResponse)
-def preview_ai_plan_api(
+async def preview_ai_plan_api(
     payload: AiPreviewRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> AiPreviewResponse:
-    return preview_ai_plan(db, payload, current_user)
+    return await preview_ai_plan(db, payload, current_user)
 
 
 @router.post("/import", response_model=AiImportResponse)
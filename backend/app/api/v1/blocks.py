@@ -1,6 +1,8 @@
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
@@ -11,12 +13,16 @@ from app.schemas.block import (
     BlockDependencyCreate,
     BlockDependencyResponse,
     BlockLayoutUpdate,
+    BlockOpsRequest,
+    BlockOpsResponse,
     BlockReorderRequest,
     BlockResponse,
     BlockTreeResponse,
     BlockUpdate,
     BoardAutoLayoutResponse,
     BoardResponse,
+    BoardSummaryResponse,
+    DependencyScheduleResponse,
 )
 from app.security.deps import get_current_user
 from app.services import block_service
@@ -24,6 +30,12 @@ from app.services import block_service
 router = APIRouter(prefix="/itineraries", tags=["blocks"])
 
 
+def _json_response(payload: Any) -> Response:
+    # Tree and board payloads come straight from the service in `BlockResponse` field order,
+    # so they are encoded directly instead of being re-validated through the response models.
+    return Response(orjson.dumps(payload, option=orjson.OPT_UTC_Z), media_type="application/json")
+
+
 @router.get("/{itinerary_id}/blocks", response_model=BlockTreeResponse)
 def get_blocks(
     itinerary_id: UUID,
@@ -31,17 +43,39 @@ def get_blocks(
     db: Session = Depends(get_db),
 ):
     tree = block_service.list_block_tree(db, itinerary_id)
-    return BlockTreeResponse(items=[BlockResponse(**b) for b in tree])
+    return _json_response({"items": tree})
 
 
 @router.get("/{itinerary_id}/board", response_model=BoardResponse)
 def get_board(
+    itinerary_id: UUID,
+    since: int | None = Query(default=None, ge=0),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    payload = block_service.list_board(db, itinerary_id, since=since)
+    return _json_response(payload)
+
+
+@router.get("/{itinerary_id}/board/summary", response_model=BoardSummaryResponse)
+def get_board_summary(
+    itinerary_id: UUID,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return BoardSummaryResponse(**block_service.get_board_summary(db, itinerary_id))
+
+
+@router.get("/{itinerary_id}/board/schedule", response_model=DependencyScheduleResponse)
+def get_board_schedule(
     itinerary_id: UUID,
     user=Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    payload = block_service.list_board(db, itinerary_id)
-    return BoardResponse(**payload)
+    try:
+        return DependencyScheduleResponse(**block_service.get_dependency_schedule(db, itinerary_id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/{itinerary_id}/blocks", response_model=BlockResponse, status_code=201)
@@ -154,6 +188,20 @@ def reorder_blocks(
     )
 
 
+@router.post("/{itinerary_id}/blocks/ops", response_model=BlockOpsResponse)
+def apply_block_ops(
+    itinerary_id: UUID,
+    data: BlockOpsRequest,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        updated_count = block_service.apply_block_ops(db, itinerary_id, data.ops)
+        return BlockOpsResponse(itinerary_id=itinerary_id, updated_count=updated_count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/{itinerary_id}/board/auto-layout", response_model=BoardAutoLayoutResponse)
 def auto_layout_board(
     itinerary_id: UUID,
@@ -27,6 +27,7 @@ def list_bounty_tasks_api(
     scope: str = Query(default="all", pattern="^(all|nearby|mine)$"),
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, max_length=128),
     longitude: float | None = Query(default=None),
     latitude: float | None = Query(default=None),
     db: Session = Depends(get_db),
@@ -38,6 +39,7 @@ def list_bounty_tasks_api(
         scope=scope,
         offset=offset,
         limit=limit,
+        cursor=cursor,
         longitude=longitude,
         latitude=latitude,
     )
@@ -58,7 +60,8 @@ async def submit_bounty_task_api(
     submit_longitude: float = Form(...),
     submit_latitude: float = Form(...),
     details: str | None = Form(default=None),
-    photo: UploadFile = File(...),
+    photo: UploadFile | None = File(default=None),
+    photo_storage_key: str | None = Form(default=None, min_length=1, max_length=512),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> BountySubmitResponse:
@@ -70,6 +73,7 @@ async def submit_bounty_task_api(
         submit_latitude=submit_latitude,
         details=details,
         photo=photo,
+        photo_storage_key=photo_storage_key,
     )
 
 
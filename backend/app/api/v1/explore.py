@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.itinerary import (
+    ExploreHeatGridResponse,
     ExploreHeatPointListResponse,
     ExploreRecommendationListResponse,
     ExploreVisitLogResponse,
@@ -21,6 +22,7 @@ from app.services.itinerary_service import (
     get_public_itinerary,
     get_public_itinerary_share_meta,
     list_explore_heatmap,
+    list_explore_heatmap_grid,
     list_explore_recommendations,
     list_public_items_with_poi,
     list_public_itineraries,
@@ -47,6 +49,25 @@ def list_explore_heatmap_api(
     return list_explore_heatmap(db, limit)
 
 
+@router.get("/heatmap/grid", response_model=ExploreHeatGridResponse)
+def list_explore_heatmap_grid_api(
+    min_longitude: float = Query(ge=-180, le=180),
+    min_latitude: float = Query(ge=-90, le=90),
+    max_longitude: float = Query(ge=-180, le=180),
+    max_latitude: float = Query(ge=-90, le=90),
+    zoom: int = Query(default=10, ge=0, le=20),
+    db: Session = Depends(get_db),
+) -> ExploreHeatGridResponse:
+    return list_explore_heatmap_grid(
+        db,
+        min_longitude=min_longitude,
+        min_latitude=min_latitude,
+        max_longitude=max_longitude,
+        max_latitude=max_latitude,
+        zoom=zoom,
+    )
+
+
 @router.get("/recommendations", response_model=ExploreRecommendationListResponse)
 def list_explore_recommendations_api(
     limit: int = Query(default=12, ge=1, le=60),
@@ -1,7 +1,10 @@
+from typing import Any
+
 from fastapi import APIRouter, status
 from fastapi.responses import JSONResponse
 
 from app.db.session import check_database_ready
+from app.services.collab_runtime import get_collab_runtime
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -23,3 +26,8 @@ def ready() -> JSONResponse:
     if db_ok:
         return JSONResponse(content=payload, status_code=status.HTTP_200_OK)
     return JSONResponse(content=payload, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@router.get("/collab", status_code=status.HTTP_200_OK)
+def collab() -> dict[str, Any]:
+    return get_collab_runtime().metrics()
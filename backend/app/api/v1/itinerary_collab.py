@@ -12,7 +12,8 @@ from fastapi import (
 )
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal, get_db
+from app.db.async_session import AsyncSessionLocal
+from app.db.session import get_db
 from app.models.itinerary_collab import ItineraryCollabSession
 from app.models.user import User
 from app.schemas.itinerary_collab import (
@@ -107,14 +108,16 @@ async def itinerary_collab_ws_api(websocket: WebSocket, itinerary_id: UUID) -> N
     conn = None
     runtime = get_collab_runtime()
 
-    with SessionLocal() as db:
+    async with AsyncSessionLocal() as db:
         try:
-            identity = resolve_collab_identity(
-                db,
-                itinerary_id,
-                auth_token=auth_token,
-                collab_grant=collab_grant,
-                collab_token=collab_token,
+            identity = await db.run_sync(
+                lambda session: resolve_collab_identity(
+                    session,
+                    itinerary_id,
+                    auth_token=auth_token,
+                    collab_grant=collab_grant,
+                    collab_token=collab_token,
+                )
             )
         except HTTPException as exc:
             await websocket.send_json({"type": "collab:error", "message": str(exc.detail)})
@@ -124,11 +127,13 @@ async def itinerary_collab_ws_api(websocket: WebSocket, itinerary_id: UUID) -> N
             await websocket.send_json({"type": "collab:error", "message": "collab auth failed"})
             await websocket.close(code=1011)
             return
-        session_row = create_collab_session(
-            db,
-            itinerary_id=itinerary_id,
-            connection_id="pending",
-            identity=identity,
+        session_row = await db.run_sync(
+            lambda session: create_collab_session(
+                session,
+                itinerary_id=itinerary_id,
+                connection_id="pending",
+                identity=identity,
+            )
         )
 
     try:
@@ -138,18 +143,18 @@ async def itinerary_collab_ws_api(websocket: WebSocket, itinerary_id: UUID) -> N
             identity=identity,
             session_id=session_row.id,
         )
-        with SessionLocal() as db:
-            session_db = db.get(ItineraryCollabSession, session_row.id)
+        async with AsyncSessionLocal() as db:
+            session_db = await db.get(ItineraryCollabSession, session_row.id)
             if session_db is not None:
                 session_db.connection_id = conn.connection_id
                 db.add(session_db)
-                db.commit()
+                await db.commit()
 
         while True:
             payload = await websocket.receive_json()
             msg_type = payload.get("type")
             if msg_type == "collab:ping":
-                await websocket.send_json({"type": "collab:pong"})
+                runtime.send(conn, {"type": "collab:pong"})
                 continue
             if msg_type == "collab:cursor":
                 cursor = payload.get("cursor")
@@ -158,12 +163,12 @@ async def itinerary_collab_ws_api(websocket: WebSocket, itinerary_id: UUID) -> N
                 continue
             if msg_type == "collab:update":
                 if conn.identity.permission != "edit":
-                    await websocket.send_json({"type": "collab:error", "message": "read-only link"})
+                    runtime.send(conn, {"type": "collab:error", "message": "read-only link"})
                     continue
                 update_b64 = payload.get("update_b64")
                 if not isinstance(update_b64, str) or not update_b64:
-                    await websocket.send_json(
-                        {"type": "collab:error", "message": "invalid update payload"}
+                    runtime.send(
+                        conn, {"type": "collab:error", "message": "invalid update payload"}
                     )
                     continue
                 meta = payload.get("meta")
@@ -171,18 +176,18 @@ async def itinerary_collab_ws_api(websocket: WebSocket, itinerary_id: UUID) -> N
                     conn, update_b64, meta if isinstance(meta, dict) else {}
                 )
                 continue
-            await websocket.send_json(
-                {"type": "collab:error", "message": "unsupported message type"}
-            )
+            runtime.send(conn, {"type": "collab:error", "message": "unsupported message type"})
     except WebSocketDisconnect:
         pass
     finally:
         if conn is not None:
             await runtime.unregister(conn)
         if session_row is not None:
-            with SessionLocal() as db:
-                close_collab_session(
-                    db,
-                    session_id=session_row.id,
-                    connection_id=conn.connection_id if conn is not None else "pending",
+            async with AsyncSessionLocal() as db:
+                await db.run_sync(
+                    lambda session: close_collab_session(
+                        session,
+                        session_id=session_row.id,
+                        connection_id=conn.connection_id if conn is not None else "pending",
+                    )
                 )
@@ -36,6 +36,7 @@ async def submit_correction_api(
     details: str | None = Form(default=None),
     source_itinerary_id: UUID | None = Form(default=None),
     photo: UploadFile | None = File(default=None),
+    photo_storage_key: str | None = Form(default=None, min_length=1, max_length=512),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ) -> PoiCorrectionResponse:
@@ -48,6 +49,7 @@ async def submit_correction_api(
         details=details,
         photo=photo,
         source_itinerary_id=source_itinerary_id,
+        photo_storage_key=photo_storage_key,
     )
 
 
@@ -17,6 +17,7 @@ from app.api.v1.passports import router as passports_router
 from app.api.v1.poi_corrections import router as poi_corrections_router
 from app.api.v1.pois import router as pois_router
 from app.api.v1.territories import router as territories_router
+from app.api.v1.uploads import router as uploads_router
 from app.api.v1.weather import router as weather_router
 
 api_router = APIRouter(prefix="/api/v1")
@@ -38,3 +39,4 @@ api_router.include_router(weather_router)
 api_router.include_router(ai_engine_router)
 api_router.include_router(passports_router, prefix="/passports", tags=["passports"])
 api_router.include_router(territories_router)
+api_router.include_router(uploads_router)
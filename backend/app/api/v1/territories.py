@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
@@ -20,18 +20,29 @@ from app.services.territory_service import (
     get_task_center,
     get_territory,
     get_user_territory_profile,
+    get_territory_list_version,
     get_territory_opportunities,
     guardian_check_in,
     list_territories,
     submit_guardian_application,
+    territory_list_etag,
 )
 
 router = APIRouter(prefix="/territories", tags=["territories"])
 
 
 @router.get("", response_model=TerritoryRegionListResponse)
-def list_territories_api(db: Session = Depends(get_db)) -> TerritoryRegionListResponse:
-    return list_territories(db)
+def list_territories_api(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+) -> TerritoryRegionListResponse | Response:
+    version = get_territory_list_version(db)
+    etag = territory_list_etag(version)
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return list_territories(db, version=version)
 
 
 @router.get("/me/profile", response_model=UserTerritoryProfileResponse)
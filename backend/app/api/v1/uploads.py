@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.upload import (
+    DirectUploadResponse,
+    DirectUploadTokenPayload,
+    DirectUploadTokenResponse,
+)
+from app.security.deps import get_current_user
+from app.services.direct_upload_service import create_upload_token, receive_direct_upload
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+@router.post("/tokens", response_model=DirectUploadTokenResponse)
+def create_upload_token_api(
+    payload: DirectUploadTokenPayload,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+) -> DirectUploadTokenResponse:
+    token, expires_at, max_bytes = create_upload_token(current_user, payload.content_type)
+    return DirectUploadTokenResponse(
+        token=token,
+        upload_url=str(request.url_for("put_direct_upload_api", token=token)),
+        content_type=payload.content_type.strip().lower(),
+        max_bytes=max_bytes,
+        expires_at=expires_at,
+    )
+
+
+@router.put("/{token}", response_model=DirectUploadResponse)
+async def put_direct_upload_api(
+    token: str, request: Request, db: Session = Depends(get_db)
+) -> DirectUploadResponse:
+    return await receive_direct_upload(
+        db,
+        token,
+        content_type=request.headers.get("content-type"),
+        chunks=request.stream(),
+    )
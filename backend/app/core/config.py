@@ -24,9 +24,20 @@ class Settings(BaseSettings):
     heweather_api_host: str = ""  # 开发者专属 API Host，如 abc1234xyz.def.qweatherapi.com
     heweather_timeout_seconds: int = 8
     amap_web_service_key: str = ""
-    storage_provider: str = "local"
+    amap_max_concurrency: int = 5
+    ai_poi_cache_ttl_seconds: int = 7 * 86400
+    ai_poi_cache_miss_ttl_seconds: int = 86400
+    storage_provider: str = "cas"
+    storage_gc_grace_seconds: int = 86400
+    storage_upload_token_secret: str = ""
+    storage_upload_token_seconds: int = 600
+    # Keep well under storage_gc_grace_seconds: unclaimed direct uploads are only kept alive by it.
+    storage_direct_upload_claim_seconds: int = 3600
     storage_local_root: str = "uploads"
     storage_public_base_url: str = "/uploads"
+    upload_max_photo_bytes: int = 15 * 1024 * 1024
+    image_pipeline_workers: int = 2
+    image_thumbnail_max_px: int = 480
     collab_token_secret: str = "replace-with-dev-collab-secret"
     collab_share_base_url: str = "http://localhost:5173/collab/join"
     itinerary_share_base_url: str = "http://localhost:5173/itineraries"
@@ -36,16 +47,32 @@ class Settings(BaseSettings):
     collab_grant_expires_minutes: int = 120
     collab_redis_url: str = "redis://localhost:6379/2"
     collab_flush_interval_seconds: int = 5
+    collab_compact_every_updates: int = 200
+    collab_flush_batch_rooms: int = 100
+    collab_send_queue_size: int = 256
+    collab_send_timeout_seconds: float = 10.0
+    collab_flush_lease_seconds: int = 30
+    collab_flush_max_failures: int = 5
+    collab_presence_heartbeat_seconds: float = 10.0
+    collab_presence_ticks_per_second: int = 10
+    explore_heatmap_refresh_seconds: int = 300
+    explore_heatmap_cache_seconds: int = 60
+    explore_heatmap_grid_cells_per_tile: int = 8
+    explore_view_flush_interval_seconds: int = 5
     territory_grid_size_deg: float = 0.15
     territory_min_pois: int = 3
     territory_region_name_prefix: str = "守护区域"
+    territory_list_cache_seconds: int = 600
+    dependency_graph_cache_seconds: int = 600
     guardian_dormant_window_days: int = 90
+    guardian_governance_interval_seconds: int = 3600
     role_regular_min_contributions: int = 3
     role_expert_min_contributions: int = 10
     role_expert_min_age_days: int = 30
     role_guide_min_thanks: int = 20
     role_ambassador_min_areas: int = 3
     bounty_stale_days: int = 45
+    bounty_stale_scan_interval_seconds: int = 900
     bounty_gps_radius_meters: int = 500
     bounty_default_reward_points: int = 20
     bounty_high_freq_daily_limit: int = 5
@@ -0,0 +1,43 @@
+import bisect
+import threading
+
+_DEFAULT_BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    def __init__(self, bounds_ms: tuple[float, ...] = _DEFAULT_BOUNDS_MS) -> None:
+        self._bounds_ms = bounds_ms
+        self._counts = [0] * (len(bounds_ms) + 1)
+        self._total = 0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        value_ms = max(0.0, seconds * 1000)
+        bucket = bisect.bisect_left(self._bounds_ms, value_ms)
+        with self._lock:
+            self._counts[bucket] += 1
+            self._total += 1
+            self._max_ms = max(self._max_ms, value_ms)
+
+    def quantile(self, q: float) -> float:
+        with self._lock:
+            if self._total == 0:
+                return 0.0
+            rank = max(1, round(q * self._total))
+            seen = 0
+            for bucket, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank:
+                    if bucket < len(self._bounds_ms):
+                        return float(min(self._bounds_ms[bucket], self._max_ms))
+                    return self._max_ms
+            return self._max_ms
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "count": self._total,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self._max_ms, 3),
+        }
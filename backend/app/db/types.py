@@ -13,3 +13,10 @@ class GeometryPolygon(UserDefinedType):
 
     def get_col_spec(self, **kw: object) -> str:
         return "GEOMETRY(Polygon,4326)"
+
+
+class Geography(UserDefinedType):
+    cache_ok = True
+
+    def get_col_spec(self, **kw: object) -> str:
+        return "GEOGRAPHY"
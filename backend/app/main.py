@@ -7,7 +7,13 @@ from fastapi.staticfiles import StaticFiles
 from app.api.share import router as share_router
 from app.api.v1.router import api_router
 from app.core.config import get_settings
+from app.db.async_session import async_engine
+from app.services.ai_engine_service import close_amap_client
+from app.services.bounty_service import STALE_BOUNTY_JOB, generate_stale_bounty_tasks
 from app.services.collab_runtime import get_collab_runtime
+from app.services.itinerary_service import flush_itinerary_views, refresh_explore_heatmap
+from app.services.job_scheduler import get_job_scheduler
+from app.services.territory_service import GUARDIAN_GOVERNANCE_JOB, run_territory_governance
 
 settings = get_settings()
 
@@ -23,7 +29,7 @@ app.add_middleware(
 
 app.include_router(api_router)
 app.include_router(share_router)
-if settings.storage_provider == "local":
+if settings.storage_provider in {"local", "cas"}:
     Path(settings.storage_local_root).mkdir(parents=True, exist_ok=True)
     app.mount(
         settings.storage_public_base_url,
@@ -37,6 +43,44 @@ async def _startup_collab_runtime() -> None:
     await get_collab_runtime().startup()
 
 
+@app.on_event("startup")
+async def _startup_job_scheduler() -> None:
+    scheduler = get_job_scheduler()
+    scheduler.register(
+        "explore-heatmap-refresh",
+        settings.explore_heatmap_refresh_seconds,
+        refresh_explore_heatmap,
+    )
+    scheduler.register(
+        "explore-view-flush",
+        settings.explore_view_flush_interval_seconds,
+        flush_itinerary_views,
+        run_on_shutdown=True,
+    )
+    scheduler.register(
+        GUARDIAN_GOVERNANCE_JOB,
+        settings.guardian_governance_interval_seconds,
+        run_territory_governance,
+    )
+    scheduler.register(
+        STALE_BOUNTY_JOB,
+        settings.bounty_stale_scan_interval_seconds,
+        generate_stale_bounty_tasks,
+    )
+    await scheduler.startup()
+
+
 @app.on_event("shutdown")
 async def _shutdown_collab_runtime() -> None:
     await get_collab_runtime().shutdown()
+    await async_engine.dispose()
+
+
+@app.on_event("shutdown")
+async def _shutdown_job_scheduler() -> None:
+    await get_job_scheduler().shutdown()
+
+
+@app.on_event("shutdown")
+async def _shutdown_http_clients() -> None:
+    await close_amap_client()
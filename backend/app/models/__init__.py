@@ -1,8 +1,12 @@
 from app.models.block_template import BlockTemplate, BlockTemplateRating
 from app.models.bounty import BountySubmission, BountyTask
+from app.models.cache_version import CacheVersion
+from app.models.direct_upload import DirectUpload
+from app.models.explore_poi_heat import ExplorePoiHeat
 from app.models.itinerary import Itinerary
 from app.models.itinerary_block import ItineraryBlock
 from app.models.itinerary_block_edge import ItineraryBlockEdge
+from app.models.itinerary_board import ItineraryBoardLane, ItineraryBoardTombstone
 from app.models.itinerary_collab import (
     ItineraryCollabDocument,
     ItineraryCollabEventLog,
@@ -12,13 +16,16 @@ from app.models.itinerary_collab import (
 from app.models.itinerary_diff_action import ItineraryDiffAction
 from app.models.itinerary_fork import ItineraryFork
 from app.models.itinerary_item import ItineraryItem
+from app.models.itinerary_popularity import ItineraryPopularity
 from app.models.itinerary_snapshot import ItinerarySnapshot
 from app.models.itinerary_visit_log import ItineraryVisitLog
+from app.models.job_watermark import JobWatermark
 from app.models.passport import BadgeDef, UserBadge, UserContribution
 from app.models.poi import Poi
 from app.models.poi_correction import PoiCorrection
 from app.models.poi_correction_notification import PoiCorrectionNotification
 from app.models.poi_correction_type import PoiCorrectionType
+from app.models.poi_resolution_cache import PoiResolutionCache
 from app.models.poi_ticket_rule import PoiTicketRule
 from app.models.pricing_audience import PricingAudience
 from app.models.territory import (
@@ -38,6 +45,8 @@ __all__ = [
     "Itinerary",
     "ItineraryBlock",
     "ItineraryBlockEdge",
+    "ItineraryBoardLane",
+    "ItineraryBoardTombstone",
     "ItineraryCollabLink",
     "ItineraryCollabSession",
     "ItineraryCollabDocument",
@@ -45,6 +54,11 @@ __all__ = [
     "ItineraryItem",
     "ItinerarySnapshot",
     "ItineraryVisitLog",
+    "ItineraryPopularity",
+    "ExplorePoiHeat",
+    "JobWatermark",
+    "CacheVersion",
+    "DirectUpload",
     "ItineraryFork",
     "ItineraryDiffAction",
     "BlockTemplate",
@@ -54,6 +68,7 @@ __all__ = [
     "PoiCorrectionType",
     "PoiCorrection",
     "PoiCorrectionNotification",
+    "PoiResolutionCache",
     "PricingAudience",
     "PoiTicketRule",
     "TerritoryRegion",
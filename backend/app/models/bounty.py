@@ -1,7 +1,18 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -17,6 +28,14 @@ class BountyTask(Base):
         ),
         CheckConstraint("reward_points >= 0", name="ck_bounty_tasks_reward_points_nonnegative"),
         CheckConstraint("stale_days_snapshot >= 0", name="ck_bounty_tasks_stale_days_nonnegative"),
+        Index("ix_bounty_tasks_status_generated", "status", "generated_at", "id"),
+        Index("ix_bounty_tasks_claimer_generated", "claimed_by_user_id", "generated_at", "id"),
+        Index(
+            "uq_bounty_tasks_active_poi",
+            "poi_id",
+            unique=True,
+            postgresql_where=text("status IN ('open', 'claimed', 'submitted')"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -71,6 +90,8 @@ class BountySubmission(Base):
     gps_verified: Mapped[bool] = mapped_column(nullable=False, default=False)
     photo_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
     photo_storage_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    photo_thumbnail_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    photo_thumbnail_storage_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
     photo_exif_captured_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     photo_exif_longitude: Mapped[float | None] = mapped_column(Numeric(10, 7), nullable=True)
     photo_exif_latitude: Mapped[float | None] = mapped_column(Numeric(10, 7), nullable=True)
@@ -1,7 +1,18 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,6 +22,9 @@ from app.db.types import GeometryPoint
 
 class ItineraryBlock(Base):
     __tablename__ = "itinerary_blocks"
+    __table_args__ = (
+        Index("ix_itinerary_blocks_itinerary_board_version", "itinerary_id", "board_version"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -63,6 +77,11 @@ class ItineraryBlock(Base):
         UUID(as_uuid=True), ForeignKey("block_templates.id", ondelete="SET NULL"), nullable=True
     )
 
+    # Board version of the last write, for `since=` board polling.
+    board_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
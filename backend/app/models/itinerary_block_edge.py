@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint, func
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -17,6 +17,7 @@ class ItineraryBlockEdge(Base):
             "to_block_id",
             name="uq_block_edge_unique",
         ),
+        Index("ix_itinerary_block_edges_itinerary_board_version", "itinerary_id", "board_version"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -41,6 +42,9 @@ class ItineraryBlockEdge(Base):
         index=True,
     )
     edge_type: Mapped[str] = mapped_column(String(16), nullable=False, default="hard")
+    board_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
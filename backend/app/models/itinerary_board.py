@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ItineraryBoardLane(Base):
+    __tablename__ = "itinerary_board_lanes"
+
+    itinerary_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("itineraries.id", ondelete="CASCADE"), primary_key=True
+    )
+    lane_key: Mapped[str] = mapped_column(String(32), primary_key=True)
+    block_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    done_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    blocked_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
+class ItineraryBoardTombstone(Base):
+    __tablename__ = "itinerary_board_tombstones"
+    __table_args__ = (
+        Index("ix_itinerary_board_tombstones_itinerary_version", "itinerary_id", "board_version"),
+    )
+
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    itinerary_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("itineraries.id", ondelete="CASCADE"), nullable=False
+    )
+    entity_type: Mapped[str] = mapped_column(String(8), nullable=False)  # block | edge
+    board_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ItineraryPopularity(Base):
+    __tablename__ = "itinerary_popularity"
+    __table_args__ = (
+        Index(
+            "ix_itinerary_popularity_rank",
+            "forked_count",
+            "view_count",
+        ),
+    )
+
+    itinerary_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("itineraries.id", ondelete="CASCADE"), primary_key=True
+    )
+    forked_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    view_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_viewed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -39,6 +39,8 @@ class PoiCorrection(Base):
     source_itinerary_author_snapshot: Mapped[str | None] = mapped_column(String(64), nullable=True)
     photo_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
     photo_storage_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    photo_thumbnail_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    photo_thumbnail_storage_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
     review_comment: Mapped[str | None] = mapped_column(Text, nullable=True)
     before_snapshot: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     after_snapshot: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
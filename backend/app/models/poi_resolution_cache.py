@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Float, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PoiResolutionCache(Base):
+    __tablename__ = "poi_resolution_cache"
+
+    name_key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    city_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    found: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    resolved_name: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    address: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
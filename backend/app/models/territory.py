@@ -33,6 +33,9 @@ class TerritoryRegion(Base):
     status: Mapped[str] = mapped_column(String(16), nullable=False, default="active")
     boundary_geom: Mapped[str] = mapped_column(GeometryPolygon(), nullable=False)
     centroid_geom: Mapped[str] = mapped_column(GeometryPoint(), nullable=False)
+    # WKT of the geometries above, written alongside them so reads skip ST_AsText.
+    boundary_wkt: Mapped[str | None] = mapped_column(Text, nullable=True)
+    centroid_wkt: Mapped[str | None] = mapped_column(Text, nullable=True)
     poi_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
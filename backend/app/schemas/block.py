@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -83,6 +83,40 @@ class BlockBatchUpdateRequest(BaseModel):
     tags: list[str] | None = None
 
 
+class BlockReorderOp(BaseModel):
+    op: Literal["reorder"]
+    parent_block_id: UUID | None = None
+    day_index: int = Field(ge=1, le=60)
+    ordered_block_ids: list[UUID] = Field(min_length=1, max_length=500)
+
+
+class BlockLayoutOp(BlockLayoutUpdate):
+    op: Literal["layout"]
+    block_id: UUID
+
+
+class BlockPatchOp(BaseModel):
+    op: Literal["patch"]
+    block_ids: list[UUID] = Field(min_length=1, max_length=200)
+    status: str | None = Field(default=None, min_length=1, max_length=16)
+    priority: str | None = Field(default=None, min_length=1, max_length=16)
+    risk_level: str | None = Field(default=None, min_length=1, max_length=16)
+    assignee_user_id: UUID | None = None
+    tags: list[str] | None = None
+
+
+BlockOp = Annotated[BlockReorderOp | BlockLayoutOp | BlockPatchOp, Field(discriminator="op")]
+
+
+class BlockOpsRequest(BaseModel):
+    ops: list[BlockOp] = Field(min_length=1, max_length=100)
+
+
+class BlockOpsResponse(BaseModel):
+    itinerary_id: UUID
+    updated_count: int
+
+
 class BlockResponse(BaseModel):
     id: UUID
     itinerary_id: UUID
@@ -144,6 +178,7 @@ class BoardLaneSummary(BaseModel):
     label: str
     block_count: int
     done_count: int
+    blocked_count: int = 0
 
 
 class BoardSummary(BaseModel):
@@ -154,12 +189,41 @@ class BoardSummary(BaseModel):
 
 class BoardResponse(BaseModel):
     itinerary_id: UUID
+    version: int = 0
+    # True when items/dependencies only hold what changed after `since`.
+    delta: bool = False
     items: list[BlockResponse]
     dependencies: list[BlockDependencyResponse]
+    removed_block_ids: list[UUID] = Field(default_factory=list)
+    removed_edge_ids: list[UUID] = Field(default_factory=list)
+    lanes: list[BoardLaneSummary]
+    summary: BoardSummary
+
+
+class BoardSummaryResponse(BaseModel):
+    itinerary_id: UUID
+    version: int
     lanes: list[BoardLaneSummary]
     summary: BoardSummary
 
 
+class DependencyScheduleItem(BaseModel):
+    block_id: UUID
+    # Minutes from 00:00 on day 1; a block starts no earlier than its own day/start_minute.
+    earliest_start_minute: int
+    earliest_finish_minute: int
+    critical: bool = False
+
+
+class DependencyScheduleResponse(BaseModel):
+    itinerary_id: UUID
+    version: int
+    # In topological order: every block comes after the blocks it depends on.
+    items: list[DependencyScheduleItem]
+    critical_path: list[UUID]
+    finish_minute: int
+
+
 class BoardAutoLayoutResponse(BaseModel):
     itinerary_id: UUID
     updated_count: int
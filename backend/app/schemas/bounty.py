@@ -26,6 +26,7 @@ class BountyTaskListResponse(BaseModel):
     offset: int
     limit: int
     nearby_radius_meters: int | None = None
+    next_cursor: str | None = None
 
 
 class BountySubmissionItem(BaseModel):
@@ -37,6 +38,7 @@ class BountySubmissionItem(BaseModel):
     distance_meters: float
     gps_verified: bool
     photo_url: str | None
+    photo_thumbnail_url: str | None = None
     photo_exif_captured_at: datetime | None
     photo_exif_longitude: float | None
     photo_exif_latitude: float | None
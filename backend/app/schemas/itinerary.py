@@ -95,6 +95,19 @@ class ExploreHeatPointListResponse(BaseModel):
     items: list[ExploreHeatPointResponse]
 
 
+class ExploreHeatGridCellResponse(BaseModel):
+    longitude: float
+    latitude: float
+    heat_score: int
+    poi_count: int
+
+
+class ExploreHeatGridResponse(BaseModel):
+    zoom: int
+    cell_size_deg: float
+    items: list[ExploreHeatGridCellResponse]
+
+
 class ExploreRecommendationItemResponse(BaseModel):
     itinerary: PublicItineraryResponse
     score: float
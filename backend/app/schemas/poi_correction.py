@@ -38,6 +38,7 @@ class PoiCorrectionResponse(BaseModel):
     proposed_value: str | None
     details: str | None
     photo_url: str | None
+    photo_thumbnail_url: str | None = None
     status: str
     submitter_user_id: UUID
     reviewer_user_id: UUID | None
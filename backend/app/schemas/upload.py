@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class DirectUploadTokenPayload(BaseModel):
+    content_type: str = Field(min_length=1, max_length=64)
+
+
+class DirectUploadTokenResponse(BaseModel):
+    token: str
+    upload_url: str
+    method: str = "PUT"
+    content_type: str
+    max_bytes: int
+    expires_at: datetime
+
+
+class DirectUploadResponse(BaseModel):
+    storage_key: str
+    url: str
+    thumbnail_url: str
+    size: int
+    content_type: str
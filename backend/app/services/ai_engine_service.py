@@ -1,19 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
-from datetime import datetime, time
+from dataclasses import dataclass
+from datetime import UTC, datetime, time, timedelta
 from uuid import UUID
 
 import httpx
 from fastapi import HTTPException, status
 from pydantic import BaseModel, ValidationError
 from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.models.itinerary import Itinerary
 from app.models.itinerary_item import ItineraryItem
 from app.models.poi import Poi
+from app.models.poi_resolution_cache import PoiResolutionCache
 from app.models.user import User
 from app.schemas.ai_engine import (
     AiImportRequest,
@@ -23,6 +27,7 @@ from app.schemas.ai_engine import (
     AiPreviewRequest,
     AiPreviewResponse,
 )
+from app.services.territory_service import sync_poi_territory_cells
 
 settings = get_settings()
 
@@ -323,17 +328,11 @@ def _validate_ai_raw_response(raw: _AiRawResponse, raw_text: str) -> None:
         )
 
 
-def _resolve_local_poi(db: Session, name: str) -> AiPreviewPoi | None:
-    stmt = (
-        select(Poi, func.ST_AsText(Poi.geom))
-        .where(func.lower(Poi.name) == name.lower())
-        .order_by(Poi.updated_at.desc())
-        .limit(1)
-    )
-    row = db.execute(stmt).one_or_none()
-    if row is None:
-        return None
-    poi, wkt = row
+def _name_key(name: str) -> str:
+    return name.strip().lower()[:128]
+
+
+def _local_preview_poi(poi: Poi, wkt: str) -> AiPreviewPoi:
     longitude, latitude = _parse_point_text(wkt)
     return AiPreviewPoi(
         poi_id=poi.id,
@@ -348,10 +347,57 @@ def _resolve_local_poi(db: Session, name: str) -> AiPreviewPoi | None:
     )
 
 
-def _resolve_amap_poi(name: str, destination: str, fallback_type: str) -> AiPreviewPoi:
-    if not settings.amap_web_service_key:
-        return AiPreviewPoi(name=name, type=fallback_type, match_source="unresolved")
+def _resolve_local_pois(db: Session, names: list[str]) -> dict[str, AiPreviewPoi]:
+    keys = sorted({_name_key(name) for name in names if name.strip()})
+    if not keys:
+        return {}
+    stmt = (
+        select(Poi, func.ST_AsText(Poi.geom))
+        .where(func.lower(Poi.name).in_(keys))
+        .order_by(Poi.updated_at.desc())
+    )
+    resolved: dict[str, AiPreviewPoi] = {}
+    for poi, wkt in db.execute(stmt).all():
+        # Newest first, so the first row per name wins like the old per-name LIMIT 1.
+        name_key = _name_key(poi.name)
+        if name_key not in resolved:
+            resolved[name_key] = _local_preview_poi(poi, wkt)
+    return resolved
+
+
+@dataclass
+class _AmapPlace:
+    found: bool
+    name: str | None = None
+    longitude: float | None = None
+    latitude: float | None = None
+    address: str | None = None
+
+
+_amap_client: httpx.AsyncClient | None = None
+
+
+def get_amap_client() -> httpx.AsyncClient:
+    global _amap_client
+    if _amap_client is None:
+        concurrency = max(1, settings.amap_max_concurrency)
+        _amap_client = httpx.AsyncClient(
+            base_url="https://restapi.amap.com",
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+    return _amap_client
 
+
+async def close_amap_client() -> None:
+    global _amap_client
+    if _amap_client is not None:
+        await _amap_client.aclose()
+        _amap_client = None
+
+
+async def _fetch_amap_place(client: httpx.AsyncClient, name: str, destination: str) -> _AmapPlace | None:
+    """Look up one name on AMap; None means the request itself failed and must not be cached."""
     params = {
         "key": settings.amap_web_service_key,
         "keywords": name,
@@ -361,55 +407,168 @@ def _resolve_amap_poi(name: str, destination: str, fallback_type: str) -> AiPrev
         "extensions": "base",
     }
     try:
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get("https://restapi.amap.com/v3/place/text", params=params)
+        response = await client.get("/v3/place/text", params=params)
     except httpx.HTTPError:
-        return AiPreviewPoi(name=name, type=fallback_type, match_source="unresolved")
+        return None
 
     if response.status_code >= 400:
-        return AiPreviewPoi(name=name, type=fallback_type, match_source="unresolved")
+        return None
 
     data = response.json()
     pois = data.get("pois")
     if not isinstance(pois, list) or not pois:
-        return AiPreviewPoi(name=name, type=fallback_type, match_source="unresolved")
+        return _AmapPlace(found=False)
 
     first = pois[0]
     location = first.get("location", "")
     parts = location.split(",")
     if len(parts) != 2:
-        return AiPreviewPoi(name=name, type=fallback_type, match_source="unresolved")
+        return _AmapPlace(found=False)
     try:
         longitude = float(parts[0])
         latitude = float(parts[1])
     except ValueError:
-        return AiPreviewPoi(name=name, type=fallback_type, match_source="unresolved")
+        return _AmapPlace(found=False)
 
-    return AiPreviewPoi(
-        name=first.get("name") or name,
-        type=fallback_type,
+    # AMap sends [] rather than "" for places without an address.
+    address = first.get("address")
+    return _AmapPlace(
+        found=True,
+        name=(first.get("name") or name)[:128],
         longitude=longitude,
         latitude=latitude,
-        address=first.get("address") or None,
+        address=address[:255] if isinstance(address, str) and address else None,
+    )
+
+
+async def _resolve_amap_places(names: dict[str, str], destination: str) -> dict[str, _AmapPlace | None]:
+    """Resolve name_key -> original name pairs concurrently, at most amap_max_concurrency at a time."""
+    if not names or not settings.amap_web_service_key:
+        return {}
+    client = get_amap_client()
+    semaphore = asyncio.Semaphore(max(1, settings.amap_max_concurrency))
+
+    async def _fetch(name: str) -> _AmapPlace | None:
+        async with semaphore:
+            return await _fetch_amap_place(client, name, destination)
+
+    results = await asyncio.gather(*(_fetch(name) for name in names.values()))
+    return dict(zip(names.keys(), results, strict=True))
+
+
+def _load_cached_places(db: Session, city_key: str, name_keys: list[str]) -> dict[str, _AmapPlace]:
+    if not name_keys:
+        return {}
+    rows = db.scalars(
+        select(PoiResolutionCache).where(
+            PoiResolutionCache.city_key == city_key,
+            PoiResolutionCache.name_key.in_(name_keys),
+            PoiResolutionCache.expires_at > func.now(),
+        )
+    ).all()
+    return {
+        row.name_key: _AmapPlace(
+            found=row.found,
+            name=row.resolved_name,
+            longitude=row.longitude,
+            latitude=row.latitude,
+            address=row.address,
+        )
+        for row in rows
+    }
+
+
+def _store_cached_places(db: Session, city_key: str, places: dict[str, _AmapPlace]) -> None:
+    if not places:
+        return
+    now = datetime.now(UTC)
+    rows = [
+        {
+            "name_key": name_key,
+            "city_key": city_key,
+            "found": place.found,
+            "resolved_name": place.name,
+            "longitude": place.longitude,
+            "latitude": place.latitude,
+            "address": place.address,
+            "expires_at": now
+            + timedelta(
+                seconds=settings.ai_poi_cache_ttl_seconds
+                if place.found
+                else settings.ai_poi_cache_miss_ttl_seconds
+            ),
+        }
+        for name_key, place in sorted(places.items())
+    ]
+    stmt = pg_insert(PoiResolutionCache).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PoiResolutionCache.name_key, PoiResolutionCache.city_key],
+        set_={
+            "found": stmt.excluded.found,
+            "resolved_name": stmt.excluded.resolved_name,
+            "longitude": stmt.excluded.longitude,
+            "latitude": stmt.excluded.latitude,
+            "address": stmt.excluded.address,
+            "expires_at": stmt.excluded.expires_at,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+async def _resolve_remote_places(db: Session, names: list[str], destination: str) -> dict[str, _AmapPlace]:
+    """Resolve names through the persistent cache first, then AMap for whatever is left."""
+    pending: dict[str, str] = {}
+    for name in names:
+        pending.setdefault(_name_key(name), name.strip())
+    city_key = destination.strip().lower()[:64]
+    places = await asyncio.to_thread(_load_cached_places, db, city_key, sorted(pending))
+    fetched = await _resolve_amap_places(
+        {key: name for key, name in pending.items() if key not in places}, destination
+    )
+    fresh = {key: place for key, place in fetched.items() if place is not None}
+    await asyncio.to_thread(_store_cached_places, db, city_key, fresh)
+    places.update(fresh)
+    return places
+
+
+def _amap_preview_poi(place: _AmapPlace | None, name: str, fallback_type: str) -> AiPreviewPoi:
+    if place is None or not place.found:
+        return AiPreviewPoi(name=name, type=fallback_type, match_source="unresolved")
+    return AiPreviewPoi(
+        name=place.name or name,
+        type=fallback_type,
+        longitude=place.longitude,
+        latitude=place.latitude,
+        address=place.address,
         opening_hours=None,
         ticket_price=None,
         match_source="amap",
     )
 
 
-def preview_ai_plan(
+async def preview_ai_plan(
     db: Session, payload: AiPreviewRequest, current_user: User
 ) -> AiPreviewResponse:
-    _ensure_owned_itinerary(db, payload.itinerary_id, current_user)
-    raw = _call_llm(payload.raw_text)
+    # The session is synchronous, so every database step runs off the event loop; only the
+    # AMap requests stay on it.
+    await asyncio.to_thread(_ensure_owned_itinerary, db, payload.itinerary_id, current_user)
+    raw = await asyncio.to_thread(_call_llm, payload.raw_text)
     _validate_ai_raw_response(raw, payload.raw_text)
+
+    names = [source_item.name for source_item in raw.items]
+    local_pois = await asyncio.to_thread(_resolve_local_pois, db, names)
+    remote_places = await _resolve_remote_places(
+        db, [name for name in names if _name_key(name) not in local_pois], raw.destination
+    )
     grouped_items: dict[int, list[AiPreviewItem]] = defaultdict(list)
 
     for source_item in raw.items:
         fallback_type = source_item.type or "scenic"
-        local = _resolve_local_poi(db, source_item.name)
-        poi = local if local else _resolve_amap_poi(
-            source_item.name, raw.destination, fallback_type
+        name_key = _name_key(source_item.name)
+        poi = local_pois.get(name_key) or _amap_preview_poi(
+            remote_places.get(name_key), source_item.name, fallback_type
         )
         grouped_items[source_item.day_index].append(
             AiPreviewItem(
@@ -441,7 +600,9 @@ def preview_ai_plan(
     )
 
 
-def _resolve_or_create_poi(db: Session, poi: AiPreviewPoi) -> UUID:
+def _resolve_or_create_poi(
+    db: Session, poi: AiPreviewPoi, created_points: list[tuple[float, float]]
+) -> UUID:
     if poi.poi_id:
         existing = db.get(Poi, poi.poi_id)
         if existing is None:
@@ -468,6 +629,7 @@ def _resolve_or_create_poi(db: Session, poi: AiPreviewPoi) -> UUID:
     )
     db.add(new_poi)
     db.flush()
+    created_points.append((poi.longitude, poi.latitude))
     return new_poi.id
 
 
@@ -483,6 +645,7 @@ def import_ai_plan(db: Session, payload: AiImportRequest, current_user: User) ->
     max_sort_by_day = {day_index: max_order for day_index, max_order in day_order_rows}
 
     imported_count = 0
+    created_points: list[tuple[float, float]] = []
     ordered_items = sorted(
         payload.preview.items, key=lambda item: (item.day_index, item.sort_order)
     )
@@ -492,7 +655,7 @@ def import_ai_plan(db: Session, payload: AiImportRequest, current_user: User) ->
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"day_index out of itinerary range: {item.day_index}",
             )
-        poi_id = _resolve_or_create_poi(db, item.poi)
+        poi_id = _resolve_or_create_poi(db, item.poi, created_points)
         sort_order = int(max_sort_by_day.get(item.day_index, 0)) + 1
         max_sort_by_day[item.day_index] = sort_order
         db.add(
@@ -509,6 +672,10 @@ def import_ai_plan(db: Session, payload: AiImportRequest, current_user: User) ->
         )
         imported_count += 1
 
+    if created_points:
+        # One pass over every touched cell, as poi_service.create_poi does for a single POI.
+        sync_poi_territory_cells(db, created_points)
+
     if imported_count > 0 and itinerary.status == "draft":
         itinerary.status = "in_progress"
         db.add(itinerary)
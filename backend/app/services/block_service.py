@@ -1,12 +1,31 @@
 import uuid
 from collections import defaultdict
+from dataclasses import dataclass, field, fields
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import func, select, text
+from sqlalchemy import (
+    Float,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.models.itinerary_block import ItineraryBlock
 from app.models.itinerary_block_edge import ItineraryBlockEdge
+from app.models.itinerary_board import ItineraryBoardLane, ItineraryBoardTombstone
 from app.models.itinerary_item import ItineraryItem
 from app.models.poi import Poi
 from app.schemas.block import (
@@ -18,9 +37,82 @@ from app.schemas.block import (
     BlockBatchUpdateRequest,
     BlockCreate,
     BlockDependencyCreate,
+    BlockLayoutOp,
     BlockLayoutUpdate,
+    BlockOp,
+    BlockPatchOp,
+    BlockReorderOp,
     BlockUpdate,
 )
+from app.services.cache_versions import bump_cache_version, get_cache_version
+from app.services.dependency_graph import DependencyGraph, block_node
+
+settings = get_settings()
+# Keyed by itinerary id -> (board version, graph); graphs are never mutated once cached.
+_dependency_graph_cache = TTLCache(settings.dependency_graph_cache_seconds, max_entries=256)
+
+# Columns the bulk op engine may write, in the order they appear in its VALUES list.
+_BULK_COLUMNS = (
+    "day_index",
+    "lane_key",
+    "sort_order",
+    "start_minute",
+    "end_minute",
+    "status",
+    "priority",
+    "risk_level",
+    "assignee_user_id",
+    "tags",
+)
+
+
+
+@dataclass(slots=True)
+class BlockRow:
+    """A block as read for tree/board responses, with fields in `BlockResponse` order.
+
+    Built straight from a column select and serialized as-is, so large boards skip ORM
+    identity tracking, per-row dicts and response model validation.
+    """
+
+    id: uuid.UUID
+    itinerary_id: uuid.UUID
+    parent_block_id: uuid.UUID | None
+    sort_order: int
+    day_index: int
+    lane_key: str
+    start_minute: int | None
+    end_minute: int | None
+    block_type: str
+    title: str
+    duration_minutes: int | None
+    cost: float | None
+    tips: str | None
+    longitude: float | None = field(default=None, init=False)
+    latitude: float | None = field(default=None, init=False)
+    address: str | None
+    photos: list[str] | None
+    type_data: dict[str, Any] | None
+    is_container: bool
+    source_template_id: uuid.UUID | None
+    status: str
+    priority: str
+    risk_level: str
+    assignee_user_id: uuid.UUID | None
+    tags: list[str] | None
+    ui_meta: dict[str, Any] | None
+    children: list["BlockRow"] = field(default_factory=list, init=False)
+    created_at: datetime
+    updated_at: datetime
+
+
+_BLOCK_ROW_COLUMNS = tuple(
+    ItineraryBlock.__table__.c.cost.cast(Float).label("cost")
+    if f.name == "cost"
+    else ItineraryBlock.__table__.c[f.name]
+    for f in fields(BlockRow)
+    if f.init
+)
 
 DEFAULT_LANE_LABELS = {
     "core": "核心流程",
@@ -33,42 +125,118 @@ DEFAULT_LANE_LABELS = {
 }
 
 
-def list_block_tree(db: Session, itinerary_id: uuid.UUID) -> list[dict[str, Any]]:
+def list_block_tree(db: Session, itinerary_id: uuid.UUID) -> list[BlockRow]:
     """Return all blocks for an itinerary as a nested tree."""
-    rows = _query_blocks(db, itinerary_id)
+    rows = _query_block_rows(db, itinerary_id)
     return _build_block_tree(rows)
 
 
-def list_board(db: Session, itinerary_id: uuid.UUID) -> dict[str, Any]:
-    rows = _query_blocks(db, itinerary_id)
-    tree = _build_block_tree(rows)
-    dependencies = list_dependencies(db, itinerary_id)
-    lane_stats: dict[str, dict[str, int | str]] = {}
-    for row in rows:
-        lane_key = row.lane_key or "core"
-        if lane_key not in lane_stats:
-            lane_stats[lane_key] = {
-                "lane_key": lane_key,
-                "label": DEFAULT_LANE_LABELS.get(lane_key, lane_key),
-                "block_count": 0,
-                "done_count": 0,
-            }
-        lane_stats[lane_key]["block_count"] = int(lane_stats[lane_key]["block_count"]) + 1
-        if row.status == "done":
-            lane_stats[lane_key]["done_count"] = int(lane_stats[lane_key]["done_count"]) + 1
+def list_board(db: Session, itinerary_id: uuid.UUID, since: int | None = None) -> dict[str, Any]:
+    """Return the board, or only what changed after board version `since`.
+
+    The version is read before the rows, so a delta may repeat a change but never skips one.
+    A `since` ahead of the current version (e.g. a stale client) gets the full board.
+    """
+    summary = get_board_summary(db, itinerary_id)
+    if since is not None and since <= summary["version"]:
+        return {**summary, **_board_changes(db, itinerary_id, since)}
+
+    rows = _query_block_rows(db, itinerary_id)
+    return {
+        **summary,
+        "delta": False,
+        "items": _build_block_tree(rows),
+        "dependencies": list_dependencies(db, itinerary_id),
+        "removed_block_ids": [],
+        "removed_edge_ids": [],
+    }
+
+
+def get_board_summary(db: Session, itinerary_id: uuid.UUID) -> dict[str, Any]:
+    version = get_board_version(db, itinerary_id)
+    lanes = db.execute(
+        select(ItineraryBoardLane)
+        .where(ItineraryBoardLane.itinerary_id == itinerary_id)
+        .order_by(ItineraryBoardLane.lane_key)
+    ).scalars().all()
+    dependency_count = db.scalar(
+        select(func.count())
+        .select_from(ItineraryBlockEdge)
+        .where(ItineraryBlockEdge.itinerary_id == itinerary_id)
+    )
     return {
         "itinerary_id": itinerary_id,
-        "items": tree,
-        "dependencies": dependencies,
-        "lanes": sorted(lane_stats.values(), key=lambda item: str(item["lane_key"])),
+        "version": version,
+        "lanes": [
+            {
+                "lane_key": lane.lane_key,
+                "label": DEFAULT_LANE_LABELS.get(lane.lane_key, lane.lane_key),
+                "block_count": lane.block_count,
+                "done_count": lane.done_count,
+                "blocked_count": lane.blocked_count,
+            }
+            for lane in lanes
+        ],
         "summary": {
-            "block_count": len(rows),
-            "dependency_count": len(dependencies),
-            "blocked_count": sum(1 for row in rows if row.status == "blocked"),
+            "block_count": sum(lane.block_count for lane in lanes),
+            "dependency_count": int(dependency_count or 0),
+            "blocked_count": sum(lane.blocked_count for lane in lanes),
         },
     }
 
 
+def get_board_version(db: Session, itinerary_id: uuid.UUID) -> int:
+    return get_cache_version(db, _board_version_key(itinerary_id))
+
+
+def begin_board_write(db: Session, itinerary_id: uuid.UUID) -> int:
+    """Bump the board version; rows written in this transaction are stamped with it.
+
+    The version row stays locked until commit, so concurrent writers of one board queue
+    up and each lane recount sees the rows of the writer before it.
+    """
+    return bump_cache_version(db, _board_version_key(itinerary_id))
+
+
+def refresh_board_lanes(db: Session, itinerary_id: uuid.UUID) -> None:
+    """Recount the itinerary's lane counters from its blocks in the caller's transaction."""
+    db.flush()
+    table = ItineraryBlock.__table__
+    counts = (
+        select(
+            table.c.itinerary_id,
+            table.c.lane_key,
+            func.count(),
+            func.count().filter(table.c.status == "done"),
+            func.count().filter(table.c.status == "blocked"),
+        )
+        .where(table.c.itinerary_id == itinerary_id)
+        .group_by(table.c.itinerary_id, table.c.lane_key)
+    )
+    stmt = pg_insert(ItineraryBoardLane).from_select(
+        ["itinerary_id", "lane_key", "block_count", "done_count", "blocked_count"], counts
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ItineraryBoardLane.itinerary_id, ItineraryBoardLane.lane_key],
+            set_={
+                "block_count": stmt.excluded.block_count,
+                "done_count": stmt.excluded.done_count,
+                "blocked_count": stmt.excluded.blocked_count,
+                "updated_at": func.now(),
+            },
+        )
+    )
+    db.execute(
+        delete(ItineraryBoardLane).where(
+            ItineraryBoardLane.itinerary_id == itinerary_id,
+            ItineraryBoardLane.lane_key.not_in(
+                select(table.c.lane_key).where(table.c.itinerary_id == itinerary_id)
+            ),
+        )
+    )
+
+
 def create_block(
     db: Session,
     itinerary_id: uuid.UUID,
@@ -82,6 +250,7 @@ def create_block(
     _validate_lane_key(data.lane_key)
     _validate_minute_range(data.start_minute, data.end_minute)
 
+    version = begin_board_write(db, itinerary_id)
     block = ItineraryBlock(
         itinerary_id=itinerary_id,
         parent_block_id=data.parent_block_id,
@@ -106,10 +275,12 @@ def create_block(
         assignee_user_id=data.assignee_user_id,
         tags=data.tags,
         ui_meta=data.ui_meta,
+        board_version=version,
     )
     db.add(block)
     db.flush()
     _update_geom(db, block.id, data.longitude, data.latitude)
+    refresh_board_lanes(db, itinerary_id)
     db.commit()
     db.refresh(block)
     return _row_to_dict(block)
@@ -139,7 +310,9 @@ def update_block(
         setattr(block, key, value)
 
     _validate_minute_range(block.start_minute, block.end_minute)
+    block.board_version = begin_board_write(db, block.itinerary_id)
     _update_geom(db, block_id, lng, lat)
+    refresh_board_lanes(db, block.itinerary_id)
     db.commit()
     db.refresh(block)
     return _row_to_dict(block)
@@ -165,6 +338,8 @@ def update_block_layout(
 
     for key, value in patch.items():
         setattr(block, key, value)
+    block.board_version = begin_board_write(db, block.itinerary_id)
+    refresh_board_lanes(db, block.itinerary_id)
     db.commit()
     db.refresh(block)
     return _row_to_dict(block)
@@ -174,30 +349,24 @@ def batch_update_blocks(
     db: Session,
     payload: BlockBatchUpdateRequest,
 ) -> int:
-    if payload.status is not None:
-        _validate_status(payload.status)
-    if payload.priority is not None:
-        _validate_priority(payload.priority)
-    if payload.risk_level is not None:
-        _validate_risk_level(payload.risk_level)
-    updates: dict[str, Any] = {}
-    for field in ("status", "priority", "risk_level", "assignee_user_id", "tags"):
-        value = getattr(payload, field)
-        if value is not None:
-            updates[field] = value
+    updates = _patch_values(payload)
     if not updates:
         return 0
 
-    stmt = select(ItineraryBlock).where(
-        ItineraryBlock.itinerary_id == payload.itinerary_id,
-        ItineraryBlock.id.in_(payload.block_ids),
+    updates["board_version"] = begin_board_write(db, payload.itinerary_id)
+    stmt = (
+        update(ItineraryBlock.__table__)
+        .where(
+            ItineraryBlock.__table__.c.itinerary_id == payload.itinerary_id,
+            ItineraryBlock.__table__.c.id.in_(payload.block_ids),
+        )
+        .values(updates)
     )
-    rows = db.execute(stmt).scalars().all()
-    for row in rows:
-        for key, value in updates.items():
-            setattr(row, key, value)
+    updated = db.execute(stmt).rowcount
+    if "status" in updates:
+        refresh_board_lanes(db, payload.itinerary_id)
     db.commit()
-    return len(rows)
+    return updated
 
 
 def delete_block(db: Session, block_id: uuid.UUID) -> bool:
@@ -207,7 +376,10 @@ def delete_block(db: Session, block_id: uuid.UUID) -> bool:
     block = result.scalar_one_or_none()
     if block is None:
         return False
+    version = begin_board_write(db, block.itinerary_id)
+    _record_removed_blocks(db, block.itinerary_id, version, _subtree_block_ids(db, block.id))
     db.delete(block)
+    refresh_board_lanes(db, block.itinerary_id)
     db.commit()
     return True
 
@@ -220,27 +392,23 @@ def reorder_blocks(
     ordered_ids: list[uuid.UUID],
 ) -> None:
     """Reorder blocks within a container/day."""
-    for idx, block_id in enumerate(ordered_ids, start=1):
-        db.execute(
-            text(
-                "UPDATE itinerary_blocks "
-                "SET sort_order = :order, day_index = :day "
-                "WHERE id = :id AND itinerary_id = :itin_id"
-            ),
-            {"order": idx, "day": day_index, "id": str(block_id), "itin_id": str(itinerary_id)},
-        )
+    rows = [(block_id, idx, day_index) for idx, block_id in enumerate(ordered_ids, start=1)]
+    version = begin_board_write(db, itinerary_id)
+    _bulk_update_blocks(db, itinerary_id, ["sort_order", "day_index"], rows, version)
     db.commit()
 
 
 def auto_layout_board(db: Session, itinerary_id: uuid.UUID) -> int:
-    rows = _query_blocks(db, itinerary_id)
-    grouped: dict[tuple[int, str], list[ItineraryBlock]] = defaultdict(list)
+    table = ItineraryBlock.__table__
+    stmt = select(
+        table.c.id, table.c.day_index, table.c.lane_key, table.c.start_minute, table.c.sort_order
+    ).where(table.c.itinerary_id == itinerary_id, table.c.parent_block_id.is_(None))
+    rows = db.execute(stmt).all()
+    grouped: dict[tuple[int, str], list[Any]] = defaultdict(list)
     for row in rows:
-        if row.parent_block_id is not None:
-            continue
         grouped[(row.day_index, row.lane_key or "core")].append(row)
 
-    updated = 0
+    changes: list[tuple[uuid.UUID, int]] = []
     for items in grouped.values():
         items.sort(
             key=lambda row: (
@@ -251,8 +419,82 @@ def auto_layout_board(db: Session, itinerary_id: uuid.UUID) -> int:
         )
         for idx, row in enumerate(items, start=1):
             if row.sort_order != idx:
-                row.sort_order = idx
-                updated += 1
+                changes.append((row.id, idx))
+    if changes:
+        version = begin_board_write(db, itinerary_id)
+        _bulk_update_blocks(db, itinerary_id, ["sort_order"], changes, version)
+        db.commit()
+    return len(changes)
+
+
+def apply_block_ops(db: Session, itinerary_id: uuid.UUID, ops: list[BlockOp]) -> int:
+    """Apply reorder/layout/patch operations in order and write them with one statement.
+
+    Every op is validated against the state left by the ops before it, so a failing op
+    leaves the itinerary untouched.
+    """
+    block_ids: set[uuid.UUID] = set()
+    for op in ops:
+        if isinstance(op, BlockReorderOp):
+            block_ids.update(op.ordered_block_ids)
+        elif isinstance(op, BlockLayoutOp):
+            block_ids.add(op.block_id)
+        else:
+            block_ids.update(op.block_ids)
+
+    table = ItineraryBlock.__table__
+    state = {
+        row["id"]: dict(row)
+        for row in db.execute(
+            select(table.c.id, *(table.c[name] for name in _BULK_COLUMNS)).where(
+                table.c.itinerary_id == itinerary_id,
+                table.c.id.in_(sorted(block_ids, key=str)),
+            )
+        ).mappings()
+    }
+    changed: dict[uuid.UUID, set[str]] = defaultdict(set)
+
+    def _set(block_id: uuid.UUID, updates: dict[str, Any]) -> None:
+        current = state.get(block_id)
+        if current is None:
+            return
+        for key, value in updates.items():
+            if current[key] != value:
+                current[key] = value
+                changed[block_id].add(key)
+
+    for op in ops:
+        if isinstance(op, BlockReorderOp):
+            for idx, block_id in enumerate(op.ordered_block_ids, start=1):
+                _set(block_id, {"sort_order": idx, "day_index": op.day_index})
+        elif isinstance(op, BlockLayoutOp):
+            current = state.get(op.block_id)
+            if current is None:
+                raise ValueError("Block not found")
+            patch = op.model_dump(exclude_unset=True, exclude={"op", "block_id"})
+            if "lane_key" in patch:
+                _validate_lane_key(str(patch["lane_key"]))
+            _validate_minute_range(
+                patch.get("start_minute", current["start_minute"]),
+                patch.get("end_minute", current["end_minute"]),
+            )
+            _set(op.block_id, patch)
+        else:
+            updates = _patch_values(op)
+            for block_id in op.block_ids:
+                _set(block_id, updates)
+
+    if not changed:
+        return 0
+    columns = [name for name in _BULK_COLUMNS if any(name in keys for keys in changed.values())]
+    rows = [
+        (block_id, *(state[block_id][name] for name in columns))
+        for block_id in sorted(changed, key=str)
+    ]
+    version = begin_board_write(db, itinerary_id)
+    updated = _bulk_update_blocks(db, itinerary_id, columns, rows, version)
+    if "lane_key" in columns or "status" in columns:
+        refresh_board_lanes(db, itinerary_id)
     db.commit()
     return updated
 
@@ -274,25 +516,24 @@ def create_dependency(
     if source.itinerary_id != itinerary_id or target.itinerary_id != itinerary_id:
         raise ValueError("Dependency blocks must belong to the itinerary")
 
-    existing_edges = db.execute(
-        select(ItineraryBlockEdge).where(ItineraryBlockEdge.itinerary_id == itinerary_id)
-    ).scalars().all()
-    if _would_create_cycle(existing_edges, from_block_id, payload.to_block_id):
-        raise ValueError("Dependency cycle detected")
-
-    for edge in existing_edges:
-        if edge.from_block_id == from_block_id and edge.to_block_id == payload.to_block_id:
-            raise ValueError("Dependency already exists")
+    version = begin_board_write(db, itinerary_id)
+    # The board version row is locked now, so the previous version is what is committed.
+    graph = get_dependency_graph(db, itinerary_id, version - 1).copy()
+    if graph.has_edge(from_block_id, payload.to_block_id):
+        raise ValueError("Dependency already exists")
+    graph.add_edge(from_block_id, payload.to_block_id)
 
     edge = ItineraryBlockEdge(
         itinerary_id=itinerary_id,
         from_block_id=from_block_id,
         to_block_id=payload.to_block_id,
         edge_type=payload.edge_type,
+        board_version=version,
     )
     db.add(edge)
     db.commit()
     db.refresh(edge)
+    _dependency_graph_cache.set(itinerary_id, (version, graph))
     return _edge_to_dict(edge)
 
 
@@ -311,8 +552,16 @@ def delete_dependency(
     ).scalar_one_or_none()
     if edge is None:
         return False
+    version = begin_board_write(db, itinerary_id)
+    _record_removed(db, itinerary_id, version, [], [edge.id])
+    removed = (edge.from_block_id, edge.to_block_id)
     db.delete(edge)
     db.commit()
+    cached = _dependency_graph_cache.get(itinerary_id)
+    if cached is not None and cached[0] == version - 1:
+        graph = cached[1].copy()
+        graph.remove_edge(*removed)
+        _dependency_graph_cache.set(itinerary_id, (version, graph))
     return True
 
 
@@ -325,6 +574,45 @@ def list_dependencies(db: Session, itinerary_id: uuid.UUID) -> list[dict[str, An
     return [_edge_to_dict(item) for item in rows]
 
 
+def get_dependency_graph(
+    db: Session, itinerary_id: uuid.UUID, version: int | None = None
+) -> DependencyGraph:
+    """Return the itinerary's dependency graph, rebuilt only when the board version moves.
+
+    Every block and edge write bumps the board version, so a cached graph is reused only
+    while nothing it was built from has changed.
+    """
+    if version is None:
+        version = get_board_version(db, itinerary_id)
+    cached = _dependency_graph_cache.get(itinerary_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    graph = _load_dependency_graph(db, itinerary_id)
+    _dependency_graph_cache.set(itinerary_id, (version, graph))
+    return graph
+
+
+def get_dependency_schedule(db: Session, itinerary_id: uuid.UUID) -> dict[str, Any]:
+    version = get_board_version(db, itinerary_id)
+    schedule = get_dependency_graph(db, itinerary_id, version).schedule()
+    critical = set(schedule.critical_path)
+    return {
+        "itinerary_id": itinerary_id,
+        "version": version,
+        "items": [
+            {
+                "block_id": block_id,
+                "earliest_start_minute": schedule.earliest_start[block_id],
+                "earliest_finish_minute": schedule.earliest_finish[block_id],
+                "critical": block_id in critical,
+            }
+            for block_id in schedule.order
+        ],
+        "critical_path": schedule.critical_path,
+        "finish_minute": schedule.finish_minute,
+    }
+
+
 def migrate_legacy_items(db: Session, itinerary_id: uuid.UUID) -> list[dict[str, Any]]:
     """Migrate legacy itinerary_items to itinerary_blocks (one-time)."""
     existing = db.execute(
@@ -342,7 +630,10 @@ def migrate_legacy_items(db: Session, itinerary_id: uuid.UUID) -> list[dict[str,
         .order_by(ItineraryItem.day_index, ItineraryItem.sort_order)
     )
     rows = db.execute(stmt).all()
+    if not rows:
+        return []
 
+    version = begin_board_write(db, itinerary_id)
     created: list[dict[str, Any]] = []
     for item, poi in rows:
         block = ItineraryBlock(
@@ -373,6 +664,7 @@ def migrate_legacy_items(db: Session, itinerary_id: uuid.UUID) -> list[dict[str,
             assignee_user_id=None,
             tags=None,
             ui_meta=None,
+            board_version=version,
         )
         db.add(block)
         db.flush()
@@ -386,6 +678,7 @@ def migrate_legacy_items(db: Session, itinerary_id: uuid.UUID) -> list[dict[str,
             )
         created.append(_row_to_dict(block))
 
+    refresh_board_lanes(db, itinerary_id)
     db.commit()
     return created
 
@@ -409,62 +702,177 @@ def ungroup_block(db: Session, block_id: uuid.UUID) -> list[dict[str, Any]]:
 
     promoted: list[dict[str, Any]] = []
     base_order = container.sort_order
+    version = begin_board_write(db, container.itinerary_id)
     for idx, child in enumerate(children):
         child.parent_block_id = container.parent_block_id
         child.day_index = container.day_index
         child.sort_order = base_order + idx
+        child.board_version = version
         promoted.append(_row_to_dict(child))
 
+    _record_removed_blocks(db, container.itinerary_id, version, [container.id])
     db.delete(container)
+    refresh_board_lanes(db, container.itinerary_id)
     db.commit()
     return promoted
 
 
-def _query_blocks(db: Session, itinerary_id: uuid.UUID) -> list[ItineraryBlock]:
+def _board_version_key(itinerary_id: uuid.UUID) -> str:
+    return f"board:{itinerary_id}"
+
+
+def _board_changes(db: Session, itinerary_id: uuid.UUID, since: int) -> dict[str, Any]:
+    blocks = _query_block_rows(db, itinerary_id, since)
+    edges = db.execute(
+        select(ItineraryBlockEdge)
+        .where(
+            ItineraryBlockEdge.itinerary_id == itinerary_id,
+            ItineraryBlockEdge.board_version > since,
+        )
+        .order_by(ItineraryBlockEdge.created_at.asc())
+    ).scalars().all()
+    removed = db.execute(
+        select(ItineraryBoardTombstone.entity_type, ItineraryBoardTombstone.entity_id).where(
+            ItineraryBoardTombstone.itinerary_id == itinerary_id,
+            ItineraryBoardTombstone.board_version > since,
+        )
+    ).all()
+    return {
+        "delta": True,
+        # Changed blocks come back flat; clients place them by parent_block_id.
+        "items": blocks,
+        "dependencies": [_edge_to_dict(edge) for edge in edges],
+        "removed_block_ids": [entity_id for kind, entity_id in removed if kind == "block"],
+        "removed_edge_ids": [entity_id for kind, entity_id in removed if kind == "edge"],
+    }
+
+
+def _subtree_block_ids(db: Session, block_id: uuid.UUID) -> list[uuid.UUID]:
+    table = ItineraryBlock.__table__
+    subtree = select(table.c.id).where(table.c.id == block_id).cte("subtree", recursive=True)
+    subtree = subtree.union_all(
+        select(table.c.id).where(table.c.parent_block_id == subtree.c.id)
+    )
+    return list(db.scalars(select(subtree.c.id)).all())
+
+
+def _record_removed_blocks(
+    db: Session, itinerary_id: uuid.UUID, version: int, block_ids: list[uuid.UUID]
+) -> None:
+    """Tombstone blocks about to be deleted along with the edges their delete cascades to."""
+    edge_ids = db.scalars(
+        select(ItineraryBlockEdge.id).where(
+            or_(
+                ItineraryBlockEdge.from_block_id.in_(block_ids),
+                ItineraryBlockEdge.to_block_id.in_(block_ids),
+            )
+        )
+    ).all()
+    _record_removed(db, itinerary_id, version, block_ids, list(edge_ids))
+
+
+def _record_removed(
+    db: Session,
+    itinerary_id: uuid.UUID,
+    version: int,
+    block_ids: list[uuid.UUID],
+    edge_ids: list[uuid.UUID],
+) -> None:
+    rows = [
+        {
+            "entity_id": entity_id,
+            "itinerary_id": itinerary_id,
+            "entity_type": entity_type,
+            "board_version": version,
+        }
+        for entity_type, entity_ids in (("block", block_ids), ("edge", edge_ids))
+        for entity_id in dict.fromkeys(entity_ids)
+    ]
+    if rows:
+        db.execute(insert(ItineraryBoardTombstone), rows)
+
+
+def _query_block_rows(
+    db: Session, itinerary_id: uuid.UUID, since: int | None = None
+) -> list[BlockRow]:
+    table = ItineraryBlock.__table__
     stmt = (
-        select(ItineraryBlock)
-        .where(ItineraryBlock.itinerary_id == itinerary_id)
+        select(*_BLOCK_ROW_COLUMNS)
+        .where(table.c.itinerary_id == itinerary_id)
+        # Byte-order lane keys and the id tiebreak give the order clients have always seen.
         .order_by(
-            ItineraryBlock.day_index,
-            ItineraryBlock.lane_key,
-            ItineraryBlock.sort_order,
-            ItineraryBlock.created_at,
+            table.c.day_index,
+            table.c.lane_key.collate("C"),
+            table.c.sort_order,
+            table.c.id,
         )
     )
-    return db.execute(stmt).scalars().all()
+    if since is not None:
+        stmt = stmt.where(table.c.board_version > since)
+    return [BlockRow(*row) for row in db.execute(stmt).all()]
 
 
-def _build_block_tree(rows: list[ItineraryBlock]) -> list[dict[str, Any]]:
-    block_map: dict[uuid.UUID, dict[str, Any]] = {}
+def _build_block_tree(rows: list[BlockRow]) -> list[BlockRow]:
+    """Nest rows under their parents in one pass; siblings keep the query order."""
+    block_map = {row.id: row for row in rows}
+    roots: list[BlockRow] = []
     for row in rows:
-        block_map[row.id] = _row_to_dict(row)
-
-    roots: list[dict[str, Any]] = []
-    for block in block_map.values():
-        pid = block["parent_block_id"]
-        if pid and pid in block_map:
-            block_map[pid]["children"].append(block)
+        parent = block_map.get(row.parent_block_id)
+        if parent is not None:
+            parent.children.append(row)
         else:
-            roots.append(block)
-
-    for block in block_map.values():
-        block["children"].sort(
-            key=lambda b: (
-                b["day_index"],
-                str(b.get("lane_key") or "core"),
-                b["sort_order"],
-                str(b["id"]),
-            )
-        )
-    roots.sort(
-        key=lambda b: (
-            b["day_index"],
-            str(b.get("lane_key") or "core"),
-            b["sort_order"],
-            str(b["id"]),
+            roots.append(row)
+    return roots
+
+
+def _patch_values(payload: BlockBatchUpdateRequest | BlockPatchOp) -> dict[str, Any]:
+    if payload.status is not None:
+        _validate_status(payload.status)
+    if payload.priority is not None:
+        _validate_priority(payload.priority)
+    if payload.risk_level is not None:
+        _validate_risk_level(payload.risk_level)
+    updates: dict[str, Any] = {}
+    for name in ("status", "priority", "risk_level", "assignee_user_id", "tags"):
+        value = getattr(payload, name)
+        if value is not None:
+            updates[name] = value
+    return updates
+
+
+def _bulk_update_blocks(
+    db: Session,
+    itinerary_id: uuid.UUID,
+    columns: list[str],
+    rows: list[tuple[Any, ...]],
+    board_version: int,
+) -> int:
+    """Write per-block values with a single UPDATE ... FROM (VALUES ...).
+
+    Each row is ``(block_id, *values)`` in ``columns`` order; ids outside the itinerary
+    are ignored. Every written row is stamped with ``board_version``.
+    """
+    if not rows:
+        return 0
+    table = ItineraryBlock.__table__
+    value_columns = [column("id", table.c.id.type)]
+    for name in columns:
+        column_type = table.c[name].type
+        if isinstance(column_type, JSON):
+            # Keep untouched NULL tags as SQL NULL instead of the JSON 'null' literal.
+            column_type = JSON(none_as_null=True)
+        value_columns.append(column(name, column_type))
+    patch = values(*value_columns, name="patch").data(rows)
+    stmt = (
+        update(table)
+        .where(table.c.id == patch.c.id, table.c.itinerary_id == itinerary_id)
+        # None renders as a bare NULL, so a column that is NULL in every row would be typed text.
+        .values(
+            {name: cast(patch.c[name], table.c[name].type) for name in columns}
+            | {"board_version": board_version}
         )
     )
-    return roots
+    return db.execute(stmt).rowcount
 
 
 def _validate_patch(patch: dict[str, Any]) -> None:
@@ -523,29 +931,28 @@ def _get_block(db: Session, block_id: uuid.UUID) -> ItineraryBlock | None:
     return db.execute(stmt).scalar_one_or_none()
 
 
-def _would_create_cycle(
-    edges: list[ItineraryBlockEdge],
-    from_block_id: uuid.UUID,
-    to_block_id: uuid.UUID,
-) -> bool:
-    graph: dict[uuid.UUID, list[uuid.UUID]] = defaultdict(list)
-    for edge in edges:
-        graph[edge.from_block_id].append(edge.to_block_id)
-    graph[from_block_id].append(to_block_id)
-
-    stack = [to_block_id]
-    visited: set[uuid.UUID] = set()
-    while stack:
-        node = stack.pop()
-        if node == from_block_id:
-            return True
-        if node in visited:
-            continue
-        visited.add(node)
-        for nxt in graph.get(node, []):
-            if nxt not in visited:
-                stack.append(nxt)
-    return False
+def _load_dependency_graph(db: Session, itinerary_id: uuid.UUID) -> DependencyGraph:
+    table = ItineraryBlock.__table__
+    blocks = db.execute(
+        select(
+            table.c.id,
+            table.c.day_index,
+            table.c.start_minute,
+            table.c.end_minute,
+            table.c.duration_minutes,
+        )
+        .where(table.c.itinerary_id == itinerary_id)
+        .order_by(table.c.day_index, table.c.start_minute, table.c.sort_order, table.c.id)
+    ).all()
+    edges = db.execute(
+        select(ItineraryBlockEdge.from_block_id, ItineraryBlockEdge.to_block_id).where(
+            ItineraryBlockEdge.itinerary_id == itinerary_id
+        )
+    ).all()
+    return DependencyGraph(
+        {block_id: block_node(*timing) for block_id, *timing in blocks},
+        edges,
+    )
 
 
 def _update_geom(db: Session, block_id: uuid.UUID, lng: float | None, lat: float | None) -> None:
@@ -1,11 +1,18 @@
 import uuid
 from typing import Any
 
-from sqlalchemy import func, select, text
+from sqlalchemy import func, insert, select, text, update
 from sqlalchemy.orm import Session
 
 from app.models.block_template import BlockTemplate, BlockTemplateRating
+from app.models.itinerary_block import ItineraryBlock
 from app.models.user import User
+from app.services.block_service import (
+    _BLOCK_ROW_COLUMNS,
+    BlockRow,
+    begin_board_write,
+    refresh_board_lanes,
+)
 
 
 def publish_template(
@@ -126,89 +133,74 @@ def fork_template_to_blocks(
     sort_order: int,
     lane_key: str,
     parent_block_id: uuid.UUID | None,
-) -> list[dict[str, Any]]:
+) -> list[BlockRow]:
     """Fork a template into actual blocks in an itinerary."""
-    from app.services.block_service import _row_to_dict
-
     template = db.get(BlockTemplate, template_id)
     if template is None:
         raise ValueError("Template not found")
 
-    created_blocks: list[dict[str, Any]] = []
+    version = begin_board_write(db, itinerary_id)
+    placement = {
+        "itinerary_id": itinerary_id,
+        "day_index": day_index,
+        "lane_key": lane_key,
+        "source_template_id": template_id,
+        "board_version": version,
+    }
 
     if template.is_group and template.children_snapshot:
-        # Create container block
-        from app.models.itinerary_block import ItineraryBlock
-
-        container = ItineraryBlock(
-            itinerary_id=itinerary_id,
-            parent_block_id=parent_block_id,
-            sort_order=sort_order,
-            day_index=day_index,
-            lane_key=lane_key,
-            block_type=template.block_type if template.block_type != "group" else "scenic",
-            title=template.title,
-            is_container=True,
-            source_template_id=template_id,
-            type_data=template.content_snapshot,
-        )
-        db.add(container)
-        db.flush()
-        created_blocks.append(_row_to_dict(container))
-
-        # Create children
-        for idx, child_data in enumerate(template.children_snapshot, start=1):
-            child = ItineraryBlock(
-                itinerary_id=itinerary_id,
-                parent_block_id=container.id,
-                sort_order=idx,
-                day_index=day_index,
-                lane_key=lane_key,
+        # Ids are generated here so children can point at the container in the same INSERT.
+        container_id = uuid.uuid4()
+        rows = [
+            _fork_row(
+                placement,
+                container_id,
+                parent_block_id,
+                sort_order,
+                {"is_container": True, "type_data": template.content_snapshot},
+                block_type=template.block_type if template.block_type != "group" else "scenic",
+                title=template.title,
+            )
+        ]
+        rows.extend(
+            _fork_row(
+                placement,
+                uuid.uuid4(),
+                container_id,
+                idx,
+                child_data,
                 block_type=child_data.get("block_type", "scenic"),
                 title=child_data.get("title", ""),
-                duration_minutes=child_data.get("duration_minutes"),
-                cost=child_data.get("cost"),
-                tips=child_data.get("tips"),
-                address=child_data.get("address"),
-                photos=child_data.get("photos"),
-                type_data=child_data.get("type_data"),
-                is_container=child_data.get("is_container", False),
-                source_template_id=template_id,
             )
-            db.add(child)
-            db.flush()
-            created_blocks.append(_row_to_dict(child))
-    else:
-        # Single element template
-        from app.models.itinerary_block import ItineraryBlock
-
-        snapshot = template.content_snapshot or {}
-        block = ItineraryBlock(
-            itinerary_id=itinerary_id,
-            parent_block_id=parent_block_id,
-            sort_order=sort_order,
-            day_index=day_index,
-            lane_key=lane_key,
-            block_type=template.block_type,
-            title=template.title,
-            duration_minutes=snapshot.get("duration_minutes"),
-            cost=snapshot.get("cost"),
-            tips=snapshot.get("tips"),
-            address=snapshot.get("address"),
-            photos=snapshot.get("photos"),
-            type_data=snapshot.get("type_data"),
-            is_container=snapshot.get("is_container", False),
-            source_template_id=template_id,
+            for idx, child_data in enumerate(template.children_snapshot, start=1)
         )
-        db.add(block)
-        db.flush()
-        created_blocks.append(_row_to_dict(block))
-
-    # Bump fork count
-    template.fork_count = template.fork_count + 1
+    else:
+        rows = [
+            _fork_row(
+                placement,
+                uuid.uuid4(),
+                parent_block_id,
+                sort_order,
+                template.content_snapshot or {},
+                block_type=template.block_type,
+                title=template.title,
+            )
+        ]
+
+    inserted = db.execute(
+        insert(ItineraryBlock.__table__).values(rows).returning(*_BLOCK_ROW_COLUMNS)
+    ).all()
+    created = {row.id: BlockRow(*row) for row in inserted}
+    refresh_board_lanes(db, itinerary_id)
+    # Incremented in SQL as the last write, so concurrent forks hold the row lock only briefly.
+    db.execute(
+        update(BlockTemplate.__table__)
+        .where(BlockTemplate.__table__.c.id == template_id)
+        .values(fork_count=BlockTemplate.__table__.c.fork_count + 1)
+    )
     db.commit()
 
-    return created_blocks
+    return [created[row["id"]] for row in rows]
 
 
 def rate_template(
@@ -252,6 +244,34 @@ def rate_template(
     return _template_to_dict(db, template)
 
 
+def _fork_row(
+    placement: dict[str, Any],
+    block_id: uuid.UUID,
+    parent_block_id: uuid.UUID | None,
+    sort_order: int,
+    snapshot: dict[str, Any],
+    *,
+    block_type: str,
+    title: str,
+) -> dict[str, Any]:
+    # A multi-row INSERT needs the same keys in every row.
+    return {
+        **placement,
+        "id": block_id,
+        "parent_block_id": parent_block_id,
+        "sort_order": sort_order,
+        "block_type": block_type,
+        "title": title,
+        "duration_minutes": snapshot.get("duration_minutes"),
+        "cost": snapshot.get("cost"),
+        "tips": snapshot.get("tips"),
+        "address": snapshot.get("address"),
+        "photos": snapshot.get("photos"),
+        "type_data": snapshot.get("type_data"),
+        "is_container": snapshot.get("is_container", False),
+    }
+
+
 def _template_to_dict(db: Session, template: BlockTemplate) -> dict[str, Any]:
     """Convert template ORM row to response dict."""
     # Fetch author nickname
@@ -1,15 +1,16 @@
+import base64
 import logging
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
-from io import BytesIO
 from uuid import UUID
 
 from fastapi import HTTPException, UploadFile, status
-from PIL import ExifTags, Image
-from sqlalchemy import func, select
+from sqlalchemy import cast, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.db.types import Geography
 from app.models.bounty import BountySubmission, BountyTask
 from app.models.poi import Poi
 from app.models.territory import TerritoryRegion
@@ -21,21 +22,20 @@ from app.schemas.bounty import (
     BountyTaskItem,
     BountyTaskListResponse,
 )
+from app.services.direct_upload_service import claim_direct_upload
+from app.services.geo_index import METERS_PER_DEGREE, GridIndex
+from app.services.geo_index import haversine_distance_meters as _haversine_distance_meters
+from app.services.image_pipeline import process_image_upload, validate_image_upload
+from app.services.job_scheduler import get_job_watermark, set_job_watermark
 from app.services.passport_service import evaluate_badges, record_contribution
-from app.services.poi_correction_service import strip_exif_bytes
 from app.services.storage import get_storage_provider
 from app.services.territory_service import record_territory_contribution
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-_ALLOWED_IMAGE_TYPES = {
-    "image/jpeg": "jpg",
-    "image/png": "png",
-    "image/webp": "webp",
-}
-_GPS_INFO_TAG = next((k for k, v in ExifTags.TAGS.items() if v == "GPSInfo"), 34853)
-_EXIF_TIME_TAGS = (36867, 36868, 306)
+_ACTIVE_TASK_STATUSES = ("open", "claimed", "submitted")
+STALE_BOUNTY_JOB = "bounty-stale-generator"
 
 
 def _to_float(value: Decimal | float | int | None) -> float | None:
@@ -52,87 +52,6 @@ def _parse_point_text(raw: str) -> tuple[float, float]:
     return float(lon_str), float(lat_str)
 
 
-def _haversine_distance_meters(
-    longitude_a: float, latitude_a: float, longitude_b: float, latitude_b: float
-) -> float:
-    from math import asin, cos, radians, sin, sqrt
-
-    earth_radius = 6371000.0
-    dlon = radians(longitude_b - longitude_a)
-    dlat = radians(latitude_b - latitude_a)
-    lat1 = radians(latitude_a)
-    lat2 = radians(latitude_b)
-    value = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * asin(sqrt(value))
-    return earth_radius * c
-
-
-def _validate_image_upload(photo: UploadFile) -> tuple[str, str]:
-    content_type = (photo.content_type or "").strip().lower()
-    extension = _ALLOWED_IMAGE_TYPES.get(content_type)
-    if extension is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only JPEG/PNG/WEBP images are supported",
-        )
-    return content_type, extension
-
-
-def _gps_part_to_float(value: object) -> float | None:
-    if isinstance(value, (int, float)):
-        return float(value)
-    if hasattr(value, "numerator") and hasattr(value, "denominator"):
-        denominator = getattr(value, "denominator", 0) or 0
-        if denominator == 0:
-            return None
-        return float(getattr(value, "numerator", 0) / denominator)
-    return None
-
-
-def _gps_coord_to_decimal(ref: object, values: object) -> float | None:
-    if not isinstance(values, (tuple, list)) or len(values) != 3:
-        return None
-    degrees = _gps_part_to_float(values[0])
-    minutes = _gps_part_to_float(values[1])
-    seconds = _gps_part_to_float(values[2])
-    if degrees is None or minutes is None or seconds is None:
-        return None
-    decimal = degrees + minutes / 60 + seconds / 3600
-    ref_text = str(ref or "").upper()
-    if ref_text in {"S", "W"}:
-        decimal *= -1
-    return decimal
-
-
-def _extract_exif_metadata(raw_bytes: bytes) -> tuple[datetime | None, float | None, float | None]:
-    try:
-        with Image.open(BytesIO(raw_bytes)) as image:
-            exif = image.getexif()
-    except Exception:
-        return None, None, None
-    if not exif:
-        return None, None, None
-
-    captured_at: datetime | None = None
-    for key in _EXIF_TIME_TAGS:
-        value = exif.get(key)
-        if isinstance(value, str):
-            try:
-                parsed = datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-            except ValueError:
-                continue
-            captured_at = parsed.replace(tzinfo=UTC)
-            break
-
-    gps_info = exif.get(_GPS_INFO_TAG)
-    if not isinstance(gps_info, dict):
-        return captured_at, None, None
-
-    gps_lat = _gps_coord_to_decimal(gps_info.get(1), gps_info.get(2))
-    gps_lon = _gps_coord_to_decimal(gps_info.get(3), gps_info.get(4))
-    return captured_at, gps_lon, gps_lat
-
-
 def _resolve_poi_coordinate(db: Session, poi_id: UUID) -> tuple[float, float]:
     point_text = db.scalar(select(func.ST_AsText(Poi.geom)).where(Poi.id == poi_id).limit(1))
     if not point_text:
@@ -249,6 +168,7 @@ def _build_submission_item(
         distance_meters=float(submission.distance_meters),
         gps_verified=submission.gps_verified,
         photo_url=submission.photo_url,
+        photo_thumbnail_url=submission.photo_thumbnail_url,
         photo_exif_captured_at=submission.photo_exif_captured_at,
         photo_exif_longitude=_to_float(submission.photo_exif_longitude),
         photo_exif_latitude=_to_float(submission.photo_exif_latitude),
@@ -279,45 +199,114 @@ def _load_task_with_names(db: Session, task_id: UUID) -> tuple[BountyTask, str,
     return task, poi_name, territory_name
 
 
-def ensure_stale_bounty_tasks(db: Session) -> int:
+def generate_stale_bounty_tasks(db: Session) -> int:
+    """Open a bounty task for every POI that went stale since the previous run.
+
+    The job watermark stores the staleness cutoff already covered, so each run only
+    scans POIs whose updated_at fell between the previous and the current cutoff.
+    """
     stale_days = max(int(settings.bounty_stale_days), 1)
-    cutoff = datetime.now(UTC) - timedelta(days=stale_days)
-    stale_rows = db.execute(
-        select(Poi.id, Poi.territory_id)
-        .where(func.coalesce(Poi.updated_at, Poi.created_at) < cutoff)
-    ).all()
-    if not stale_rows:
-        return 0
-
-    stale_poi_ids = [row[0] for row in stale_rows]
-    existing_open_poi_ids = set(
-        db.scalars(
-            select(BountyTask.poi_id).where(
-                BountyTask.poi_id.in_(stale_poi_ids),
-                BountyTask.status.in_(("open", "claimed", "submitted")),
-            )
-        ).all()
+    now = datetime.now(UTC)
+    cutoff = now - timedelta(days=stale_days)
+    previous_cutoff = get_job_watermark(db, STALE_BOUNTY_JOB)
+
+    conditions = [Poi.updated_at < cutoff]
+    if previous_cutoff is not None:
+        conditions.append(Poi.updated_at >= previous_cutoff)
+    stale_pois = select(
+        func.gen_random_uuid(),
+        Poi.id,
+        Poi.territory_id,
+        literal("open"),
+        literal(settings.bounty_default_reward_points),
+        literal(stale_days),
+        literal(now),
+    ).where(*conditions)
+    result = db.execute(
+        pg_insert(BountyTask)
+        .from_select(
+            ["id", "poi_id", "territory_id", "status", "reward_points", "stale_days_snapshot", "generated_at"],
+            stale_pois,
+        )
+        .on_conflict_do_nothing(
+            index_elements=[BountyTask.poi_id],
+            index_where=BountyTask.status.in_(_ACTIVE_TASK_STATUSES),
+        )
     )
+    set_job_watermark(db, STALE_BOUNTY_JOB, cutoff)
+    db.commit()
+    return result.rowcount or 0
 
-    generated_count = 0
-    for poi_id, territory_id in stale_rows:
-        if poi_id in existing_open_poi_ids:
-            continue
-        db.add(
-            BountyTask(
-                poi_id=poi_id,
-                territory_id=territory_id,
-                status="open",
-                reward_points=settings.bounty_default_reward_points,
-                stale_days_snapshot=stale_days,
-                generated_at=datetime.now(UTC),
-            )
+
+def _supports_postgis(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _list_nearby_open_tasks(
+    db: Session, *, longitude: float, latitude: float, offset: int, limit: int
+) -> tuple[int, list[tuple[BountyTask, str, str | None, float | None]]]:
+    radius = float(settings.bounty_nearby_radius_meters)
+    if not _supports_postgis(db):
+        return _list_nearby_open_tasks_from_grid(
+            db, longitude=longitude, latitude=latitude, radius=radius, offset=offset, limit=limit
         )
-        generated_count += 1
 
-    if generated_count > 0:
-        db.commit()
-    return generated_count
+    origin = cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography())
+    poi_geography = cast(Poi.geom, Geography())
+    conditions = (BountyTask.status == "open", func.ST_DWithin(poi_geography, origin, radius))
+    total = db.scalar(
+        select(func.count())
+        .select_from(BountyTask)
+        .join(Poi, Poi.id == BountyTask.poi_id)
+        .where(*conditions)
+    ) or 0
+    if offset >= total:
+        return total, []
+    rows = db.execute(
+        select(BountyTask, Poi.name, TerritoryRegion.name, func.ST_Distance(poi_geography, origin))
+        .join(Poi, Poi.id == BountyTask.poi_id)
+        .outerjoin(TerritoryRegion, TerritoryRegion.id == BountyTask.territory_id)
+        .where(*conditions)
+        .order_by(poi_geography.op("<->")(origin), BountyTask.id)
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    return total, [tuple(row) for row in rows]
+
+
+def _list_nearby_open_tasks_from_grid(
+    db: Session, *, longitude: float, latitude: float, radius: float, offset: int, limit: int
+) -> tuple[int, list[tuple[BountyTask, str, str | None, float | None]]]:
+    rows = db.execute(
+        select(BountyTask, Poi.name, TerritoryRegion.name, func.ST_AsText(Poi.geom))
+        .join(Poi, Poi.id == BountyTask.poi_id)
+        .outerjoin(TerritoryRegion, TerritoryRegion.id == BountyTask.territory_id)
+        .where(BountyTask.status == "open")
+    ).all()
+    index = GridIndex(cell_size_deg=radius / METERS_PER_DEGREE)
+    tasks_by_id: dict[UUID, tuple[BountyTask, str, str | None]] = {}
+    for task, poi_name, territory_name, point_text in rows:
+        if not point_text:
+            continue
+        poi_lon, poi_lat = _parse_point_text(point_text)
+        index.insert(task.id, poi_lon, poi_lat)
+        tasks_by_id[task.id] = (task, poi_name, territory_name)
+    matches = index.within(longitude, latitude, radius)
+    return len(matches), [(*tasks_by_id[task_id], distance) for task_id, distance in matches[offset : offset + limit]]
+
+
+def _encode_task_cursor(task: BountyTask) -> str:
+    raw = f"{task.generated_at.isoformat()}|{task.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_task_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        generated_at, task_id = raw.split("|", maxsplit=1)
+        return datetime.fromisoformat(generated_at), UUID(task_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
 
 
 def list_bounty_tasks(
@@ -329,42 +318,47 @@ def list_bounty_tasks(
     limit: int,
     longitude: float | None,
     latitude: float | None,
+    cursor: str | None = None,
 ) -> BountyTaskListResponse:
-    ensure_stale_bounty_tasks(db)
-    rows = db.execute(
-        select(BountyTask, Poi.name, TerritoryRegion.name)
-        .join(Poi, Poi.id == BountyTask.poi_id)
-        .outerjoin(TerritoryRegion, TerritoryRegion.id == BountyTask.territory_id)
-        .where(BountyTask.status.in_(("open", "claimed", "submitted", "approved", "rejected")))
-        .order_by(BountyTask.generated_at.desc())
-    ).all()
-
-    filtered: list[tuple[BountyTask, str, str | None, float | None]] = []
-    if scope == "mine":
-        for task, poi_name, territory_name in rows:
-            if task.claimed_by_user_id == current_user.id:
-                filtered.append((task, poi_name, territory_name, None))
-    elif scope == "nearby":
+    next_cursor: str | None = None
+    if scope == "nearby":
         if longitude is None or latitude is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="longitude and latitude are required for nearby scope",
             )
         _validate_submission_coordinate(longitude, latitude)
-        for task, poi_name, territory_name in rows:
-            if task.status != "open":
-                continue
-            poi_lon, poi_lat = _resolve_poi_coordinate(db, task.poi_id)
-            distance = _haversine_distance_meters(longitude, latitude, poi_lon, poi_lat)
-            if distance <= settings.bounty_nearby_radius_meters:
-                filtered.append((task, poi_name, territory_name, distance))
+        total, paged = _list_nearby_open_tasks(
+            db, longitude=longitude, latitude=latitude, offset=offset, limit=limit
+        )
     else:
-        for task, poi_name, territory_name in rows:
-            if task.status == "open":
-                filtered.append((task, poi_name, territory_name, None))
+        if scope == "mine":
+            conditions = (
+                BountyTask.claimed_by_user_id == current_user.id,
+                BountyTask.status.in_(("open", "claimed", "submitted", "approved", "rejected")),
+            )
+        else:
+            conditions = (BountyTask.status == "open",)
+        # Counted without the name joins so it stays on the bounty_tasks indexes.
+        total = db.scalar(select(func.count()).select_from(BountyTask).where(*conditions)) or 0
+
+        stmt = (
+            select(BountyTask, Poi.name, TerritoryRegion.name)
+            .join(Poi, Poi.id == BountyTask.poi_id)
+            .outerjoin(TerritoryRegion, TerritoryRegion.id == BountyTask.territory_id)
+            .where(*conditions)
+            .order_by(BountyTask.generated_at.desc(), BountyTask.id.desc())
+        )
+        if cursor is not None:
+            stmt = stmt.where(tuple_(BountyTask.generated_at, BountyTask.id) < tuple_(*_decode_task_cursor(cursor)))
+        elif offset:
+            stmt = stmt.offset(offset)
+        rows = db.execute(stmt.limit(limit + 1)).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_task_cursor(rows[-1][0])
+        paged = [(task, poi_name, territory_name, None) for task, poi_name, territory_name in rows]
 
-    total = len(filtered)
-    paged = filtered[offset : offset + limit]
     items = [
         _build_task_item(task, poi_name=poi_name, territory_name=territory_name, distance_meters=distance)
         for task, poi_name, territory_name, distance in paged
@@ -375,6 +369,7 @@ def list_bounty_tasks(
         offset=offset,
         limit=limit,
         nearby_radius_meters=settings.bounty_nearby_radius_meters if scope == "nearby" else None,
+        next_cursor=next_cursor,
     )
 
 
@@ -448,7 +443,8 @@ async def submit_bounty_task(
     submit_longitude: float,
     submit_latitude: float,
     details: str | None,
-    photo: UploadFile,
+    photo: UploadFile | None,
+    photo_storage_key: str | None = None,
 ) -> BountySubmitResponse:
     _assert_new_user_cooldown(db, current_user)
     _validate_submission_coordinate(submit_longitude, submit_latitude)
@@ -461,14 +457,15 @@ async def submit_bounty_task(
     if task.status != "claimed":
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Task is not in claim state")
 
-    if photo is None:
+    if photo is None and photo_storage_key is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Photo is required")
-    content_type, extension = _validate_image_upload(photo)
-    raw_photo = await photo.read()
-    if not raw_photo:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Photo file is empty")
-
-    exif_captured_at, exif_longitude, exif_latitude = _extract_exif_metadata(raw_photo)
+    if photo is not None and photo_storage_key is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Send either photo or photo_storage_key, not both",
+        )
+    if photo is not None:
+        validate_image_upload(photo)
 
     poi_longitude, poi_latitude = _resolve_poi_coordinate(db, task.poi_id)
     distance_meters = _haversine_distance_meters(
@@ -480,13 +477,31 @@ async def submit_bounty_task(
             detail="GPS verification failed: too far from target POI",
         )
 
-    cleaned_photo = strip_exif_bytes(raw_photo, extension)
-    storage = get_storage_provider()
-    photo_storage_key, photo_url = storage.save_bytes(
-        content=cleaned_photo,
-        extension=extension,
-        content_type=content_type,
-    )
+    if photo is not None:
+        processed = await process_image_upload(photo)
+        exif_captured_at = processed.exif_captured_at
+        exif_longitude = processed.exif_longitude
+        exif_latitude = processed.exif_latitude
+        storage = get_storage_provider()
+        photo_storage_key, photo_url = await storage.save_content(
+            processed.content,
+            extension=processed.extension,
+            content_type=processed.content_type,
+        )
+        photo_thumbnail_storage_key, photo_thumbnail_url = await storage.save_content(
+            processed.thumbnail,
+            extension=processed.extension,
+            content_type=processed.content_type,
+        )
+    else:
+        # Already processed by the direct upload, which kept the EXIF readings for these checks.
+        upload = claim_direct_upload(db, current_user, photo_storage_key)
+        exif_captured_at = upload.exif_captured_at
+        exif_longitude = upload.exif_longitude
+        exif_latitude = upload.exif_latitude
+        photo_storage_key, photo_url = upload.storage_key, upload.url
+        photo_thumbnail_storage_key = upload.thumbnail_storage_key
+        photo_thumbnail_url = upload.thumbnail_url
 
     day_start = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
     today_submission_count = db.scalar(
@@ -513,6 +528,8 @@ async def submit_bounty_task(
         gps_verified=True,
         photo_url=photo_url,
         photo_storage_key=photo_storage_key,
+        photo_thumbnail_url=photo_thumbnail_url,
+        photo_thumbnail_storage_key=photo_thumbnail_storage_key,
         photo_exif_captured_at=exif_captured_at,
         photo_exif_longitude=exif_longitude,
         photo_exif_latitude=exif_latitude,
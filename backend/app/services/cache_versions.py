@@ -0,0 +1,26 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.cache_version import CacheVersion
+
+
+def get_cache_version(db: Session, name: str) -> int:
+    return int(db.scalar(select(CacheVersion.version).where(CacheVersion.name == name)) or 0)
+
+
+def bump_cache_version(db: Session, name: str) -> int:
+    """Invalidate every worker's cached copy of `name`; committed with the caller's transaction.
+
+    Returns the new version. The bumped row stays locked until the caller commits, which
+    serializes concurrent writers of the same name.
+    """
+    stmt = pg_insert(CacheVersion).values(name=name, version=1)
+    return int(
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[CacheVersion.name],
+                set_={"version": CacheVersion.version + 1, "updated_at": func.now()},
+            ).returning(CacheVersion.version)
+        ).scalar_one()
+    )
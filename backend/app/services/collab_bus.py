@@ -0,0 +1,97 @@
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+_ROOM_CHANNEL_PREFIX = "atlas:collab:room:"
+
+logger = logging.getLogger(__name__)
+
+
+def room_channel(itinerary_id: UUID) -> str:
+    return f"{_ROOM_CHANNEL_PREFIX}{itinerary_id}"
+
+
+class CollabRoomBus:
+    """Relays room messages between workers over one Redis pub/sub channel per itinerary.
+
+    A node only subscribes to rooms it has local connections in, and ignores its own
+    publications (every envelope carries the publishing node id).
+    """
+
+    def __init__(self, client: redis.Redis, node_id: str) -> None:
+        self._client = client
+        self._pubsub = client.pubsub()
+        self._node_id = node_id
+        self._rooms: set[UUID] = set()
+
+    @property
+    def rooms(self) -> set[UUID]:
+        return set(self._rooms)
+
+    async def subscribe(self, itinerary_id: UUID) -> None:
+        if itinerary_id in self._rooms:
+            return
+        self._rooms.add(itinerary_id)
+        try:
+            await self._pubsub.subscribe(room_channel(itinerary_id))
+        except RedisError as exc:
+            logger.warning("collab room bus subscribe failed for %s: %s", itinerary_id, exc)
+
+    async def unsubscribe(self, itinerary_id: UUID) -> None:
+        if itinerary_id not in self._rooms:
+            return
+        self._rooms.discard(itinerary_id)
+        with contextlib.suppress(RedisError):
+            await self._pubsub.unsubscribe(room_channel(itinerary_id))
+
+    async def publish(self, itinerary_id: UUID, kind: str, body: dict[str, Any]) -> None:
+        envelope = {"node": self._node_id, "kind": kind, **body}
+        try:
+            await self._client.publish(
+                room_channel(itinerary_id),
+                json.dumps(envelope, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+            )
+        except RedisError as exc:
+            logger.warning("collab room bus publish failed for %s: %s", itinerary_id, exc)
+
+    async def next_message(self, timeout: float) -> tuple[UUID, dict[str, Any]] | None:
+        if not self._pubsub.subscribed:
+            await asyncio.sleep(timeout)
+            return None
+        try:
+            raw = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        except RedisError as exc:
+            logger.warning("collab room bus receive failed: %s", exc)
+            await asyncio.sleep(timeout)
+            return None
+        if raw is None or raw.get("type") != "message":
+            return None
+        return decode_envelope(raw.get("channel"), raw.get("data"), self._node_id)
+
+    async def close(self) -> None:
+        self._rooms.clear()
+        with contextlib.suppress(Exception):
+            await self._pubsub.aclose()
+
+
+def decode_envelope(channel: Any, data: Any, node_id: str) -> tuple[UUID, dict[str, Any]] | None:
+    if isinstance(channel, bytes):
+        channel = channel.decode("utf-8", errors="replace")
+    if not isinstance(channel, str) or not channel.startswith(_ROOM_CHANNEL_PREFIX):
+        return None
+    try:
+        itinerary_id = UUID(channel[len(_ROOM_CHANNEL_PREFIX) :])
+        envelope = json.loads(data)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(envelope, dict) or envelope.get("node") == node_id:
+        return None
+    if not isinstance(envelope.get("node"), str) or not isinstance(envelope.get("kind"), str):
+        return None
+    return itinerary_id, envelope
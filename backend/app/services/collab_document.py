@@ -0,0 +1,64 @@
+import logging
+
+from pycrdt import Doc, get_state, get_update, merge_updates
+
+logger = logging.getLogger(__name__)
+
+
+def merge_document_updates(base_state: bytes | None, updates: list[bytes]) -> bytes | None:
+    parts = [part for part in ([base_state] if base_state else []) + updates if part]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return parts[0]
+    try:
+        return merge_updates(*parts)
+    except ValueError:
+        pass
+
+    # One undecodable update must not poison the whole batch; fold the rest one by one.
+    merged: bytes | None = None
+    for part in parts:
+        if merged is None:
+            if _is_valid_update(part):
+                merged = part
+            else:
+                logger.warning("dropping undecodable collab update (%d bytes)", len(part))
+            continue
+        try:
+            merged = merge_updates(merged, part)
+        except ValueError:
+            logger.warning("dropping undecodable collab update (%d bytes)", len(part))
+    return merged
+
+
+def compact_document_state(state: bytes) -> bytes:
+    """Re-encode the state as one snapshot, or return it unchanged if that would lose data.
+
+    Structs and deletions that arrived before what they depend on stay pending in the doc and
+    are missing from its snapshot; such a state is kept as merged until the gap is filled.
+    """
+    doc = Doc()
+    doc.apply_update(state)
+    integrated = doc.get_state()
+    compacted = doc.get_update()
+    if get_state(state) != integrated:
+        return state
+    # Whatever the doc could not integrate is still in the diff against its own state.
+    if get_update(state, integrated) != get_update(compacted, integrated):
+        return state
+    return compacted
+
+
+def should_compact(previous_count: int, current_count: int, every_updates: int) -> bool:
+    if every_updates <= 0:
+        return False
+    return previous_count // every_updates != current_count // every_updates
+
+
+def _is_valid_update(update: bytes) -> bool:
+    try:
+        Doc().apply_update(update)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,143 @@
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from fastapi import WebSocket
+
+# Close code for a client that cannot keep up; it reconnects and reloads the snapshot.
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+@dataclass
+class OutboundMessage:
+    text: str
+    enqueued_at: float
+    coalesce_key: str | None = None
+
+
+class ConnectionOutbox:
+    """Bounded send queue drained by a dedicated writer task per WebSocket.
+
+    Messages with a coalesce key (cursor/presence) replace any queued message with the
+    same key, or are folded into it by `merge`, and are dropped oldest-first when the
+    queue is full. Document updates are
+    never dropped: a connection that overflows on them is closed instead.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        max_size: int,
+        send_timeout_seconds: float,
+        counters: dict[str, int] | None = None,
+        on_sent: Callable[[float], None] | None = None,
+    ) -> None:
+        self._websocket = websocket
+        self._max_size = max(1, max_size)
+        self._send_timeout_seconds = send_timeout_seconds
+        self._counters = counters if counters is not None else {}
+        self._on_sent = on_sent
+        self._queue: deque[OutboundMessage] = deque()
+        self._keyed: dict[str, OutboundMessage] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._abort_task: asyncio.Task | None = None
+        self.closed = False
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="collab-outbox-writer")
+
+    async def stop(self) -> None:
+        self.closed = True
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def put(
+        self,
+        text: str,
+        *,
+        coalesce_key: str | None = None,
+        merge: Callable[[str, str], str] | None = None,
+    ) -> bool:
+        if self.closed:
+            return False
+        if coalesce_key is not None:
+            queued = self._keyed.get(coalesce_key)
+            if queued is not None:
+                # Keep the original enqueue time so latency reflects how long the slot waited.
+                queued.text = merge(queued.text, text) if merge is not None else text
+                self._bump("coalesced_messages")
+                return True
+        if len(self._queue) >= self._max_size and not self._drop_oldest_coalescible():
+            self._bump("slow_consumers_closed")
+            self.closed = True
+            # The writer may be stuck mid-send, so tear it down rather than waiting for it.
+            self._abort_task = asyncio.get_running_loop().create_task(self._abort())
+            return False
+        message = OutboundMessage(text=text, enqueued_at=time.perf_counter(), coalesce_key=coalesce_key)
+        self._queue.append(message)
+        if coalesce_key is not None:
+            self._keyed[coalesce_key] = message
+        self._wakeup.set()
+        return True
+
+    def _drop_oldest_coalescible(self) -> bool:
+        for index, queued in enumerate(self._queue):
+            if queued.coalesce_key is not None:
+                del self._queue[index]
+                self._keyed.pop(queued.coalesce_key, None)
+                self._bump("dropped_messages")
+                return True
+        return False
+
+    async def _abort(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self._close_slow_consumer()
+
+    async def _close_slow_consumer(self) -> None:
+        self._queue.clear()
+        self._keyed.clear()
+        with contextlib.suppress(Exception):
+            await self._websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+
+    def _bump(self, name: str) -> None:
+        self._counters[name] = self._counters.get(name, 0) + 1
+
+    async def _run(self) -> None:
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            message = self._queue.popleft()
+            if message.coalesce_key is not None and self._keyed.get(message.coalesce_key) is message:
+                del self._keyed[message.coalesce_key]
+            try:
+                await asyncio.wait_for(
+                    self._websocket.send_text(message.text), timeout=self._send_timeout_seconds
+                )
+            except TimeoutError:
+                self._bump("slow_consumers_closed")
+                self.closed = True
+                await self._close_slow_consumer()
+                return
+            except Exception:
+                # The socket is gone; the receive loop will unregister the connection.
+                self.closed = True
+                return
+            if self._on_sent is not None:
+                self._on_sent(time.perf_counter() - message.enqueued_at)
@@ -3,7 +3,9 @@ import base64
 import contextlib
 import json
 import logging
+import time
 import uuid
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
@@ -12,15 +14,73 @@ from uuid import UUID
 import redis.asyncio as redis
 from fastapi import WebSocket
 from redis.exceptions import RedisError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.db.session import SessionLocal
+from app.core.metrics import LatencyHistogram
+from app.db.async_session import AsyncSessionLocal
 from app.models.itinerary_collab import ItineraryCollabDocument, ItineraryCollabEventLog
 from app.schemas.itinerary_collab import ItineraryCollabParticipant
+from app.services.collab_bus import CollabRoomBus
+from app.services.collab_document import (
+    compact_document_state,
+    merge_document_updates,
+    should_compact,
+)
+from app.services.collab_outbox import ConnectionOutbox
 from app.services.collab_service import CollabIdentity
 
 _PENDING_ROOMS_KEY = "atlas:collab:pending:rooms"
 _PENDING_LIST_PREFIX = "atlas:collab:pending:"
+_PROCESSING_LIST_PREFIX = "atlas:collab:processing:"
+_FLUSH_LEASE_PREFIX = "atlas:collab:flusher:"
+_QUARANTINE_ROOMS_KEY = "atlas:collab:quarantine:rooms"
+_QUARANTINE_LIST_PREFIX = "atlas:collab:quarantine:"
+# Only the node holding a room's flush lease drains it, so a room's updates are never
+# merged into the document by two workers at once. The holder renews the lease on every
+# drain; another node takes the room over once the lease lapses.
+# Draining moves the pending list into the processing list and drops the room from the
+# pending set in one step, so updates pushed mid-drain land in a fresh pending list.
+# A processing list left behind by a failed flush is kept and the new items appended.
+_DRAIN_ROOM_SCRIPT = """
+local owner = redis.call('GET', KEYS[4])
+if owner and owner ~= ARGV[2] then
+  return false
+end
+redis.call('SET', KEYS[4], ARGV[2], 'PX', ARGV[3])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  if redis.call('EXISTS', KEYS[2]) == 0 then
+    redis.call('RENAME', KEYS[1], KEYS[2])
+  else
+    local items = redis.call('LRANGE', KEYS[1], 0, -1)
+    for i = 1, #items, 1000 do
+      redis.call('RPUSH', KEYS[2], unpack(items, i, math.min(i + 999, #items)))
+    end
+    redis.call('DEL', KEYS[1])
+  end
+end
+redis.call('SREM', KEYS[3], ARGV[1])
+return redis.call('LRANGE', KEYS[2], 0, -1)
+"""
+# A room that keeps failing to flush has its processing list appended to a quarantine list
+# (kept for inspection and replay) so it stops being retried and stops growing.
+_QUARANTINE_ROOM_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, -1)
+for i = 1, #items, 1000 do
+  redis.call('RPUSH', KEYS[2], unpack(items, i, math.min(i + 999, #items)))
+end
+redis.call('DEL', KEYS[1])
+redis.call('SADD', KEYS[3], ARGV[1])
+return #items
+"""
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,23 +93,67 @@ class RuntimeConnection:
     identity: CollabIdentity
     joined_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     cursor: dict | None = None
+    outbox: ConnectionOutbox | None = None
+    participant: dict[str, Any] | None = None
 
 
 class CollabRuntime:
     def __init__(self) -> None:
         self._redis: redis.Redis | None = None
+        self._node_id = uuid.uuid4().hex
         self._connections: dict[UUID, dict[str, RuntimeConnection]] = {}
+        # Rosters published by other workers: itinerary -> node id -> (received at, participants).
+        self._remote_participants: dict[UUID, dict[str, tuple[float, list[dict[str, Any]]]]] = {}
+        self._bus: CollabRoomBus | None = None
+        self._bus_task: asyncio.Task | None = None
+        self._flush_leases: set[UUID] = set()
+        self._flush_failures: dict[UUID, int] = {}
+        self._roster_cache: dict[UUID, list[dict[str, Any]]] = {}
+        self._dirty_presence: dict[UUID, set[str]] = {}
+        self._presence_task: asyncio.Task | None = None
+        self._room_latency: dict[UUID, LatencyHistogram] = {}
         self._lock = asyncio.Lock()
         self._flush_task: asyncio.Task | None = None
         self._running = False
+        self._drain_script = None
+        self._quarantine_script = None
+        self._release_lease_script = None
+        self._metrics: dict[str, int] = {
+            "flushed_rooms": 0,
+            "flushed_updates": 0,
+            "dropped_updates": 0,
+            "duplicate_updates": 0,
+            "flush_failures": 0,
+            "room_flush_failures": 0,
+            "quarantined_rooms": 0,
+            "coalesced_messages": 0,
+            "dropped_messages": 0,
+            "slow_consumers_closed": 0,
+            "bus_messages_received": 0,
+        }
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            **self._metrics,
+            "rooms": {
+                str(itinerary_id): histogram.snapshot()
+                for itinerary_id, histogram in list(self._room_latency.items())
+            },
+        }
 
     async def startup(self) -> None:
         if self._running:
             return
         settings = get_settings()
         self._redis = redis.from_url(settings.collab_redis_url, decode_responses=False)
+        self._drain_script = self._redis.register_script(_DRAIN_ROOM_SCRIPT)
+        self._quarantine_script = self._redis.register_script(_QUARANTINE_ROOM_SCRIPT)
+        self._release_lease_script = self._redis.register_script(_RELEASE_LEASE_SCRIPT)
+        self._bus = CollabRoomBus(self._redis, self._node_id)
         self._running = True
         self._flush_task = asyncio.create_task(self._flush_loop(), name="collab-flush-loop")
+        self._bus_task = asyncio.create_task(self._bus_loop(), name="collab-room-bus")
+        self._presence_task = asyncio.create_task(self._presence_loop(), name="collab-presence-ticker")
 
     async def shutdown(self) -> None:
         self._running = False
@@ -58,6 +162,17 @@ class CollabRuntime:
             with contextlib.suppress(asyncio.CancelledError):
                 await self._flush_task
             self._flush_task = None
+        for task in (self._bus_task, self._presence_task):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._bus_task = None
+        self._presence_task = None
+        await self._release_flush_leases()
+        if self._bus is not None:
+            await self._bus.close()
+            self._bus = None
         if self._redis is not None:
             await self._redis.close()
             self._redis = None
@@ -70,6 +185,7 @@ class CollabRuntime:
         identity: CollabIdentity,
         session_id: UUID,
     ) -> RuntimeConnection:
+        settings = get_settings()
         conn = RuntimeConnection(
             connection_id=uuid.uuid4().hex,
             session_id=session_id,
@@ -78,24 +194,54 @@ class CollabRuntime:
             identity=identity,
         )
         async with self._lock:
+            histogram = self._room_latency.setdefault(itinerary_id, LatencyHistogram())
+            conn.outbox = ConnectionOutbox(
+                websocket,
+                max_size=settings.collab_send_queue_size,
+                send_timeout_seconds=settings.collab_send_timeout_seconds,
+                counters=self._metrics,
+                on_sent=histogram.observe,
+            )
+            conn.outbox.start()
             room = self._connections.setdefault(itinerary_id, {})
             room[conn.connection_id] = conn
+            self._roster_cache.pop(itinerary_id, None)
+        if self._bus is not None:
+            await self._bus.subscribe(itinerary_id)
         await self._send_join_payload(conn)
         await self._broadcast_presence(itinerary_id)
         return conn
 
     async def unregister(self, conn: RuntimeConnection) -> None:
+        room_closed = False
         async with self._lock:
             room = self._connections.get(conn.itinerary_id)
             if room is not None:
                 room.pop(conn.connection_id, None)
+                self._roster_cache.pop(conn.itinerary_id, None)
                 if not room:
                     self._connections.pop(conn.itinerary_id, None)
+                    self._room_latency.pop(conn.itinerary_id, None)
+                    self._remote_participants.pop(conn.itinerary_id, None)
+                    self._dirty_presence.pop(conn.itinerary_id, None)
+                    room_closed = True
+        if conn.outbox is not None:
+            await conn.outbox.stop()
         await self._broadcast_presence(conn.itinerary_id)
+        if room_closed and self._bus is not None:
+            await self._bus.unsubscribe(conn.itinerary_id)
+
+    def send(self, conn: RuntimeConnection, message: dict[str, Any]) -> bool:
+        if conn.outbox is None:
+            return False
+        return conn.outbox.put(_encode_message(message))
 
     async def broadcast_cursor(self, conn: RuntimeConnection, cursor: dict[str, Any]) -> None:
+        # Cursor moves are batched and sent as diffs by the presence ticker.
         conn.cursor = cursor
-        await self._broadcast_presence(conn.itinerary_id)
+        conn.participant = {**self._participant_payload(conn), "cursor": cursor}
+        self._roster_cache.pop(conn.itinerary_id, None)
+        self._dirty_presence.setdefault(conn.itinerary_id, set()).add(conn.connection_id)
 
     async def broadcast_update(
         self, conn: RuntimeConnection, update_b64: str, event_meta: dict[str, Any]
@@ -106,11 +252,13 @@ class CollabRuntime:
             "update_b64": update_b64,
             "meta": event_meta,
         }
-        await self._broadcast(
+        text = await self._broadcast(
             conn.itinerary_id,
             message,
             exclude_connection_id=conn.connection_id,
         )
+        if self._bus is not None:
+            await self._bus.publish(conn.itinerary_id, "update", {"text": text})
         persisted = await self._persist_pending_update(conn, update_b64, event_meta)
         if not persisted:
             await self._persist_update_direct(conn, update_b64, event_meta)
@@ -118,7 +266,8 @@ class CollabRuntime:
     async def _send_join_payload(self, conn: RuntimeConnection) -> None:
         snapshot_b64, needs_seed = await self._load_document_snapshot(conn.itinerary_id)
         participants = self._participants(conn.itinerary_id)
-        await conn.websocket.send_json(
+        self.send(
+            conn,
             {
                 "type": "collab:joined",
                 "itinerary_id": str(conn.itinerary_id),
@@ -129,33 +278,130 @@ class CollabRuntime:
             }
         )
 
-    async def _broadcast_presence(self, itinerary_id: UUID) -> None:
+    async def _broadcast_presence(self, itinerary_id: UUID, *, publish: bool = True) -> None:
         await self._broadcast(
             itinerary_id,
             {
                 "type": "collab:presence",
                 "participants": self._participants(itinerary_id),
             },
+            coalesce_key="presence",
         )
+        if publish and self._bus is not None:
+            await self._bus.publish(
+                itinerary_id, "presence", {"participants": self._local_participants(itinerary_id)}
+            )
 
     async def _broadcast(
         self,
         itinerary_id: UUID,
         message: dict[str, Any],
         exclude_connection_id: str | None = None,
+        coalesce_key: str | None = None,
+        merge: Callable[[str, str], str] | None = None,
+    ) -> str:
+        text = _encode_message(message)
+        self._fan_out(itinerary_id, text, exclude_connection_id, coalesce_key, merge)
+        return text
+
+    def _fan_out(
+        self,
+        itinerary_id: UUID,
+        text: str,
+        exclude_connection_id: str | None = None,
+        coalesce_key: str | None = None,
+        merge: Callable[[str, str], str] | None = None,
     ) -> None:
-        room = list(self._connections.get(itinerary_id, {}).values())
-        if not room:
-            return
-        for conn in room:
+        for conn in list(self._connections.get(itinerary_id, {}).values()):
             if exclude_connection_id and conn.connection_id == exclude_connection_id:
                 continue
-            await conn.websocket.send_json(message)
+            if conn.outbox is not None:
+                conn.outbox.put(text, coalesce_key=coalesce_key, merge=merge)
+
+    async def _bus_loop(self) -> None:
+        settings = get_settings()
+        heartbeat = max(1.0, settings.collab_presence_heartbeat_seconds)
+        next_heartbeat = time.monotonic() + heartbeat
+        while self._running and self._bus is not None:
+            try:
+                received = await self._bus.next_message(timeout=1.0)
+                if received is not None:
+                    await self._handle_bus_message(*received)
+                if time.monotonic() >= next_heartbeat:
+                    next_heartbeat = time.monotonic() + heartbeat
+                    await self._bus_heartbeat(stale_after=heartbeat * 3)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("collab room bus failed")
+                await asyncio.sleep(1.0)
+
+    async def _handle_bus_message(self, itinerary_id: UUID, envelope: dict[str, Any]) -> None:
+        if itinerary_id not in self._connections:
+            return
+        self._metrics["bus_messages_received"] += 1
+        kind = envelope["kind"]
+        if kind == "update":
+            text = envelope.get("text")
+            if isinstance(text, str):
+                self._fan_out(itinerary_id, text)
+            return
+        participants = envelope.get("participants")
+        if kind not in {"presence", "presence_diff"} or not isinstance(participants, list):
+            return
+        node_id = envelope["node"]
+        rosters = self._remote_participants.setdefault(itinerary_id, {})
+        self._roster_cache.pop(itinerary_id, None)
+        if kind == "presence_diff":
+            if node_id not in rosters:
+                return
+            changed = {item.get("session_id"): item for item in participants if isinstance(item, dict)}
+            seen_at, items = rosters[node_id]
+            rosters[node_id] = (seen_at, [changed.get(item.get("session_id"), item) for item in items])
+            await self._broadcast_presence_diff(itinerary_id, participants)
+            return
+        is_new_node = node_id not in rosters
+        if participants:
+            rosters[node_id] = (time.monotonic(), participants)
+        else:
+            rosters.pop(node_id, None)
+        # A worker that just joined the room has not seen our roster yet.
+        await self._broadcast_presence(itinerary_id, publish=is_new_node and bool(participants))
+
+    async def _bus_heartbeat(self, *, stale_after: float) -> None:
+        now = time.monotonic()
+        for itinerary_id in list(self._connections):
+            rosters = self._remote_participants.get(itinerary_id, {})
+            stale = [node_id for node_id, (seen_at, _) in rosters.items() if now - seen_at > stale_after]
+            for node_id in stale:
+                rosters.pop(node_id, None)
+            if stale:
+                self._roster_cache.pop(itinerary_id, None)
+                await self._broadcast_presence(itinerary_id)
+            elif self._bus is not None:
+                await self._bus.publish(
+                    itinerary_id, "presence", {"participants": self._local_participants(itinerary_id)}
+                )
 
     def _participants(self, itinerary_id: UUID) -> list[dict[str, Any]]:
+        cached = self._roster_cache.get(itinerary_id)
+        if cached is not None:
+            return cached
+        items = self._local_participants(itinerary_id)
+        for _, remote_items in self._remote_participants.get(itinerary_id, {}).values():
+            items.extend(remote_items)
+        items.sort(key=lambda item: str(item.get("joined_at") or ""))
+        self._roster_cache[itinerary_id] = items
+        return items
+
+    def _local_participants(self, itinerary_id: UUID) -> list[dict[str, Any]]:
         room = self._connections.get(itinerary_id, {})
-        items = [
-            ItineraryCollabParticipant(
+        return [self._participant_payload(conn) for conn in room.values()]
+
+    @staticmethod
+    def _participant_payload(conn: RuntimeConnection) -> dict[str, Any]:
+        if conn.participant is None:
+            conn.participant = ItineraryCollabParticipant(
                 session_id=conn.connection_id,
                 participant_type=conn.identity.participant_type,
                 participant_user_id=conn.identity.actor_user_id,
@@ -164,10 +410,42 @@ class CollabRuntime:
                 joined_at=conn.joined_at,
                 cursor=conn.cursor,
             ).model_dump(mode="json")
-            for conn in room.values()
-        ]
-        items.sort(key=lambda item: item["joined_at"])
-        return items
+        return conn.participant
+
+    async def _presence_loop(self) -> None:
+        interval = 1.0 / max(1, get_settings().collab_presence_ticks_per_second)
+        while self._running:
+            try:
+                await self._flush_presence_diffs()
+            except Exception:
+                logger.exception("collab presence tick failed")
+            await asyncio.sleep(interval)
+
+    async def _flush_presence_diffs(self) -> None:
+        dirty, self._dirty_presence = self._dirty_presence, {}
+        for itinerary_id, connection_ids in dirty.items():
+            room = self._connections.get(itinerary_id, {})
+            changed = [
+                self._participant_payload(room[connection_id])
+                for connection_id in sorted(connection_ids)
+                if connection_id in room
+            ]
+            if not changed:
+                continue
+            await self._broadcast_presence_diff(itinerary_id, changed)
+            if self._bus is not None:
+                await self._bus.publish(itinerary_id, "presence_diff", {"participants": changed})
+
+    async def _broadcast_presence_diff(
+        self, itinerary_id: UUID, participants: list[dict[str, Any]]
+    ) -> None:
+        # Droppable like full rosters; a diff still queued for a slow client absorbs the next.
+        await self._broadcast(
+            itinerary_id,
+            {"type": "collab:presence_diff", "participants": participants},
+            coalesce_key="presence_diff",
+            merge=_merge_presence_diffs,
+        )
 
     async def _persist_pending_update(
         self, conn: RuntimeConnection, update_b64: str, event_meta: dict[str, Any]
@@ -187,8 +465,10 @@ class CollabRuntime:
         }
         key = f"{_PENDING_LIST_PREFIX}{conn.itinerary_id}"
         try:
-            await self._redis.sadd(_PENDING_ROOMS_KEY, str(conn.itinerary_id))
-            await self._redis.rpush(key, json.dumps(payload, ensure_ascii=True).encode("utf-8"))
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.rpush(key, json.dumps(payload, ensure_ascii=True).encode("utf-8"))
+                pipe.sadd(_PENDING_ROOMS_KEY, str(conn.itinerary_id))
+                await pipe.execute()
             return True
         except RedisError as exc:
             logger.warning(
@@ -204,6 +484,12 @@ class CollabRuntime:
         with contextlib.suppress(Exception):
             await self._redis.close()
         self._redis = None
+        self._drain_script = None
+        self._quarantine_script = None
+        self._release_lease_script = None
+        if self._bus is not None:
+            await self._bus.close()
+            self._bus = None
 
     @staticmethod
     def _resolve_origin(meta: dict[str, Any]) -> str:
@@ -233,56 +519,74 @@ class CollabRuntime:
         except ValueError:
             return
         origin = self._resolve_origin(event_meta)
-        with SessionLocal() as db:
-            doc_row = db.get(ItineraryCollabDocument, conn.itinerary_id)
-            if doc_row is None:
-                doc_row = ItineraryCollabDocument(
-                    itinerary_id=conn.itinerary_id, state_update=None, update_count=0
-                )
-                db.add(doc_row)
-                db.flush()
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(self._write_direct_update, conn, update_bytes, origin, event_meta)
+            await db.commit()
 
-            doc_row.state_update = update_bytes
-            doc_row.update_count = int(doc_row.update_count or 0) + 1
-            db.add(doc_row)
-
-            if origin not in {"bootstrap", "seed"}:
-                # Skip history logging for regular sync updates (tagged by frontend)
-                skip_history = False
-                if isinstance(event_meta, dict) and event_meta.get("skip_history"):
-                    skip_history = True
-                if not skip_history:
-                    actor_user_id = conn.identity.actor_user_id
-                    # Prefer custom description from frontend 10s diff timer
-                    custom_desc = event_meta.get("description") if isinstance(event_meta, dict) else None
-                    description = custom_desc if isinstance(custom_desc, str) and custom_desc.strip() else self._origin_description(origin)
-                    db.add(
-                        ItineraryCollabEventLog(
-                            itinerary_id=conn.itinerary_id,
-                            actor_type=conn.identity.participant_type,
-                            actor_user_id=actor_user_id,
-                            guest_name=conn.identity.guest_name,
-                            event_type="content_sync",
-                            target_type="document",
-                            target_id=str(conn.itinerary_id),
-                            payload={
-                                "bytes": len(update_bytes),
-                                "updates": 1,
-                                "origin_counts": {origin: 1},
-                                "origin": origin,
-                                "description": description,
-                                "session_ids": [conn.connection_id],
-                            },
-                        )
+    def _write_direct_update(
+        self,
+        db: Session,
+        conn: RuntimeConnection,
+        update_bytes: bytes,
+        origin: str,
+        event_meta: dict[str, Any],
+    ) -> None:
+        doc_row = _lock_document_row(db, conn.itinerary_id)
+
+        self._apply_updates_to_document(doc_row, [update_bytes])
+        db.add(doc_row)
+
+        if origin not in {"bootstrap", "seed"}:
+            # Skip history logging for regular sync updates (tagged by frontend)
+            skip_history = False
+            if isinstance(event_meta, dict) and event_meta.get("skip_history"):
+                skip_history = True
+            if not skip_history:
+                actor_user_id = conn.identity.actor_user_id
+                # Prefer custom description from frontend 10s diff timer
+                custom_desc = event_meta.get("description") if isinstance(event_meta, dict) else None
+                description = custom_desc if isinstance(custom_desc, str) and custom_desc.strip() else self._origin_description(origin)
+                db.add(
+                    ItineraryCollabEventLog(
+                        itinerary_id=conn.itinerary_id,
+                        actor_type=conn.identity.participant_type,
+                        actor_user_id=actor_user_id,
+                        guest_name=conn.identity.guest_name,
+                        event_type="content_sync",
+                        target_type="document",
+                        target_id=str(conn.itinerary_id),
+                        payload={
+                            "bytes": len(update_bytes),
+                            "updates": 1,
+                            "origin_counts": {origin: 1},
+                            "origin": origin,
+                            "description": description,
+                            "session_ids": [conn.connection_id],
+                        },
                     )
-            db.commit()
+                )
+
+    @staticmethod
+    def _apply_updates_to_document(doc_row: ItineraryCollabDocument, updates: list[bytes]) -> None:
+        previous_count = int(doc_row.update_count or 0)
+        current_count = previous_count + len(updates)
+        merged = merge_document_updates(doc_row.state_update, updates)
+        if merged is not None and should_compact(
+            previous_count, current_count, get_settings().collab_compact_every_updates
+        ):
+            try:
+                merged = compact_document_state(merged)
+            except ValueError:
+                logger.warning("collab document compaction failed for %s", doc_row.itinerary_id)
+        doc_row.state_update = merged
+        doc_row.update_count = current_count
 
     async def _load_document_snapshot(self, itinerary_id: UUID) -> tuple[str | None, bool]:
-        with SessionLocal() as db:
-            row = db.get(ItineraryCollabDocument, itinerary_id)
-            if row is None or not row.state_update:
-                return None, True
-            return base64.b64encode(row.state_update).decode("ascii"), False
+        async with AsyncSessionLocal() as db:
+            row = await db.get(ItineraryCollabDocument, itinerary_id)
+        if row is None or not row.state_update:
+            return None, True
+        return base64.b64encode(row.state_update).decode("ascii"), False
 
     async def _flush_loop(self) -> None:
         settings = get_settings()
@@ -291,7 +595,8 @@ class CollabRuntime:
             try:
                 await self._flush_once()
             except Exception:
-                pass
+                self._metrics["flush_failures"] += 1
+                logger.exception("collab flush failed")
             await asyncio.sleep(interval)
 
     async def _flush_once(self) -> None:
@@ -300,149 +605,285 @@ class CollabRuntime:
         room_ids = await self._redis.smembers(_PENDING_ROOMS_KEY)
         if not room_ids:
             return
+        itinerary_ids: list[UUID] = []
         for raw in room_ids:
             try:
-                itinerary_id = UUID(raw.decode("utf-8") if isinstance(raw, bytes) else str(raw))
+                itinerary_ids.append(UUID(raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)))
             except ValueError:
-                continue
-            await self._flush_room(itinerary_id)
+                await self._redis.srem(_PENDING_ROOMS_KEY, raw)
+        batch_size = max(1, get_settings().collab_flush_batch_rooms)
+        for start in range(0, len(itinerary_ids), batch_size):
+            await self._flush_rooms(itinerary_ids[start : start + batch_size])
 
     async def _flush_room(self, itinerary_id: UUID) -> None:
-        if self._redis is None:
+        await self._flush_rooms([itinerary_id])
+
+    async def _flush_rooms(self, itinerary_ids: list[UUID]) -> None:
+        if self._redis is None or self._drain_script is None or not itinerary_ids:
             return
-        key = f"{_PENDING_LIST_PREFIX}{itinerary_id}"
-        raw_items = await self._redis.lrange(key, 0, -1)
-        if not raw_items:
-            await self._redis.srem(_PENDING_ROOMS_KEY, str(itinerary_id))
+        lease_ms = int(max(get_settings().collab_flush_lease_seconds, 1) * 1000)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for itinerary_id in itinerary_ids:
+                await self._drain_script(
+                    keys=[
+                        f"{_PENDING_LIST_PREFIX}{itinerary_id}",
+                        f"{_PROCESSING_LIST_PREFIX}{itinerary_id}",
+                        _PENDING_ROOMS_KEY,
+                        f"{_FLUSH_LEASE_PREFIX}{itinerary_id}",
+                    ],
+                    args=[str(itinerary_id), self._node_id, lease_ms],
+                    client=pipe,
+                )
+            drained = await pipe.execute()
+
+        owned_ids: list[UUID] = []
+        drained_rooms: list[tuple[UUID, list[Any]]] = []
+        for itinerary_id, raw_items in zip(itinerary_ids, drained, strict=True):
+            if raw_items is None:
+                self._flush_leases.discard(itinerary_id)
+                continue
+            self._flush_leases.add(itinerary_id)
+            owned_ids.append(itinerary_id)
+            if raw_items:
+                drained_rooms.append((itinerary_id, raw_items))
+        failed_ids: set[UUID] = set()
+        try:
+            if drained_rooms:
+                async with AsyncSessionLocal() as db:
+                    for itinerary_id, raw_items in drained_rooms:
+                        # One savepoint per room: a room that cannot be written (e.g. its
+                        # itinerary was deleted) must not roll back the rest of the batch.
+                        try:
+                            async with db.begin_nested():
+                                await db.run_sync(self._apply_room_items, itinerary_id, raw_items)
+                        except Exception:
+                            failed_ids.add(itinerary_id)
+                            logger.exception("collab flush failed for room %s", itinerary_id)
+                    await db.commit()
+        except Exception:
+            # Processing lists are kept; re-flag the rooms so the next tick retries them.
+            await self._redis.sadd(_PENDING_ROOMS_KEY, *[str(itinerary_id) for itinerary_id, _ in drained_rooms])
+            raise
+
+        if failed_ids:
+            await self._handle_failed_rooms(failed_ids)
+        flushed_ids = [itinerary_id for itinerary_id in owned_ids if itinerary_id not in failed_ids]
+        for itinerary_id in flushed_ids:
+            self._flush_failures.pop(itinerary_id, None)
+        if not flushed_ids:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for itinerary_id in flushed_ids:
+                pipe.delete(f"{_PROCESSING_LIST_PREFIX}{itinerary_id}")
+            await pipe.execute()
+        self._metrics["flushed_rooms"] += len(drained_rooms) - len(failed_ids)
+
+    async def _handle_failed_rooms(self, itinerary_ids: set[UUID]) -> None:
+        max_failures = max(1, get_settings().collab_flush_max_failures)
+        retry: list[str] = []
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for itinerary_id in itinerary_ids:
+                self._metrics["room_flush_failures"] += 1
+                failures = self._flush_failures.get(itinerary_id, 0) + 1
+                if failures < max_failures:
+                    self._flush_failures[itinerary_id] = failures
+                    retry.append(str(itinerary_id))
+                    continue
+                self._flush_failures.pop(itinerary_id, None)
+                self._metrics["quarantined_rooms"] += 1
+                logger.error(
+                    "collab room %s failed to flush %d times; quarantining its updates",
+                    itinerary_id,
+                    failures,
+                )
+                await self._quarantine_script(
+                    keys=[
+                        f"{_PROCESSING_LIST_PREFIX}{itinerary_id}",
+                        f"{_QUARANTINE_LIST_PREFIX}{itinerary_id}",
+                        _QUARANTINE_ROOMS_KEY,
+                    ],
+                    args=[str(itinerary_id)],
+                    client=pipe,
+                )
+            if retry:
+                # Only the failing rooms are retried; their processing lists are kept.
+                pipe.sadd(_PENDING_ROOMS_KEY, *retry)
+            await pipe.execute()
+
+    async def _release_flush_leases(self) -> None:
+        if self._redis is None or self._release_lease_script is None or not self._flush_leases:
             return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for itinerary_id in self._flush_leases:
+                    await self._release_lease_script(
+                        keys=[f"{_FLUSH_LEASE_PREFIX}{itinerary_id}"], args=[self._node_id], client=pipe
+                    )
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("collab flush lease release failed: %s", exc)
+        self._flush_leases.clear()
 
+    def _apply_room_items(self, db: Session, itinerary_id: UUID, raw_items: list[Any]) -> None:
         parsed_items: list[dict[str, Any]] = []
+        seen_updates: set[str] = set()
         for raw in raw_items:
             try:
                 as_bytes = raw if isinstance(raw, bytes) else str(raw).encode("utf-8")
-                parsed_items.append(json.loads(as_bytes.decode("utf-8")))
-            except json.JSONDecodeError:
+                payload = json.loads(as_bytes.decode("utf-8"))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                self._metrics["dropped_updates"] += 1
                 continue
+            if not isinstance(payload, dict):
+                self._metrics["dropped_updates"] += 1
+                continue
+            update_b64 = payload.get("update_b64")
+            if isinstance(update_b64, str) and update_b64 in seen_updates:
+                # Yjs updates are idempotent; a byte-identical update adds nothing.
+                self._metrics["duplicate_updates"] += 1
+                continue
+            if isinstance(update_b64, str):
+                seen_updates.add(update_b64)
+            parsed_items.append(payload)
         if not parsed_items:
-            await self._redis.delete(key)
-            await self._redis.srem(_PENDING_ROOMS_KEY, str(itinerary_id))
             return
 
-        with SessionLocal() as db:
-            doc_row = db.get(ItineraryCollabDocument, itinerary_id)
-            if doc_row is None:
-                doc_row = ItineraryCollabDocument(
-                    itinerary_id=itinerary_id, state_update=None, update_count=0
-                )
-                db.add(doc_row)
-                db.flush()
-
-            applied = 0
-            last_update_bytes: bytes | None = None
-            grouped_events: dict[tuple[str, str | None, str | None], dict[str, Any]] = {}
-            for payload in parsed_items:
-                update_b64 = payload.get("update_b64")
-                if not isinstance(update_b64, str) or not update_b64.strip():
-                    continue
+        doc_row = _lock_document_row(db, itinerary_id)
+
+        applied = 0
+        update_chunks: list[bytes] = []
+        grouped_events: dict[tuple[str, str | None, str | None], dict[str, Any]] = {}
+        for payload in parsed_items:
+            update_b64 = payload.get("update_b64")
+            if not isinstance(update_b64, str) or not update_b64.strip():
+                self._metrics["dropped_updates"] += 1
+                continue
+            try:
+                update_bytes = base64.b64decode(update_b64, validate=True)
+            except ValueError:
+                self._metrics["dropped_updates"] += 1
+                continue
+            update_chunks.append(update_bytes)
+            actor_type = str(payload.get("participant_type") or "system")
+            actor_user_id_raw = payload.get("actor_user_id")
+            actor_user_id = None
+            if isinstance(actor_user_id_raw, str) and actor_user_id_raw:
                 try:
-                    update_bytes = base64.b64decode(update_b64)
+                    actor_user_id = str(UUID(actor_user_id_raw))
                 except ValueError:
-                    continue
-                last_update_bytes = update_bytes
-                actor_type = str(payload.get("participant_type") or "system")
-                actor_user_id_raw = payload.get("actor_user_id")
-                actor_user_id = None
-                if isinstance(actor_user_id_raw, str) and actor_user_id_raw:
-                    try:
-                        actor_user_id = str(UUID(actor_user_id_raw))
-                    except ValueError:
-                        actor_user_id = None
-                guest_name = payload.get("guest_name")
-                guest_value = guest_name if isinstance(guest_name, str) else None
-                meta = payload.get("meta")
-                origin = ""
-                if isinstance(meta, dict):
-                    maybe_origin = meta.get("origin")
-                    if isinstance(maybe_origin, str):
-                        origin = maybe_origin.strip()
-                if not origin:
-                    origin = "local"
-                if origin in {"bootstrap", "seed"}:
-                    applied += 1
-                    continue
-                group_key = (actor_type, actor_user_id, guest_value)
-                group = grouped_events.setdefault(
-                    group_key,
-                    {"bytes": 0, "updates": 0, "origin_counts": {}, "session_ids": set(), "descriptions": [], "all_skip_history": True},
-                )
-                group["bytes"] += len(update_bytes)
-                group["updates"] += 1
-                origin_counts = group["origin_counts"]
-                origin_counts[origin] = int(origin_counts.get(origin, 0)) + 1
-                session_id = payload.get("session_id")
-                if isinstance(session_id, str) and session_id:
-                    group["session_ids"].add(session_id)
-                # Keep track of custom frontend diff descriptions
-                if isinstance(meta, dict):
-                    custom_desc = meta.get("description")
-                    if isinstance(custom_desc, str) and custom_desc.strip():
-                        group["descriptions"].append(custom_desc.strip())
-                    if not meta.get("skip_history"):
-                        group["all_skip_history"] = False
-                else:
-                    group["all_skip_history"] = False
+                    actor_user_id = None
+            guest_name = payload.get("guest_name")
+            guest_value = guest_name if isinstance(guest_name, str) else None
+            meta = payload.get("meta")
+            origin = ""
+            if isinstance(meta, dict):
+                maybe_origin = meta.get("origin")
+                if isinstance(maybe_origin, str):
+                    origin = maybe_origin.strip()
+            if not origin:
+                origin = "local"
+            if origin in {"bootstrap", "seed"}:
                 applied += 1
+                continue
+            group_key = (actor_type, actor_user_id, guest_value)
+            group = grouped_events.setdefault(
+                group_key,
+                {"bytes": 0, "updates": 0, "origin_counts": {}, "session_ids": set(), "descriptions": [], "all_skip_history": True},
+            )
+            group["bytes"] += len(update_bytes)
+            group["updates"] += 1
+            origin_counts = group["origin_counts"]
+            origin_counts[origin] = int(origin_counts.get(origin, 0)) + 1
+            session_id = payload.get("session_id")
+            if isinstance(session_id, str) and session_id:
+                group["session_ids"].add(session_id)
+            # Keep track of custom frontend diff descriptions
+            if isinstance(meta, dict):
+                custom_desc = meta.get("description")
+                if isinstance(custom_desc, str) and custom_desc.strip():
+                    group["descriptions"].append(custom_desc.strip())
+                if not meta.get("skip_history"):
+                    group["all_skip_history"] = False
+            else:
+                group["all_skip_history"] = False
+            applied += 1
+
+        for (actor_type, actor_user_id_raw, guest_name), aggregate in grouped_events.items():
+            actor_user_id = UUID(actor_user_id_raw) if actor_user_id_raw else None
+            session_ids = sorted(list(aggregate["session_ids"]))
+            dominant_origin = max(
+                aggregate["origin_counts"].items(),
+                key=lambda item: item[1],
+            )[0] if aggregate["origin_counts"] else "local"
+
+            # Use aggregated custom descriptions if available, else fallback
+            # If ALL updates in the group were skip_history and no descriptions, skip logging entirely
+            if aggregate.get("all_skip_history", False) and not aggregate["descriptions"]:
+                continue
 
-            for (actor_type, actor_user_id_raw, guest_name), aggregate in grouped_events.items():
-                actor_user_id = UUID(actor_user_id_raw) if actor_user_id_raw else None
-                session_ids = sorted(list(aggregate["session_ids"]))
-                dominant_origin = max(
-                    aggregate["origin_counts"].items(),
-                    key=lambda item: item[1],
-                )[0] if aggregate["origin_counts"] else "local"
-
-                # Use aggregated custom descriptions if available, else fallback
-                # If ALL updates in the group were skip_history and no descriptions, skip logging entirely
-                if aggregate.get("all_skip_history", False) and not aggregate["descriptions"]:
-                    continue
+            if aggregate["descriptions"]:
+                description = "；".join(aggregate["descriptions"][:3]) # Limit to 3 changes to avoid bloat
+                if len(aggregate["descriptions"]) > 3:
+                    description += " 等"
+            else:
+                description = self._origin_description(dominant_origin)
+
+            db.add(
+                ItineraryCollabEventLog(
+                    itinerary_id=itinerary_id,
+                    actor_type=actor_type,
+                    actor_user_id=actor_user_id,
+                    guest_name=guest_name,
+                    event_type="content_sync",
+                    target_type="document",
+                    target_id=str(itinerary_id),
+                    payload={
+                        "bytes": int(aggregate["bytes"]),
+                        "updates": int(aggregate["updates"]),
+                        "origin_counts": aggregate["origin_counts"],
+                        "origin": dominant_origin,
+                        "description": description,
+                        "session_ids": session_ids,
+                    },
+                )
+            )
 
-                if aggregate["descriptions"]:
-                    description = "；".join(aggregate["descriptions"][:3]) # Limit to 3 changes to avoid bloat
-                    if len(aggregate["descriptions"]) > 3:
-                        description += " 等"
-                else:
-                    description = self._origin_description(dominant_origin)
+        if applied > 0:
+            self._apply_updates_to_document(doc_row, update_chunks)
+            db.add(doc_row)
+            self._metrics["flushed_updates"] += applied
 
-                db.add(
-                    ItineraryCollabEventLog(
-                        itinerary_id=itinerary_id,
-                        actor_type=actor_type,
-                        actor_user_id=actor_user_id,
-                        guest_name=guest_name,
-                        event_type="content_sync",
-                        target_type="document",
-                        target_id=str(itinerary_id),
-                        payload={
-                            "bytes": int(aggregate["bytes"]),
-                            "updates": int(aggregate["updates"]),
-                            "origin_counts": aggregate["origin_counts"],
-                            "origin": dominant_origin,
-                            "description": description,
-                            "session_ids": session_ids,
-                        },
-                    )
-                )
 
-            if applied > 0:
-                doc_row.state_update = last_update_bytes
-                doc_row.update_count = int(doc_row.update_count or 0) + applied
-                db.add(doc_row)
-                db.commit()
-            else:
-                db.rollback()
 
-        await self._redis.delete(key)
-        await self._redis.srem(_PENDING_ROOMS_KEY, str(itinerary_id))
+def _lock_document_row(db: Session, itinerary_id: UUID) -> ItineraryCollabDocument:
+    """Load the room's document row FOR UPDATE, creating it first if it does not exist yet.
+
+    The stored state is the merge of every update, so writers on different workers must
+    not read-modify-write it concurrently. ON CONFLICT lets two first writers race on the
+    insert without a primary key violation; both then queue on the row lock.
+    """
+    doc_row = db.get(ItineraryCollabDocument, itinerary_id, with_for_update=True)
+    if doc_row is None:
+        db.execute(
+            pg_insert(ItineraryCollabDocument)
+            .values(itinerary_id=itinerary_id, update_count=0)
+            .on_conflict_do_nothing(index_elements=[ItineraryCollabDocument.itinerary_id])
+        )
+        doc_row = db.get(ItineraryCollabDocument, itinerary_id, with_for_update=True)
+    return doc_row
+
+
+def _merge_presence_diffs(queued: str, latest: str) -> str:
+    merged: dict[Any, dict[str, Any]] = {}
+    for text in (queued, latest):
+        for item in json.loads(text)["participants"]:
+            merged[item.get("session_id")] = item
+    return _encode_message({"type": "collab:presence_diff", "participants": list(merged.values())})
+
+
+def _encode_message(message: dict[str, Any]) -> str:
+    # Same encoding as WebSocket.send_json, done once per broadcast instead of per recipient.
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
 
 
 _runtime: CollabRuntime | None = None
@@ -0,0 +1,172 @@
+import heapq
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(slots=True)
+class GraphNode:
+    # Earliest the block may start, in minutes from 00:00 on day 1.
+    release_minute: int
+    duration_minutes: int
+
+
+@dataclass
+class DependencySchedule:
+    order: list[uuid.UUID]
+    earliest_start: dict[uuid.UUID, int]
+    earliest_finish: dict[uuid.UUID, int]
+    critical_path: list[uuid.UUID]
+    finish_minute: int
+
+
+class DependencyGraph:
+    """Block dependency DAG that keeps a topological order up to date as edges are added.
+
+    Inserting an edge that already points forward in the order costs nothing. Otherwise only
+    blocks ranked between its two ends are searched and re-ranked (Pearce-Kelly), which is also
+    where a cycle would have to be.
+    """
+
+    def __init__(
+        self,
+        nodes: dict[uuid.UUID, GraphNode],
+        edges: Iterable[tuple[uuid.UUID, uuid.UUID]],
+    ) -> None:
+        self.nodes = nodes
+        self.successors: dict[uuid.UUID, set[uuid.UUID]] = {node_id: set() for node_id in nodes}
+        self.predecessors: dict[uuid.UUID, set[uuid.UUID]] = {node_id: set() for node_id in nodes}
+        for from_id, to_id in edges:
+            if from_id in nodes and to_id in nodes:
+                self.successors[from_id].add(to_id)
+                self.predecessors[to_id].add(from_id)
+        self._order = self._initial_order()
+        self._rank = {node_id: rank for rank, node_id in enumerate(self._order)}
+
+    @property
+    def order(self) -> list[uuid.UUID]:
+        return list(self._order)
+
+    def copy(self) -> "DependencyGraph":
+        clone = DependencyGraph.__new__(DependencyGraph)
+        clone.nodes = self.nodes
+        clone.successors = {node_id: set(ids) for node_id, ids in self.successors.items()}
+        clone.predecessors = {node_id: set(ids) for node_id, ids in self.predecessors.items()}
+        clone._order = list(self._order)
+        clone._rank = dict(self._rank)
+        return clone
+
+    def has_edge(self, from_id: uuid.UUID, to_id: uuid.UUID) -> bool:
+        return to_id in self.successors.get(from_id, ())
+
+    def add_edge(self, from_id: uuid.UUID, to_id: uuid.UUID) -> None:
+        if from_id not in self.nodes or to_id not in self.nodes:
+            raise ValueError("Block not found")
+        if from_id == to_id:
+            raise ValueError("Dependency cycle detected")
+        lower, upper = self._rank[to_id], self._rank[from_id]
+        if lower < upper:
+            forward = self._reach(to_id, self.successors, lower, upper)
+            if from_id in forward:
+                raise ValueError("Dependency cycle detected")
+            backward = self._reach(from_id, self.predecessors, lower, upper)
+            self._rerank(backward, forward)
+        self.successors[from_id].add(to_id)
+        self.predecessors[to_id].add(from_id)
+
+    def remove_edge(self, from_id: uuid.UUID, to_id: uuid.UUID) -> None:
+        # Dropping an edge never invalidates the order.
+        self.successors.get(from_id, set()).discard(to_id)
+        self.predecessors.get(to_id, set()).discard(from_id)
+
+    def schedule(self) -> DependencySchedule:
+        """Earliest start/finish per block and the chain of dependencies that sets the end."""
+        earliest_start: dict[uuid.UUID, int] = {}
+        earliest_finish: dict[uuid.UUID, int] = {}
+        # The predecessor whose finish pushed each block's start past its own release time.
+        binding: dict[uuid.UUID, uuid.UUID | None] = {}
+        for node_id in self._order:
+            start, via = self.nodes[node_id].release_minute, None
+            for pred in self.predecessors[node_id]:
+                if earliest_finish[pred] > start:
+                    start, via = earliest_finish[pred], pred
+            earliest_start[node_id] = start
+            earliest_finish[node_id] = start + self.nodes[node_id].duration_minutes
+            binding[node_id] = via
+
+        critical_path: list[uuid.UUID] = []
+        last = max(self._order, key=earliest_finish.__getitem__, default=None)
+        node = last
+        while node is not None:
+            critical_path.append(node)
+            node = binding[node]
+        critical_path.reverse()
+        return DependencySchedule(
+            order=list(self._order),
+            earliest_start=earliest_start,
+            earliest_finish=earliest_finish,
+            critical_path=critical_path,
+            finish_minute=earliest_finish[last] if last is not None else 0,
+        )
+
+    def _initial_order(self) -> list[uuid.UUID]:
+        # Kahn's algorithm; ties go to the block that comes first in `nodes`.
+        position = {node_id: index for index, node_id in enumerate(self.nodes)}
+        indegree = {node_id: len(preds) for node_id, preds in self.predecessors.items()}
+        ready = [(position[node_id], node_id) for node_id, count in indegree.items() if count == 0]
+        heapq.heapify(ready)
+        order: list[uuid.UUID] = []
+        while ready:
+            _, node_id = heapq.heappop(ready)
+            order.append(node_id)
+            for succ in self.successors[node_id]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    heapq.heappush(ready, (position[succ], succ))
+        if len(order) != len(self.nodes):
+            raise ValueError("Dependency cycle detected")
+        return order
+
+    def _reach(
+        self,
+        start: uuid.UUID,
+        adjacency: dict[uuid.UUID, set[uuid.UUID]],
+        lower: int,
+        upper: int,
+    ) -> set[uuid.UUID]:
+        seen = {start}
+        stack = [start]
+        while stack:
+            for nxt in adjacency[stack.pop()]:
+                if nxt not in seen and lower <= self._rank[nxt] <= upper:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    def _rerank(self, backward: set[uuid.UUID], forward: set[uuid.UUID]) -> None:
+        # Blocks that reach the new edge's source move ahead of those reachable from its
+        # target, reusing the ranks the two groups already held.
+        moved = sorted(backward, key=self._rank.__getitem__)
+        moved += sorted(forward, key=self._rank.__getitem__)
+        ranks = sorted(self._rank[node_id] for node_id in moved)
+        for node_id, rank in zip(moved, ranks, strict=True):
+            self._rank[node_id] = rank
+            self._order[rank] = node_id
+
+
+def block_node(
+    day_index: int,
+    start_minute: int | None,
+    end_minute: int | None,
+    duration_minutes: int | None,
+) -> GraphNode:
+    if duration_minutes is None:
+        duration_minutes = (
+            end_minute - start_minute if start_minute is not None and end_minute is not None else 0
+        )
+    return GraphNode(
+        release_minute=(day_index - 1) * MINUTES_PER_DAY + (start_minute or 0),
+        duration_minutes=max(duration_minutes, 0),
+    )
@@ -0,0 +1,182 @@
+import asyncio
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.direct_upload import DirectUpload
+from app.models.user import User
+from app.schemas.upload import DirectUploadResponse
+from app.services.image_pipeline import ALLOWED_IMAGE_TYPES, ProcessedImage, process_image_stream
+from app.services.storage import get_storage_provider
+
+DIRECT_UPLOAD_SCOPE = "storage-upload"
+
+
+@dataclass
+class DirectUploadClaims:
+    jti: str
+    user_id: UUID
+    content_type: str
+    max_bytes: int
+
+
+def _upload_signing_secret() -> str:
+    settings = get_settings()
+    if settings.storage_upload_token_secret.strip():
+        return settings.storage_upload_token_secret
+    return settings.jwt_secret
+
+
+def create_upload_token(current_user: User, content_type: str) -> tuple[str, datetime, int]:
+    """Sign a short-lived grant for one PUT of ``content_type`` bytes; returns (token, expires_at, max_bytes)."""
+    settings = get_settings()
+    normalized = content_type.strip().lower()
+    if normalized not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only JPEG/PNG/WEBP images are supported",
+        )
+    now = datetime.now(UTC)
+    expires_at = now + timedelta(seconds=max(60, settings.storage_upload_token_seconds))
+    max_bytes = settings.upload_max_photo_bytes
+    # No "sub" claim, so the token can never be mistaken for an access token.
+    payload = {
+        "scope": DIRECT_UPLOAD_SCOPE,
+        "uid": str(current_user.id),
+        "content_type": normalized,
+        "max_bytes": max_bytes,
+        "jti": uuid4().hex,
+        "iat": int(now.timestamp()),
+        "exp": int(expires_at.timestamp()),
+    }
+    token = jwt.encode(payload, _upload_signing_secret(), algorithm=settings.jwt_algorithm)
+    return token, expires_at, max_bytes
+
+
+def decode_upload_token(token: str) -> DirectUploadClaims:
+    settings = get_settings()
+    try:
+        payload = jwt.decode(token, _upload_signing_secret(), algorithms=[settings.jwt_algorithm])
+    except JWTError as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid upload token") from exc
+    if payload.get("scope") != DIRECT_UPLOAD_SCOPE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid upload token scope")
+    try:
+        user_id = UUID(str(payload.get("uid")))
+        max_bytes = int(payload["max_bytes"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid upload token payload") from exc
+    content_type = str(payload.get("content_type") or "")
+    jti = str(payload.get("jti") or "")
+    if content_type not in ALLOWED_IMAGE_TYPES or not jti:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid upload token payload")
+    return DirectUploadClaims(jti=jti, user_id=user_id, content_type=content_type, max_bytes=max_bytes)
+
+
+def _reserve_upload_token(db: Session, claims: DirectUploadClaims) -> None:
+    db.add(DirectUpload(jti=claims.jti, user_id=claims.user_id, content_type=claims.content_type))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Upload token has already been used"
+        ) from None
+
+
+def _record_upload(
+    db: Session,
+    jti: str,
+    processed: ProcessedImage,
+    stored: tuple[str, str],
+    thumbnail: tuple[str, str],
+) -> None:
+    upload = db.get(DirectUpload, jti)
+    upload.storage_key, upload.url = stored
+    upload.thumbnail_storage_key, upload.thumbnail_url = thumbnail
+    upload.size = len(processed.content)
+    upload.exif_captured_at = processed.exif_captured_at
+    upload.exif_longitude = processed.exif_longitude
+    upload.exif_latitude = processed.exif_latitude
+    db.add(upload)
+    db.commit()
+
+
+async def receive_direct_upload(
+    db: Session,
+    token: str,
+    *,
+    content_type: str | None,
+    chunks: AsyncIterable[bytes],
+) -> DirectUploadResponse:
+    """Store the body of a PUT to a signed upload URL the way a multipart photo would be stored.
+
+    The token's jti is recorded before the body is read, so each token can be used once. The
+    body goes through the image pipeline, so nothing reaches storage unless it is a valid,
+    non-empty image, and what is stored has its metadata stripped. The result is only
+    referenced once a submission claims it through `claim_direct_upload`.
+    """
+    claims = decode_upload_token(token)
+    if (content_type or "").split(";", 1)[0].strip().lower() != claims.content_type:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type does not match the upload token",
+        )
+    # The session is synchronous, so its work runs off the event loop.
+    await asyncio.to_thread(_reserve_upload_token, db, claims)
+    processed = await process_image_stream(
+        chunks, content_type=claims.content_type, max_bytes=claims.max_bytes
+    )
+    storage = get_storage_provider()
+    stored = await storage.save_content(
+        processed.content, extension=processed.extension, content_type=processed.content_type
+    )
+    thumbnail = await storage.save_content(
+        processed.thumbnail, extension=processed.extension, content_type=processed.content_type
+    )
+    await asyncio.to_thread(_record_upload, db, claims.jti, processed, stored, thumbnail)
+    return DirectUploadResponse(
+        storage_key=stored[0],
+        url=stored[1],
+        thumbnail_url=thumbnail[1],
+        size=len(processed.content),
+        content_type=processed.content_type,
+    )
+
+
+def claim_direct_upload(db: Session, current_user: User, storage_key: str) -> DirectUpload:
+    """Mark an unclaimed direct upload of ``current_user`` as used by the submission being built.
+
+    The caller owns the commit. Old uploads are refused because storage GC may already
+    have removed their blobs.
+    """
+    settings = get_settings()
+    now = datetime.now(UTC)
+    oldest = now - timedelta(seconds=settings.storage_direct_upload_claim_seconds)
+    upload = db.scalars(
+        select(DirectUpload)
+        .where(
+            DirectUpload.user_id == current_user.id,
+            DirectUpload.storage_key == storage_key,
+            DirectUpload.claimed_at.is_(None),
+            DirectUpload.created_at >= oldest,
+        )
+        .order_by(DirectUpload.created_at.desc())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if upload is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Photo upload not found or already used"
+        )
+    upload.claimed_at = now
+    db.add(upload)
+    return upload
@@ -0,0 +1,56 @@
+from collections.abc import Hashable
+from math import asin, cos, floor, radians, sin, sqrt
+
+EARTH_RADIUS_METERS = 6371000.0
+METERS_PER_DEGREE = 111_320.0
+
+
+def haversine_distance_meters(
+    longitude_a: float, latitude_a: float, longitude_b: float, latitude_b: float
+) -> float:
+    dlon = radians(longitude_b - longitude_a)
+    dlat = radians(latitude_b - latitude_a)
+    lat1 = radians(latitude_a)
+    lat2 = radians(latitude_b)
+    value = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return EARTH_RADIUS_METERS * 2 * asin(sqrt(value))
+
+
+class GridIndex:
+    """In-memory point index bucketed into fixed-size degree cells.
+
+    Used where PostGIS is unavailable; radius queries only visit the cells overlapping
+    the search box. Does not wrap across the antimeridian.
+    """
+
+    def __init__(self, cell_size_deg: float) -> None:
+        if cell_size_deg <= 0:
+            raise ValueError("cell_size_deg must be positive")
+        self._cell_size = cell_size_deg
+        self._cells: dict[tuple[int, int], list[tuple[Hashable, float, float]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(points) for points in self._cells.values())
+
+    def _cell(self, longitude: float, latitude: float) -> tuple[int, int]:
+        return floor(longitude / self._cell_size), floor(latitude / self._cell_size)
+
+    def insert(self, key: Hashable, longitude: float, latitude: float) -> None:
+        self._cells.setdefault(self._cell(longitude, latitude), []).append((key, longitude, latitude))
+
+    def within(self, longitude: float, latitude: float, radius_meters: float) -> list[tuple[Hashable, float]]:
+        """Return ``(key, distance_meters)`` pairs inside the radius, nearest first."""
+        lat_span = radius_meters / METERS_PER_DEGREE
+        lon_span = min(radius_meters / (METERS_PER_DEGREE * max(cos(radians(latitude)), 1e-6)), 180.0)
+        min_x, min_y = self._cell(longitude - lon_span, latitude - lat_span)
+        max_x, max_y = self._cell(longitude + lon_span, latitude + lat_span)
+
+        matches: list[tuple[Hashable, float]] = []
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                for key, point_lon, point_lat in self._cells.get((cell_x, cell_y), ()):
+                    distance = haversine_distance_meters(longitude, latitude, point_lon, point_lat)
+                    if distance <= radius_meters:
+                        matches.append((key, distance))
+        matches.sort(key=lambda item: item[1])
+        return matches
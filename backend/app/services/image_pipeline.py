@@ -0,0 +1,209 @@
+import asyncio
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from io import BytesIO
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile, status
+from PIL import ExifTags, Image, UnidentifiedImageError
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+ALLOWED_IMAGE_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+_CHUNK_SIZE = 64 * 1024
+_SPOOL_MEMORY_BYTES = 1024 * 1024
+_EXIF_TIME_TAGS = (36867, 36868, 306)
+
+_executor: ThreadPoolExecutor | None = None
+
+
+@dataclass
+class ProcessedImage:
+    content: bytes
+    thumbnail: bytes
+    extension: str
+    content_type: str
+    exif_captured_at: datetime | None = None
+    exif_longitude: float | None = None
+    exif_latitude: float | None = None
+
+
+def validate_image_upload(photo: UploadFile) -> tuple[str, str]:
+    content_type = (photo.content_type or "").strip().lower()
+    extension = ALLOWED_IMAGE_TYPES.get(content_type)
+    if extension is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only JPEG/PNG/WEBP images are supported",
+        )
+    return content_type, extension
+
+
+async def spool_upload(photo: UploadFile, *, max_bytes: int) -> BinaryIO:
+    """Copy the upload into a temp file chunk by chunk, rejecting it as soon as it is too large."""
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        while chunk := await photo.read(_CHUNK_SIZE):
+            yield chunk
+
+    return await spool_stream(_chunks(), max_bytes=max_bytes)
+
+
+async def spool_stream(chunks: AsyncIterable[bytes], *, max_bytes: int) -> BinaryIO:
+    """Copy a body into a temp file, rejecting it as soon as it is too large or if it is empty."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MEMORY_BYTES)
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                    detail="Photo file is too large",
+                )
+            spooled.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Photo file is empty")
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+
+async def process_image_upload(photo: UploadFile) -> ProcessedImage:
+    """Validate, spool and re-encode an uploaded photo without blocking the event loop.
+
+    The stored copy has all metadata stripped; EXIF capture time and GPS are returned
+    separately so callers can run their own checks.
+    """
+    content_type, extension = validate_image_upload(photo)
+    spooled = await spool_upload(photo, max_bytes=settings.upload_max_photo_bytes)
+    return await _process_spooled(spooled, extension, content_type)
+
+
+async def process_image_stream(
+    chunks: AsyncIterable[bytes], *, content_type: str, max_bytes: int
+) -> ProcessedImage:
+    """`process_image_upload` for a raw request body whose content type was already checked."""
+    spooled = await spool_stream(chunks, max_bytes=max_bytes)
+    return await _process_spooled(spooled, ALLOWED_IMAGE_TYPES[content_type], content_type)
+
+
+async def _process_spooled(spooled: BinaryIO, extension: str, content_type: str) -> ProcessedImage:
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_executor(), _process_image_file, spooled, extension, content_type
+        )
+    finally:
+        spooled.close()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.image_pipeline_workers),
+            thread_name_prefix="image-pipeline",
+        )
+    return _executor
+
+
+def _process_image_file(file: BinaryIO, extension: str, content_type: str) -> ProcessedImage:
+    try:
+        with Image.open(file) as image:
+            image.load()
+            captured_at, longitude, latitude = _read_exif_metadata(image.getexif())
+            content = _encode_without_metadata(image, extension)
+            thumbnail = image.copy()
+            thumbnail.thumbnail((settings.image_thumbnail_max_px, settings.image_thumbnail_max_px))
+            thumbnail_content = _encode_without_metadata(thumbnail, extension)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image file") from None
+    return ProcessedImage(
+        content=content,
+        thumbnail=thumbnail_content,
+        extension=extension,
+        content_type=content_type,
+        exif_captured_at=captured_at,
+        exif_longitude=longitude,
+        exif_latitude=latitude,
+    )
+
+
+def _encode_without_metadata(image: Image.Image, image_format: str) -> bytes:
+    output = BytesIO()
+    format_name = "JPEG" if image_format.lower() in {"jpg", "jpeg"} else image_format.upper()
+    save_kwargs = {"format": format_name}
+    if format_name == "JPEG":
+        save_kwargs["quality"] = 88
+        save_kwargs["optimize"] = True
+    # A copy carries pixels only, so EXIF/XMP from the source is not written back.
+    image.copy().save(output, **save_kwargs)
+    return output.getvalue()
+
+
+def strip_exif_bytes(raw_bytes: bytes, image_format: str) -> bytes:
+    with Image.open(BytesIO(raw_bytes)) as image:
+        return _encode_without_metadata(image, image_format)
+
+
+def _gps_part_to_float(value: object) -> float | None:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if hasattr(value, "numerator") and hasattr(value, "denominator"):
+        denominator = getattr(value, "denominator", 0) or 0
+        if denominator == 0:
+            return None
+        return float(getattr(value, "numerator", 0) / denominator)
+    return None
+
+
+def _gps_coord_to_decimal(ref: object, values: object) -> float | None:
+    if not isinstance(values, (tuple, list)) or len(values) != 3:
+        return None
+    degrees = _gps_part_to_float(values[0])
+    minutes = _gps_part_to_float(values[1])
+    seconds = _gps_part_to_float(values[2])
+    if degrees is None or minutes is None or seconds is None:
+        return None
+    decimal = degrees + minutes / 60 + seconds / 3600
+    ref_text = str(ref or "").upper()
+    if ref_text in {"S", "W"}:
+        decimal *= -1
+    return decimal
+
+
+def _read_exif_metadata(exif: Image.Exif) -> tuple[datetime | None, float | None, float | None]:
+    if not exif:
+        return None, None, None
+
+    # DateTimeOriginal/Digitized live in the Exif sub-IFD; DateTime sits in IFD0.
+    exif_ifd = exif.get_ifd(ExifTags.IFD.Exif)
+    captured_at: datetime | None = None
+    for key in _EXIF_TIME_TAGS:
+        value = exif_ifd.get(key, exif.get(key))
+        if isinstance(value, str):
+            try:
+                parsed = datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
+            except ValueError:
+                continue
+            captured_at = parsed.replace(tzinfo=UTC)
+            break
+
+    gps_info = exif.get_ifd(ExifTags.IFD.GPSInfo)
+    if not gps_info:
+        return captured_at, None, None
+
+    gps_lat = _gps_coord_to_decimal(gps_info.get(1), gps_info.get(2))
+    gps_lon = _gps_coord_to_decimal(gps_info.get(3), gps_info.get(4))
+    return captured_at, gps_lon, gps_lat
@@ -1,18 +1,22 @@
+import math
 from datetime import UTC, date, datetime, time
 from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, aliased
 
+from app.core.cache import TTLCache
 from app.core.config import get_settings
+from app.models.explore_poi_heat import ExplorePoiHeat
 from app.models.itinerary import Itinerary
 from app.models.itinerary_diff_action import ItineraryDiffAction
 from app.models.itinerary_fork import ItineraryFork
 from app.models.itinerary_item import ItineraryItem
+from app.models.itinerary_popularity import ItineraryPopularity
 from app.models.itinerary_snapshot import ItinerarySnapshot
 from app.models.itinerary_visit_log import ItineraryVisitLog
 from app.models.poi import Poi
@@ -20,6 +24,8 @@ from app.models.poi_ticket_rule import PoiTicketRule
 from app.models.pricing_audience import PricingAudience
 from app.models.user import User
 from app.schemas.itinerary import (
+    ExploreHeatGridCellResponse,
+    ExploreHeatGridResponse,
     ExploreHeatPointListResponse,
     ExploreHeatPointResponse,
     ExploreRecommendationItemResponse,
@@ -52,6 +58,8 @@ from app.schemas.itinerary import (
 )
 from app.services.collab_service import resolve_itinerary_access
 from app.services.notification_service import notify_source_itinerary_updated
+from app.services.recommendation_scorer import RecommendationScorer
+from app.services.view_buffer import get_itinerary_view_buffer
 
 _META_DIFF_FIELDS = ("title", "destination", "days", "status", "visibility", "cover_image_url", "start_date")
 _ITEM_DIFF_FIELDS = (
@@ -71,7 +79,11 @@ _ITEM_DIFF_FIELDS = (
     "tips",
 )
 _DIFF_ACTIONS = {"applied", "rolled_back", "ignored", "read"}
+_VIEW_FLUSH_BATCH_SIZE = 1000
+# Any constant works as long as no other job takes the same advisory lock.
+_HEATMAP_REFRESH_LOCK_ID = 0x4154_4C41_5348_4D01
 settings = get_settings()
+_heatmap_cache = TTLCache(settings.explore_heatmap_cache_seconds)
 
 
 def _ensure_status(value: str) -> str:
@@ -254,19 +266,34 @@ def _get_last_viewed_map(db: Session, itinerary_ids: list[UUID]) -> dict[UUID, d
     }
 
 
-def _get_total_view_count_map(db: Session, itinerary_ids: list[UUID]) -> dict[UUID, int]:
-    if not itinerary_ids:
-        return {}
+def _bump_itinerary_fork_count(db: Session, itinerary_id: UUID) -> None:
     stmt = (
-        select(ItineraryVisitLog.itinerary_id, func.sum(ItineraryVisitLog.view_count))
-        .where(ItineraryVisitLog.itinerary_id.in_(itinerary_ids))
-        .group_by(ItineraryVisitLog.itinerary_id)
+        pg_insert(ItineraryPopularity)
+        .values(itinerary_id=itinerary_id, forked_count=1, view_count=0)
+        .on_conflict_do_update(
+            index_elements=[ItineraryPopularity.itinerary_id],
+            set_={
+                "forked_count": ItineraryPopularity.forked_count + 1,
+                "updated_at": func.now(),
+            },
+        )
+    )
+    db.execute(stmt)
+
+
+def _drop_itinerary_fork_count(db: Session, forked_itinerary_id: UUID) -> None:
+    # Run before the fork itself is deleted: its itinerary_forks row goes with it by cascade.
+    source_ids = select(ItineraryFork.source_itinerary_id).where(
+        ItineraryFork.forked_itinerary_id == forked_itinerary_id
+    )
+    db.execute(
+        update(ItineraryPopularity)
+        .where(ItineraryPopularity.itinerary_id.in_(source_ids))
+        .values(
+            forked_count=func.greatest(ItineraryPopularity.forked_count - 1, 0),
+            updated_at=func.now(),
+        )
     )
-    rows = db.execute(stmt).all()
-    return {
-        itinerary_id: int(view_count)
-        for itinerary_id, view_count in rows
-    }
 
 
 def _get_viewed_itinerary_ids(db: Session, viewer_user_id: UUID) -> set[UUID]:
@@ -295,12 +322,13 @@ def _get_user_preferred_poi_types(db: Session, viewer_user_id: UUID) -> dict[str
     return {poi_type: int(weight) for poi_type, weight in rows}
 
 
-def _get_itinerary_poi_type_count_map(
+def _get_itinerary_poi_type_count_rows(
     db: Session,
     itinerary_ids: list[UUID],
-) -> dict[UUID, dict[str, int]]:
-    if not itinerary_ids:
-        return {}
+    poi_types: list[str],
+) -> list[tuple[UUID, str, int]]:
+    if not itinerary_ids or not poi_types:
+        return []
     stmt = (
         select(
             ItineraryItem.itinerary_id,
@@ -308,14 +336,13 @@ def _get_itinerary_poi_type_count_map(
             func.count(ItineraryItem.id),
         )
         .join(Poi, Poi.id == ItineraryItem.poi_id)
-        .where(ItineraryItem.itinerary_id.in_(itinerary_ids))
+        .where(ItineraryItem.itinerary_id.in_(itinerary_ids), Poi.type.in_(poi_types))
         .group_by(ItineraryItem.itinerary_id, Poi.type)
     )
-    rows = db.execute(stmt).all()
-    type_map: dict[UUID, dict[str, int]] = {}
-    for itinerary_id, poi_type, type_count in rows:
-        type_map.setdefault(itinerary_id, {})[poi_type] = int(type_count)
-    return type_map
+    return [
+        (itinerary_id, poi_type, int(type_count))
+        for itinerary_id, poi_type, type_count in db.execute(stmt).all()
+    ]
 
 
 def _list_public_itinerary_rows_with_metrics(
@@ -324,14 +351,32 @@ def _list_public_itinerary_rows_with_metrics(
     offset: int = 0,
     limit: int | None = None,
     exclude_itinerary_ids: set[UUID] | None = None,
+    poi_types: list[str] | None = None,
 ) -> list[tuple[Itinerary, str, int, int, datetime | None]]:
-    conditions = (
+    conditions = [
         Itinerary.status == "published",
         Itinerary.visibility == "public",
-    )
+    ]
+    if exclude_itinerary_ids:
+        conditions.append(Itinerary.id.notin_(exclude_itinerary_ids))
+    if poi_types:
+        conditions.append(
+            Itinerary.id.in_(
+                select(ItineraryItem.itinerary_id)
+                .join(Poi, Poi.id == ItineraryItem.poi_id)
+                .where(Poi.type.in_(poi_types))
+            )
+        )
     base = (
-        select(Itinerary, User.nickname)
+        select(
+            Itinerary,
+            User.nickname,
+            ItineraryPopularity.forked_count,
+            ItineraryPopularity.view_count,
+            ItineraryPopularity.last_viewed_at,
+        )
         .join(User, User.id == Itinerary.creator_user_id)
+        .outerjoin(ItineraryPopularity, ItineraryPopularity.itinerary_id == Itinerary.id)
         .where(*conditions)
         .order_by(Itinerary.created_at.desc())
         .offset(offset)
@@ -339,38 +384,108 @@ def _list_public_itinerary_rows_with_metrics(
     if limit is not None:
         base = base.limit(limit)
     rows = db.execute(base).all()
-    if not rows:
-        return []
+    return [
+        (itinerary, nickname, forked_count or 0, view_count or 0, last_viewed_at)
+        for itinerary, nickname, forked_count, view_count, last_viewed_at in rows
+    ]
 
-    itinerary_ids = [itinerary.id for itinerary, _nickname in rows]
-    forked_count_map = _get_forked_count_map(db, itinerary_ids)
-    total_view_count_map = _get_total_view_count_map(db, itinerary_ids)
-    last_viewed_map = _get_last_viewed_map(db, itinerary_ids)
 
-    result: list[tuple[Itinerary, str, int, int, datetime | None]] = []
-    for itinerary, nickname in rows:
-        if exclude_itinerary_ids and itinerary.id in exclude_itinerary_ids:
-            continue
-        result.append(
-            (
-                itinerary,
-                nickname,
-                forked_count_map.get(itinerary.id, 0),
-                total_view_count_map.get(itinerary.id, 0),
-                last_viewed_map.get(itinerary.id),
-            )
+def _list_popular_public_itinerary_rows(
+    db: Session,
+    limit: int,
+    *,
+    exclude_itinerary_ids: set[UUID] | None = None,
+    rank_by_score: bool = False,
+) -> list[tuple[Itinerary, str, int, int, datetime | None]]:
+    conditions = [
+        Itinerary.status == "published",
+        Itinerary.visibility == "public",
+    ]
+    if exclude_itinerary_ids:
+        conditions.append(Itinerary.id.notin_(exclude_itinerary_ids))
+    order_by = [
+        ItineraryPopularity.forked_count.desc(),
+        ItineraryPopularity.view_count.desc(),
+        Itinerary.created_at.desc(),
+    ]
+    if rank_by_score:
+        order_by.insert(0, (ItineraryPopularity.forked_count + ItineraryPopularity.view_count).desc())
+
+    ranked_stmt = (
+        select(
+            Itinerary,
+            User.nickname,
+            ItineraryPopularity.forked_count,
+            ItineraryPopularity.view_count,
+            ItineraryPopularity.last_viewed_at,
         )
+        .join(Itinerary, Itinerary.id == ItineraryPopularity.itinerary_id)
+        .join(User, User.id == Itinerary.creator_user_id)
+        .where(*conditions)
+        .order_by(*order_by)
+        .limit(limit)
+    )
+    result: list[tuple[Itinerary, str, int, int, datetime | None]] = [
+        (itinerary, nickname, int(forked_count), int(view_count), last_viewed_at)
+        for itinerary, nickname, forked_count, view_count, last_viewed_at in db.execute(ranked_stmt).all()
+    ]
+    if len(result) >= limit:
+        return result
+
+    # Itineraries that were never viewed or forked have no popularity row; they rank
+    # after every tracked row, newest first.
+    fresh_stmt = (
+        select(Itinerary, User.nickname)
+        .join(User, User.id == Itinerary.creator_user_id)
+        .outerjoin(ItineraryPopularity, ItineraryPopularity.itinerary_id == Itinerary.id)
+        .where(*conditions, ItineraryPopularity.itinerary_id.is_(None))
+        .order_by(Itinerary.created_at.desc())
+        .limit(limit - len(result))
+    )
+    result.extend((itinerary, nickname, 0, 0, None) for itinerary, nickname in db.execute(fresh_stmt).all())
     return result
 
 
-def _sort_public_rows_by_popularity(
-    rows: list[tuple[Itinerary, str, int, int, datetime | None]],
+def _list_personalized_candidate_rows(
+    db: Session,
+    limit: int,
+    poi_types: list[str],
+    *,
+    exclude_itinerary_ids: set[UUID] | None = None,
 ) -> list[tuple[Itinerary, str, int, int, datetime | None]]:
-    return sorted(
-        rows,
-        key=lambda row: (row[2], row[3], row[0].created_at),
-        reverse=True,
+    # Only itineraries containing a preferred POI type can gain a match score; everything
+    # else is ranked by popularity alone, so the best `limit` of those are enough.
+    matched_rows = _list_public_itinerary_rows_with_metrics(
+        db,
+        exclude_itinerary_ids=exclude_itinerary_ids,
+        poi_types=poi_types,
+    )
+    popular_rows = _list_popular_public_itinerary_rows(
+        db,
+        limit,
+        exclude_itinerary_ids=exclude_itinerary_ids,
+        rank_by_score=True,
     )
+    seen_ids = {itinerary.id for itinerary, _nickname, _forked_count, _view_count, _last_visited_at in matched_rows}
+    return matched_rows + [row for row in popular_rows if row[0].id not in seen_ids]
+
+
+def _popularity_recommendation_items(
+    rows: list[tuple[Itinerary, str, int, int, datetime | None]],
+) -> list[ExploreRecommendationItemResponse]:
+    return [
+        ExploreRecommendationItemResponse(
+            itinerary=_public_itinerary_to_response(
+                itinerary,
+                nickname,
+                forked_count=forked_count,
+                last_visited_at=last_visited_at,
+            ),
+            score=float(forked_count + total_view_count),
+            reasons=_build_popularity_reasons(forked_count, total_view_count),
+        )
+        for itinerary, nickname, forked_count, total_view_count, last_visited_at in rows
+    ]
 
 
 def _build_popularity_reasons(forked_count: int, view_count: int) -> list[str]:
@@ -693,48 +808,110 @@ def record_public_itinerary_view(
     db: Session, itinerary_id: UUID, current_user: User
 ) -> ExploreVisitLogResponse:
     itinerary, _nickname = _ensure_public_itinerary(db, itinerary_id)
-    stmt = (
-        pg_insert(ItineraryVisitLog)
-        .values(
-            itinerary_id=itinerary.id,
-            viewer_user_id=current_user.id,
-            view_count=1,
-        )
-        .on_conflict_do_update(
-            index_elements=[
-                ItineraryVisitLog.itinerary_id,
-                ItineraryVisitLog.viewer_user_id,
-            ],
-            set_={
-                "view_count": ItineraryVisitLog.view_count + 1,
-                "last_viewed_at": func.now(),
-                "updated_at": func.now(),
-            },
+    persisted_count = db.scalar(
+        select(ItineraryVisitLog.view_count).where(
+            ItineraryVisitLog.itinerary_id == itinerary.id,
+            ItineraryVisitLog.viewer_user_id == current_user.id,
         )
-        .returning(ItineraryVisitLog.last_viewed_at, ItineraryVisitLog.view_count)
     )
-    row = db.execute(stmt).first()
-    db.commit()
-    if row is None:
-        return ExploreVisitLogResponse(
-            itinerary_id=itinerary.id,
-            last_viewed_at=datetime.now(UTC),
-            view_count=1,
-        )
+    # Views are buffered and written in batches by flush_itinerary_views, so the count
+    # returned here is persisted + pending and may briefly lag across workers.
+    viewed_at = datetime.now(UTC)
+    pending_count = get_itinerary_view_buffer().record(itinerary.id, current_user.id, viewed_at)
     return ExploreVisitLogResponse(
         itinerary_id=itinerary.id,
-        last_viewed_at=row[0],
-        view_count=int(row[1]),
+        last_viewed_at=viewed_at,
+        view_count=int(persisted_count or 0) + pending_count,
     )
 
 
-def list_explore_heatmap(db: Session, limit: int) -> ExploreHeatPointListResponse:
-    stmt = (
+def flush_itinerary_views(db: Session) -> int:
+    view_buffer = get_itinerary_view_buffer()
+    drained = view_buffer.drain()
+    if not drained:
+        return 0
+    try:
+        itinerary_ids = {itinerary_id for itinerary_id, _viewer_user_id in drained}
+        existing_ids = set(db.scalars(select(Itinerary.id).where(Itinerary.id.in_(itinerary_ids))).all())
+        # Stable key order keeps concurrent flushes from different workers from deadlocking.
+        visit_rows = [
+            {
+                "itinerary_id": itinerary_id,
+                "viewer_user_id": viewer_user_id,
+                "view_count": pending.view_count,
+                "last_viewed_at": pending.last_viewed_at,
+            }
+            for (itinerary_id, viewer_user_id), pending in sorted(
+                drained.items(), key=lambda item: (str(item[0][0]), str(item[0][1]))
+            )
+            if itinerary_id in existing_ids
+        ]
+        popularity_map: dict[UUID, dict[str, Any]] = {}
+        for row in visit_rows:
+            entry = popularity_map.setdefault(
+                row["itinerary_id"],
+                {"itinerary_id": row["itinerary_id"], "view_count": 0, "last_viewed_at": row["last_viewed_at"]},
+            )
+            entry["view_count"] += row["view_count"]
+            entry["last_viewed_at"] = max(entry["last_viewed_at"], row["last_viewed_at"])
+
+        for start in range(0, len(visit_rows), _VIEW_FLUSH_BATCH_SIZE):
+            visit_stmt = pg_insert(ItineraryVisitLog).values(visit_rows[start : start + _VIEW_FLUSH_BATCH_SIZE])
+            db.execute(
+                visit_stmt.on_conflict_do_update(
+                    index_elements=[
+                        ItineraryVisitLog.itinerary_id,
+                        ItineraryVisitLog.viewer_user_id,
+                    ],
+                    set_={
+                        "view_count": ItineraryVisitLog.view_count + visit_stmt.excluded.view_count,
+                        "last_viewed_at": func.greatest(
+                            ItineraryVisitLog.last_viewed_at, visit_stmt.excluded.last_viewed_at
+                        ),
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        popularity_rows = [popularity_map[key] for key in sorted(popularity_map, key=str)]
+        for start in range(0, len(popularity_rows), _VIEW_FLUSH_BATCH_SIZE):
+            popularity_stmt = pg_insert(ItineraryPopularity).values(
+                popularity_rows[start : start + _VIEW_FLUSH_BATCH_SIZE]
+            )
+            db.execute(
+                popularity_stmt.on_conflict_do_update(
+                    index_elements=[ItineraryPopularity.itinerary_id],
+                    set_={
+                        "view_count": ItineraryPopularity.view_count + popularity_stmt.excluded.view_count,
+                        "last_viewed_at": func.greatest(
+                            ItineraryPopularity.last_viewed_at, popularity_stmt.excluded.last_viewed_at
+                        ),
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        view_buffer.restore(drained)
+        raise
+    return sum(row["view_count"] for row in visit_rows)
+
+
+def refresh_explore_heatmap(db: Session) -> int:
+    """Rebuild explore_poi_heat; returns 0 without touching it if another worker is on it.
+
+    Every worker runs this job, so the table rebuild is serialized on a transaction-level
+    advisory lock that the commit below releases.
+    """
+    if not db.scalar(select(func.pg_try_advisory_xact_lock(_HEATMAP_REFRESH_LOCK_ID))):
+        return 0
+    source = (
         select(
             Poi.id,
             Poi.name,
-            func.ST_AsText(Poi.geom),
-            func.sum(ItineraryVisitLog.view_count).label("heat_score"),
+            func.ST_X(Poi.geom),
+            func.ST_Y(Poi.geom),
+            func.sum(ItineraryVisitLog.view_count),
         )
         .join(ItineraryItem, ItineraryItem.poi_id == Poi.id)
         .join(Itinerary, Itinerary.id == ItineraryItem.itinerary_id)
@@ -744,23 +921,112 @@ def list_explore_heatmap(db: Session, limit: int) -> ExploreHeatPointListRespons
             Itinerary.visibility == "public",
         )
         .group_by(Poi.id, Poi.name, Poi.geom)
-        .order_by(func.sum(ItineraryVisitLog.view_count).desc(), Poi.name.asc())
+    )
+    db.execute(delete(ExplorePoiHeat))
+    result = db.execute(
+        insert(ExplorePoiHeat).from_select(
+            ["poi_id", "name", "longitude", "latitude", "heat_score"],
+            source,
+        )
+    )
+    db.commit()
+    _heatmap_cache.clear()
+    return int(result.rowcount or 0)
+
+
+def list_explore_heatmap(db: Session, limit: int) -> ExploreHeatPointListResponse:
+    cache_key = ("top", limit)
+    cached = _heatmap_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    stmt = (
+        select(
+            ExplorePoiHeat.poi_id,
+            ExplorePoiHeat.name,
+            ExplorePoiHeat.longitude,
+            ExplorePoiHeat.latitude,
+            ExplorePoiHeat.heat_score,
+        )
+        .order_by(ExplorePoiHeat.heat_score.desc(), ExplorePoiHeat.name.asc())
         .limit(limit)
     )
     rows = db.execute(stmt).all()
-    items = []
-    for poi_id, name, poi_wkt, heat_score in rows:
-        longitude, latitude = _parse_point_text(poi_wkt)
-        items.append(
+    response = ExploreHeatPointListResponse(
+        items=[
             ExploreHeatPointResponse(
                 poi_id=poi_id,
                 name=name,
-                longitude=longitude,
-                latitude=latitude,
+                longitude=float(longitude),
+                latitude=float(latitude),
                 heat_score=int(heat_score),
             )
+            for poi_id, name, longitude, latitude, heat_score in rows
+        ]
+    )
+    _heatmap_cache.set(cache_key, response)
+    return response
+
+
+def list_explore_heatmap_grid(
+    db: Session,
+    *,
+    min_longitude: float,
+    min_latitude: float,
+    max_longitude: float,
+    max_latitude: float,
+    zoom: int,
+) -> ExploreHeatGridResponse:
+    if min_longitude >= max_longitude or min_latitude >= max_latitude:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid bounding box")
+
+    cell_size = 360.0 / (2**zoom * max(1, settings.explore_heatmap_grid_cells_per_tile))
+    # Snap the box outward to whole cells so small pans reuse the same cache entry.
+    min_x = math.floor(min_longitude / cell_size)
+    min_y = math.floor(min_latitude / cell_size)
+    max_x = math.ceil(max_longitude / cell_size)
+    max_y = math.ceil(max_latitude / cell_size)
+    cache_key = ("grid", zoom, min_x, min_y, max_x, max_y)
+    cached = _heatmap_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    cell_x = func.floor(ExplorePoiHeat.longitude / cell_size)
+    cell_y = func.floor(ExplorePoiHeat.latitude / cell_size)
+    heat_total = func.sum(ExplorePoiHeat.heat_score)
+    stmt = (
+        select(
+            func.sum(ExplorePoiHeat.longitude * ExplorePoiHeat.heat_score) / heat_total,
+            func.sum(ExplorePoiHeat.latitude * ExplorePoiHeat.heat_score) / heat_total,
+            heat_total,
+            func.count(),
+        )
+        .where(
+            ExplorePoiHeat.heat_score > 0,
+            ExplorePoiHeat.longitude >= min_x * cell_size,
+            ExplorePoiHeat.longitude < max_x * cell_size,
+            ExplorePoiHeat.latitude >= min_y * cell_size,
+            ExplorePoiHeat.latitude < max_y * cell_size,
         )
-    return ExploreHeatPointListResponse(items=items)
+        .group_by(cell_x, cell_y)
+        .order_by(heat_total.desc())
+    )
+    rows = db.execute(stmt).all()
+    response = ExploreHeatGridResponse(
+        zoom=zoom,
+        cell_size_deg=cell_size,
+        items=[
+            ExploreHeatGridCellResponse(
+                longitude=float(longitude),
+                latitude=float(latitude),
+                heat_score=int(heat_score),
+                poi_count=int(poi_count),
+            )
+            for longitude, latitude, heat_score, poi_count in rows
+        ],
+    )
+    _heatmap_cache.set(cache_key, response)
+    return response
 
 
 def list_explore_recommendations(
@@ -772,98 +1038,68 @@ def list_explore_recommendations(
         return ExploreRecommendationListResponse(items=[])
 
     if current_user is None:
-        popular_rows = _sort_public_rows_by_popularity(
-            _list_public_itinerary_rows_with_metrics(db)
-        )
         return ExploreRecommendationListResponse(
-            items=[
-                ExploreRecommendationItemResponse(
-                    itinerary=_public_itinerary_to_response(
-                        itinerary,
-                        nickname,
-                        forked_count=forked_count,
-                        last_visited_at=last_visited_at,
-                    ),
-                    score=float(forked_count + total_view_count),
-                    reasons=_build_popularity_reasons(forked_count, total_view_count),
-                )
-                for itinerary, nickname, forked_count, total_view_count, last_visited_at in popular_rows[:limit]
-            ]
+            items=_popularity_recommendation_items(_list_popular_public_itinerary_rows(db, limit))
         )
 
     viewed_itinerary_ids = _get_viewed_itinerary_ids(db, current_user.id)
     preference_map = _get_user_preferred_poi_types(db, current_user.id)
 
-    candidate_rows = _list_public_itinerary_rows_with_metrics(
+    if not preference_map:
+        popular_rows = _list_popular_public_itinerary_rows(
+            db,
+            limit,
+            exclude_itinerary_ids=viewed_itinerary_ids if viewed_itinerary_ids else None,
+        )
+        if not popular_rows and viewed_itinerary_ids:
+            popular_rows = _list_popular_public_itinerary_rows(db, limit)
+        return ExploreRecommendationListResponse(items=_popularity_recommendation_items(popular_rows))
+
+    scorer = RecommendationScorer(preference_map)
+    candidate_rows = _list_personalized_candidate_rows(
         db,
+        limit,
+        scorer.poi_types,
         exclude_itinerary_ids=viewed_itinerary_ids if viewed_itinerary_ids else None,
     )
-    if not candidate_rows:
-        candidate_rows = _list_public_itinerary_rows_with_metrics(db)
+    if not candidate_rows and viewed_itinerary_ids:
+        candidate_rows = _list_personalized_candidate_rows(db, limit, scorer.poi_types)
     if not candidate_rows:
         return ExploreRecommendationListResponse(items=[])
 
-    popular_rows = _sort_public_rows_by_popularity(candidate_rows)
-    if not preference_map:
-        return ExploreRecommendationListResponse(
-            items=[
-                ExploreRecommendationItemResponse(
-                    itinerary=_public_itinerary_to_response(
-                        itinerary,
-                        nickname,
-                        forked_count=forked_count,
-                        last_visited_at=last_visited_at,
-                    ),
-                    score=float(forked_count + total_view_count),
-                    reasons=_build_popularity_reasons(forked_count, total_view_count),
-                )
-                for itinerary, nickname, forked_count, total_view_count, last_visited_at in popular_rows[:limit]
-            ]
-        )
-
     itinerary_ids = [itinerary.id for itinerary, _nickname, _forked_count, _view_count, _last_visited_at in candidate_rows]
-    itinerary_type_map = _get_itinerary_poi_type_count_map(db, itinerary_ids)
-
-    scored_items: list[tuple[float, tuple[Itinerary, str, int, int, datetime | None], list[str]]] = []
-    for row in candidate_rows:
-        itinerary, nickname, forked_count, total_view_count, last_visited_at = row
-        type_count_map = itinerary_type_map.get(itinerary.id, {})
-        matched_weights = {
-            poi_type: preference_map.get(poi_type, 0) * poi_count
-            for poi_type, poi_count in type_count_map.items()
-            if preference_map.get(poi_type, 0) > 0
-        }
-        match_score = float(sum(matched_weights.values()))
-        popularity_score = float(forked_count + total_view_count)
-        score = match_score + popularity_score
+    type_matrix = scorer.build_type_matrix(
+        itinerary_ids,
+        _get_itinerary_poi_type_count_rows(db, itinerary_ids, scorer.poi_types),
+    )
+    ranked = scorer.top_k(
+        type_matrix,
+        [row[2] for row in candidate_rows],
+        [row[3] for row in candidate_rows],
+        [row[0].created_at.timestamp() for row in candidate_rows],
+        limit,
+    )
 
+    items: list[ExploreRecommendationItemResponse] = []
+    for candidate in ranked:
+        itinerary, nickname, forked_count, total_view_count, last_visited_at = candidate_rows[candidate.index]
         reasons: list[str] = []
-        if matched_weights:
-            preferred_type = max(matched_weights.items(), key=lambda item: item[1])[0]
-            reasons.append(f"偏好匹配：{preferred_type}")
+        if candidate.preferred_type is not None:
+            reasons.append(f"偏好匹配：{candidate.preferred_type}")
         reasons.extend(_build_popularity_reasons(forked_count, total_view_count))
-        scored_items.append((score, row, reasons))
-
-    scored_items.sort(
-        key=lambda item: (item[0], item[1][2], item[1][3], item[1][0].created_at),
-        reverse=True,
-    )
-
-    return ExploreRecommendationListResponse(
-        items=[
+        items.append(
             ExploreRecommendationItemResponse(
                 itinerary=_public_itinerary_to_response(
-                    row[0],
-                    row[1],
-                    forked_count=row[2],
-                    last_visited_at=row[4],
+                    itinerary,
+                    nickname,
+                    forked_count=forked_count,
+                    last_visited_at=last_visited_at,
                 ),
-                score=score,
+                score=candidate.score,
                 reasons=reasons,
             )
-            for score, row, reasons in scored_items[:limit]
-        ]
-    )
+        )
+    return ExploreRecommendationListResponse(items=items)
 
 
 def get_public_itinerary_share_meta(db: Session, itinerary_id: UUID) -> PublicItineraryShareMetaResponse:
@@ -957,6 +1193,7 @@ def fork_public_itinerary(
             source_snapshot_id=snapshot.id,
         )
     )
+    _bump_itinerary_fork_count(db, source_itinerary.id)
     db.commit()
 
     return ForkItineraryResponse(
@@ -1319,6 +1556,7 @@ def delete_itinerary(db: Session, itinerary_id: UUID, creator: User) -> None:
     row = db.get(Itinerary, itinerary_id)
     if row is None or row.creator_user_id != creator.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
+    _drop_itinerary_fork_count(db, row.id)
     db.delete(row)
     db.commit()
 
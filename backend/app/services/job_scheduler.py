@@ -0,0 +1,114 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.job_watermark import JobWatermark
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    interval_seconds: float
+    func: Callable[[Session], Any]
+    run_on_shutdown: bool = False
+
+
+class JobScheduler:
+    def __init__(self) -> None:
+        self._jobs: dict[str, ScheduledJob] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._running = False
+
+    @property
+    def jobs(self) -> dict[str, ScheduledJob]:
+        return dict(self._jobs)
+
+    def register(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[Session], Any],
+        *,
+        run_on_shutdown: bool = False,
+    ) -> None:
+        self._jobs[name] = ScheduledJob(
+            name=name,
+            interval_seconds=interval_seconds,
+            func=func,
+            run_on_shutdown=run_on_shutdown,
+        )
+
+    def run_job(self, name: str) -> Any:
+        job = self._jobs[name]
+        with SessionLocal() as db:
+            return job.func(db)
+
+    async def startup(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._tasks = [
+            asyncio.create_task(self._job_loop(job), name=f"job-{job.name}")
+            for job in self._jobs.values()
+            if job.interval_seconds > 0
+        ]
+
+    async def shutdown(self) -> None:
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        for job in self._jobs.values():
+            if not job.run_on_shutdown:
+                continue
+            try:
+                await asyncio.to_thread(self.run_job, job.name)
+            except Exception:
+                logger.exception("scheduled job %s failed during shutdown", job.name)
+
+    async def _job_loop(self, job: ScheduledJob) -> None:
+        while self._running:
+            try:
+                await asyncio.to_thread(self.run_job, job.name)
+            except Exception:
+                logger.exception("scheduled job %s failed", job.name)
+            await asyncio.sleep(max(1.0, job.interval_seconds))
+
+
+def get_job_watermark(db: Session, name: str) -> datetime | None:
+    row = db.get(JobWatermark, name)
+    return row.last_run_at if row is not None else None
+
+
+def set_job_watermark(db: Session, name: str, last_run_at: datetime) -> None:
+    stmt = pg_insert(JobWatermark).values(name=name, last_run_at=last_run_at)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[JobWatermark.name],
+            set_={"last_run_at": stmt.excluded.last_run_at, "updated_at": func.now()},
+        )
+    )
+
+
+_scheduler: JobScheduler | None = None
+
+
+def get_job_scheduler() -> JobScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
@@ -2,11 +2,9 @@
 import logging
 import re
 from datetime import UTC, datetime
-from io import BytesIO
 from uuid import UUID
 
 from fastapi import HTTPException, UploadFile, status
-from PIL import Image
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
@@ -27,6 +25,8 @@ from app.schemas.poi_correction import (
     PoiCorrectionTypeListResponse,
     PoiCorrectionTypeResponse,
 )
+from app.services.direct_upload_service import claim_direct_upload
+from app.services.image_pipeline import process_image_upload
 from app.services.notification_service import notify_correction_accepted
 from app.services.passport_service import evaluate_badges, record_contribution
 from app.services.storage import get_storage_provider
@@ -34,7 +34,6 @@ from app.services.territory_service import (
     _role_index,
     active_guardian_territory_ids,
     can_review_correction_in_territory,
-    evaluate_guardian_governance,
     log_guardian_review_activity,
     record_territory_contribution,
     user_role_in_territory,
@@ -42,11 +41,6 @@ from app.services.territory_service import (
 
 logger = logging.getLogger(__name__)
 
-_ALLOWED_IMAGE_TYPES = {
-    "image/jpeg": "jpg",
-    "image/png": "png",
-    "image/webp": "webp",
-}
 _POI_MUTABLE_FIELDS = {
     "ticket_price",
     "opening_hours",
@@ -112,6 +106,7 @@ def _to_response(
         proposed_value=row.proposed_value,
         details=row.details,
         photo_url=row.photo_url,
+        photo_thumbnail_url=row.photo_thumbnail_url,
         status=row.status,
         submitter_user_id=row.submitter_user_id,
         reviewer_user_id=row.reviewer_user_id,
@@ -122,31 +117,6 @@ def _to_response(
     )
 
 
-def _validate_image_upload(photo: UploadFile) -> tuple[str, str]:
-    content_type = (photo.content_type or "").strip().lower()
-    extension = _ALLOWED_IMAGE_TYPES.get(content_type)
-    if extension is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only JPEG/PNG/WEBP images are supported",
-        )
-    return content_type, extension
-
-
-def strip_exif_bytes(raw_bytes: bytes, image_format: str) -> bytes:
-    source = BytesIO(raw_bytes)
-    with Image.open(source) as img:
-        cleaned = img.copy()
-        output = BytesIO()
-        format_name = "JPEG" if image_format.lower() in {"jpg", "jpeg"} else image_format.upper()
-        save_kwargs = {"format": format_name}
-        if format_name == "JPEG":
-            save_kwargs["quality"] = 88
-            save_kwargs["optimize"] = True
-        cleaned.save(output, **save_kwargs)
-        return output.getvalue()
-
-
 def _resolve_reviewer_user_id(db: Session, poi_id: UUID, submitter_user_id: UUID) -> UUID | None:
     stmt = (
         select(Itinerary.creator_user_id)
@@ -264,6 +234,7 @@ async def submit_correction(
     details: str | None,
     photo: UploadFile | None,
     source_itinerary_id: UUID | None = None,
+    photo_storage_key: str | None = None,
 ) -> PoiCorrectionResponse:
     poi = db.get(Poi, poi_id)
     if poi is None:
@@ -289,21 +260,31 @@ async def submit_correction(
             detail="proposed_value is required for selected correction type",
         )
 
+    if photo is not None and photo_storage_key is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Send either photo or photo_storage_key, not both",
+        )
     photo_url: str | None = None
-    photo_storage_key: str | None = None
-    if photo is not None:
-        content_type, extension = _validate_image_upload(photo)
-        raw = await photo.read()
-        if not raw:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Photo file is empty"
-            )
-        cleaned = strip_exif_bytes(raw, extension)
+    photo_thumbnail_url: str | None = None
+    photo_thumbnail_storage_key: str | None = None
+    if photo_storage_key is not None:
+        upload = claim_direct_upload(db, current_user, photo_storage_key)
+        photo_url = upload.url
+        photo_thumbnail_storage_key = upload.thumbnail_storage_key
+        photo_thumbnail_url = upload.thumbnail_url
+    elif photo is not None:
+        processed = await process_image_upload(photo)
         storage = get_storage_provider()
-        photo_storage_key, photo_url = storage.save_bytes(
-            content=cleaned,
-            extension=extension,
-            content_type=content_type,
+        photo_storage_key, photo_url = await storage.save_content(
+            processed.content,
+            extension=processed.extension,
+            content_type=processed.content_type,
+        )
+        photo_thumbnail_storage_key, photo_thumbnail_url = await storage.save_content(
+            processed.thumbnail,
+            extension=processed.extension,
+            content_type=processed.content_type,
         )
 
     reviewer_user_id = _resolve_reviewer_user_id(db, poi_id, current_user.id)
@@ -330,6 +311,8 @@ async def submit_correction(
         source_itinerary_author_snapshot=source_itinerary_author_snapshot,
         photo_url=photo_url,
         photo_storage_key=photo_storage_key,
+        photo_thumbnail_url=photo_thumbnail_url,
+        photo_thumbnail_storage_key=photo_thumbnail_storage_key,
     )
     db.add(correction)
     db.flush()
@@ -413,7 +396,6 @@ def list_review_corrections(
     offset: int,
     limit: int,
 ) -> PoiCorrectionListResponse:
-    evaluate_guardian_governance(db)
     if current_user.role == "admin":
         territory_filter_ids: list[UUID] = []
     else:
@@ -475,7 +457,6 @@ def review_correction(
     current_user: User,
     auto_approve: bool = False,
 ) -> PoiCorrectionReviewResponse:
-    evaluate_guardian_governance(db)
     correction = db.scalars(
         select(PoiCorrection).where(PoiCorrection.id == correction_id).with_for_update()
     ).first()
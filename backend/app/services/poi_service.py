@@ -18,6 +18,8 @@ from app.schemas.poi import (
     PricingAudienceItem,
     PricingAudienceListResponse,
 )
+from app.services.cache_versions import bump_cache_version
+from app.services.territory_service import TERRITORY_LIST_CACHE, sync_poi_territory_cells
 
 
 def _point_text(longitude: float, latitude: float) -> str:
@@ -106,6 +108,8 @@ def create_poi(db: Session, payload: PoiCreate) -> PoiResponse:
         parent_poi_id=payload.parent_poi_id,
     )
     db.add(poi)
+    db.flush()
+    sync_poi_territory_cells(db, [(payload.longitude, payload.latitude)])
     db.commit()
     stmt = select(Poi, func.ST_AsText(Poi.geom)).where(Poi.id == poi.id)
     row = db.execute(stmt).one()
@@ -147,9 +151,16 @@ def update_poi(db: Session, poi_id: UUID, payload: PoiUpdate) -> PoiResponse:
         )
     for key, value in data.items():
         setattr(poi, key, value)
+    moved_from: tuple[float, float] | None = None
     if lon is not None and lat is not None:
+        moved_from = _parse_point_text(db.scalar(select(func.ST_AsText(Poi.geom)).where(Poi.id == poi.id)))
         poi.geom = _point_text(lon, lat)
     db.add(poi)
+    if moved_from is not None:
+        db.flush()
+        sync_poi_territory_cells(db, [moved_from, (lon, lat)])
+    else:
+        bump_cache_version(db, TERRITORY_LIST_CACHE)
     db.commit()
     stmt = select(Poi, func.ST_AsText(Poi.geom)).where(Poi.id == poi.id)
     row = db.execute(stmt).one()
@@ -162,7 +173,10 @@ def delete_poi(db: Session, poi_id: UUID) -> None:
     poi = db.get(Poi, poi_id)
     if poi is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="POI not found")
+    location = _parse_point_text(db.scalar(select(func.ST_AsText(Poi.geom)).where(Poi.id == poi.id)))
     db.delete(poi)
+    db.flush()
+    sync_poi_territory_cells(db, [location])
     db.commit()
 
 
@@ -0,0 +1,87 @@
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class ScoredCandidate:
+    index: int
+    score: float
+    preferred_type: str | None
+
+
+class RecommendationScorer:
+    def __init__(self, preference_map: dict[str, int]) -> None:
+        self.poi_types = [poi_type for poi_type, weight in preference_map.items() if weight > 0]
+        self._type_index = {poi_type: column for column, poi_type in enumerate(self.poi_types)}
+        self.preference_vector = np.asarray(
+            [preference_map[poi_type] for poi_type in self.poi_types],
+            dtype=np.float64,
+        )
+
+    def build_type_matrix(
+        self,
+        candidate_keys: Sequence[Hashable],
+        type_count_rows: Sequence[tuple[Hashable, str, int]],
+    ) -> np.ndarray:
+        matrix = np.zeros((len(candidate_keys), len(self.poi_types)), dtype=np.float64)
+        if not type_count_rows or not self.poi_types:
+            return matrix
+        row_index = {key: row for row, key in enumerate(candidate_keys)}
+        type_index = self._type_index
+        cells = [
+            (row_index[key], type_index[poi_type], type_count)
+            for key, poi_type, type_count in type_count_rows
+            if poi_type in type_index and key in row_index
+        ]
+        if cells:
+            cell_array = np.asarray(cells, dtype=np.int64)
+            np.add.at(matrix, (cell_array[:, 0], cell_array[:, 1]), cell_array[:, 2])
+        return matrix
+
+    def top_k(
+        self,
+        type_matrix: np.ndarray,
+        forked_counts: Sequence[float],
+        view_counts: Sequence[float],
+        created_at_ts: Sequence[float],
+        k: int,
+    ) -> list[ScoredCandidate]:
+        size = type_matrix.shape[0]
+        if k <= 0 or size == 0:
+            return []
+        forked_counts = np.asarray(forked_counts, dtype=np.float64)
+        view_counts = np.asarray(view_counts, dtype=np.float64)
+        created_at_ts = np.asarray(created_at_ts, dtype=np.float64)
+
+        match_scores = type_matrix @ self.preference_vector
+        scores = match_scores + forked_counts + view_counts
+
+        if k < size:
+            # argpartition picks an arbitrary subset among equal scores at the cut, so keep
+            # every candidate tied with the k-th score and let the tie-breakers decide.
+            threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            shortlist = np.flatnonzero(scores >= threshold)
+        else:
+            shortlist = np.arange(size)
+
+        order = np.lexsort(
+            (
+                -created_at_ts[shortlist],
+                -view_counts[shortlist],
+                -forked_counts[shortlist],
+                -scores[shortlist],
+            )
+        )
+        result: list[ScoredCandidate] = []
+        for position in order[:k]:
+            index = int(shortlist[position])
+            preferred_type = None
+            if match_scores[index] > 0:
+                weighted = type_matrix[index] * self.preference_vector
+                preferred_type = self.poi_types[int(np.argmax(weighted))]
+            result.append(
+                ScoredCandidate(index=index, score=float(scores[index]), preferred_type=preferred_type)
+            )
+        return result
@@ -1,7 +1,51 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class StorageLimitExceeded(Exception):
+    """Raised by ``save_stream`` once more than ``max_bytes`` have been received."""
+
+
+@dataclass
+class StoredObject:
+    storage_key: str
+    size: int
+    modified_at: datetime
 
 
 class StorageProvider(ABC):
     @abstractmethod
     def save_bytes(self, *, content: bytes, extension: str, content_type: str) -> tuple[str, str]:
         """Save raw bytes and return (storage_key, public_url)."""
+
+    @abstractmethod
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        *,
+        extension: str,
+        content_type: str,
+        max_bytes: int | None = None,
+    ) -> tuple[str, str]:
+        """Durably store a stream of chunks and return (storage_key, public_url).
+
+        Nothing becomes visible under the returned key until the whole stream is written.
+        """
+
+    @abstractmethod
+    def open_stream(self, storage_key: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Read a stored object back in chunks; raises FileNotFoundError if it is missing."""
+
+    @abstractmethod
+    async def stat(self, storage_key: str) -> StoredObject | None:
+        """Return size and modification time, or None when the key does not exist."""
+
+    async def save_content(self, content: bytes, *, extension: str, content_type: str) -> tuple[str, str]:
+        async def _chunks() -> AsyncIterator[bytes]:
+            yield content
+
+        return await self.save_stream(_chunks(), extension=extension, content_type=content_type)
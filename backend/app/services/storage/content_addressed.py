@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import os
+from collections.abc import AsyncIterable, Iterator
+from pathlib import Path
+
+from app.services.storage.local import LocalStorageProvider, _fsync_directory, _write_atomically
+
+_BLOB_PREFIX = "cas"
+
+
+def _commit_blob(temp_path: Path, path: Path) -> None:
+    if path.exists():
+        temp_path.unlink(missing_ok=True)
+        os.utime(path)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp_path, path)
+    _fsync_directory(path.parent)
+
+
+class ContentAddressedStorageProvider(LocalStorageProvider):
+    """Stores each distinct payload once under ``cas/<h[:2]>/<h[2:4]>/<sha256>.<ext>``.
+
+    Saving bytes that already exist is a no-op returning the existing key. Blobs are
+    never rewritten in place: new ones are written to a temp file and renamed over,
+    so readers never observe a partial file.
+    """
+
+    @staticmethod
+    def _key_for_digest(digest: str, extension: str) -> str:
+        safe_ext = extension.lstrip(".").lower() or "bin"
+        return f"{_BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}.{safe_ext}"
+
+    @classmethod
+    def storage_key_for(cls, content: bytes, extension: str) -> str:
+        return cls._key_for_digest(hashlib.sha256(content).hexdigest(), extension)
+
+    def save_bytes(self, *, content: bytes, extension: str, content_type: str) -> tuple[str, str]:
+        del content_type
+        storage_key = self.storage_key_for(content, extension)
+        absolute_path = self._root / storage_key
+        if absolute_path.exists():
+            # Refresh mtime so garbage collection treats the blob as freshly uploaded.
+            os.utime(absolute_path)
+        else:
+            _write_atomically(absolute_path, content)
+        return storage_key, self.public_url(storage_key)
+
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        *,
+        extension: str,
+        content_type: str,
+        max_bytes: int | None = None,
+    ) -> tuple[str, str]:
+        del content_type
+        # The key is only known once the digest is, so spool next to the shards first.
+        temp_path, digest = await self._spool_stream(chunks, self._root / _BLOB_PREFIX, max_bytes=max_bytes)
+        storage_key = self._key_for_digest(digest, extension)
+        try:
+            await asyncio.to_thread(_commit_blob, temp_path, self._root / storage_key)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return storage_key, self.public_url(storage_key)
+
+    def iter_blobs(self) -> Iterator[tuple[str, float]]:
+        """Yield ``(storage_key, mtime)`` for every stored blob, skipping in-flight temp files."""
+        base = self._root / _BLOB_PREFIX
+        if not base.is_dir():
+            return
+        for path in base.glob("*/*/*"):
+            if path.name.startswith(".tmp-") or not path.is_file():
+                continue
+            yield path.relative_to(self._root).as_posix(), path.stat().st_mtime
+
+    def delete(self, storage_key: str) -> None:
+        self._path(storage_key).unlink(missing_ok=True)
+
+    def is_older_than(self, storage_key: str, cutoff: float) -> bool:
+        try:
+            return self._path(storage_key).stat().st_mtime < cutoff
+        except FileNotFoundError:
+            return False
+
+    def delete_if_older(self, storage_key: str, cutoff: float) -> bool:
+        """Unlink the blob unless a save refreshed its mtime to ``cutoff`` or later."""
+        if not self.is_older_than(storage_key, cutoff):
+            return False
+        self.delete(storage_key)
+        return True
@@ -0,0 +1,73 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import Collection
+
+from sqlalchemy import func, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.bounty import BountySubmission
+from app.models.poi_correction import PoiCorrection
+from app.services.storage.content_addressed import ContentAddressedStorageProvider
+
+logger = logging.getLogger(__name__)
+
+_REFERENCE_COLUMNS = (
+    BountySubmission.photo_storage_key,
+    BountySubmission.photo_thumbnail_storage_key,
+    PoiCorrection.photo_storage_key,
+    PoiCorrection.photo_thumbnail_storage_key,
+)
+
+
+def count_blob_references(db: Session, storage_keys: Collection[str] | None = None) -> Counter[str]:
+    """Reference count per storage key across every row that points at an uploaded blob.
+
+    Counts are derived from the rows on each call rather than stored, so rows removed
+    by ON DELETE CASCADE can never leave a stale count behind. Pass ``storage_keys`` to
+    count only those keys.
+    """
+
+    def _column_select(column):
+        stmt = select(column.label("storage_key")).where(column.is_not(None))
+        return stmt.where(column.in_(storage_keys)) if storage_keys is not None else stmt
+
+    references = union_all(*(_column_select(column) for column in _REFERENCE_COLUMNS)).subquery()
+    rows = db.execute(
+        select(references.c.storage_key, func.count().label("refs")).group_by(references.c.storage_key)
+    ).all()
+    return Counter({storage_key: refs for storage_key, refs in rows})
+
+
+def collect_orphan_blobs(
+    db: Session,
+    storage: ContentAddressedStorageProvider,
+    *,
+    grace_seconds: float,
+    dry_run: bool = False,
+) -> list[str]:
+    """Delete blobs with no referencing row that are older than ``grace_seconds``.
+
+    The grace period covers uploads whose rows are not committed yet, including direct
+    uploads that no submission has claimed so far; see storage_direct_upload_claim_seconds.
+    An upload of identical bytes dedupes onto the existing blob and only refreshes its
+    mtime, so candidates are recounted after listing and re-stat'ed right before unlinking.
+    """
+    references = count_blob_references(db)
+    cutoff = time.time() - grace_seconds
+    candidates = [
+        storage_key
+        for storage_key, mtime in storage.iter_blobs()
+        if mtime < cutoff and references[storage_key] == 0
+    ]
+    if candidates:
+        references = count_blob_references(db, candidates)
+    orphans: list[str] = []
+    for storage_key in candidates:
+        if references[storage_key] > 0:
+            continue
+        still_stale = storage.is_older_than if dry_run else storage.delete_if_older
+        if still_stale(storage_key, cutoff):
+            orphans.append(storage_key)
+    logger.info("storage gc: %d orphan blob(s)%s", len(orphans), " (dry run)" if dry_run else " removed")
+    return orphans
@@ -1,8 +1,52 @@
+import asyncio
+import contextlib
+import hashlib
+import os
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator
 from datetime import UTC, datetime
 from pathlib import Path
 from uuid import uuid4
 
-from app.services.storage.base import StorageProvider
+from app.services.storage.base import (
+    DEFAULT_CHUNK_SIZE,
+    StorageLimitExceeded,
+    StorageProvider,
+    StoredObject,
+)
+
+_TEMP_PREFIX = ".tmp-"
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Makes the rename itself durable; not every platform allows opening a directory.
+    with contextlib.suppress(OSError):
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _write_atomically(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=_TEMP_PREFIX)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    _fsync_directory(path.parent)
+
+
+def _commit_temp_file(temp_path: Path, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp_path, path)
+    _fsync_directory(path.parent)
 
 
 class LocalStorageProvider(StorageProvider):
@@ -11,15 +55,85 @@ class LocalStorageProvider(StorageProvider):
         self._root.mkdir(parents=True, exist_ok=True)
         self._public_base_url = public_base_url.rstrip("/")
 
-    def save_bytes(self, *, content: bytes, extension: str, content_type: str) -> tuple[str, str]:
-        del content_type
+    def public_url(self, storage_key: str) -> str:
+        return f"{self._public_base_url}/{storage_key}"
+
+    def _path(self, storage_key: str) -> Path:
+        path = (self._root / storage_key).resolve()
+        if not path.is_relative_to(self._root.resolve()):
+            raise ValueError(f"Storage key escapes the storage root: {storage_key}")
+        return path
+
+    def _new_storage_key(self, extension: str) -> str:
         safe_ext = extension.lstrip(".").lower() or "bin"
         now = datetime.now(UTC)
-        relative_dir = Path(f"{now.year:04d}/{now.month:02d}")
-        relative_path = relative_dir / f"{uuid4().hex}.{safe_ext}"
-        absolute_path = self._root / relative_path
-        absolute_path.parent.mkdir(parents=True, exist_ok=True)
-        absolute_path.write_bytes(content)
-        storage_key = str(relative_path).replace("\\", "/")
-        public_url = f"{self._public_base_url}/{storage_key}"
-        return storage_key, public_url
+        return f"{now.year:04d}/{now.month:02d}/{uuid4().hex}.{safe_ext}"
+
+    def save_bytes(self, *, content: bytes, extension: str, content_type: str) -> tuple[str, str]:
+        del content_type
+        storage_key = self._new_storage_key(extension)
+        _write_atomically(self._root / storage_key, content)
+        return storage_key, self.public_url(storage_key)
+
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        *,
+        extension: str,
+        content_type: str,
+        max_bytes: int | None = None,
+    ) -> tuple[str, str]:
+        del content_type
+        storage_key = self._new_storage_key(extension)
+        temp_path, _ = await self._spool_stream(chunks, self._root, max_bytes=max_bytes)
+        try:
+            await asyncio.to_thread(_commit_temp_file, temp_path, self._root / storage_key)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return storage_key, self.public_url(storage_key)
+
+    async def _spool_stream(
+        self, chunks: AsyncIterable[bytes], directory: Path, *, max_bytes: int | None
+    ) -> tuple[Path, str]:
+        """Write chunks to an fsynced temp file in ``directory``; returns (path, sha256 hex)."""
+        await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+        fd, raw_path = await asyncio.to_thread(tempfile.mkstemp, dir=directory, prefix=_TEMP_PREFIX)
+        temp_path = Path(raw_path)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise StorageLimitExceeded(f"stream exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    await asyncio.to_thread(handle.write, chunk)
+                await asyncio.to_thread(handle.flush)
+                await asyncio.to_thread(os.fsync, handle.fileno())
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return temp_path, digest.hexdigest()
+
+    async def open_stream(self, storage_key: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        handle = await asyncio.to_thread(open, self._path(storage_key), "rb")
+        try:
+            while chunk := await asyncio.to_thread(handle.read, chunk_size):
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    async def stat(self, storage_key: str) -> StoredObject | None:
+        try:
+            result = await asyncio.to_thread(os.stat, self._path(storage_key))
+        except FileNotFoundError:
+            return None
+        return StoredObject(
+            storage_key=storage_key,
+            size=result.st_size,
+            modified_at=datetime.fromtimestamp(result.st_mtime, tz=UTC),
+        )
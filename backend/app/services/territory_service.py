@@ -5,9 +5,10 @@ from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select, update
+from sqlalchemy import and_, case, func, select, text, update
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 from app.models.bounty import BountyTask
 from app.models.poi import Poi
@@ -34,9 +35,15 @@ from app.schemas.territory import (
     UserTerritoryProfileResponse,
     UserTerritoryRoleItem,
 )
+from app.services.cache_versions import bump_cache_version, get_cache_version
+from app.services.job_scheduler import set_job_watermark
 
 settings = get_settings()
 
+TERRITORY_LIST_CACHE = "territory-list"
+# Keyed by cache version; a bump anywhere makes every worker rebuild on its next read.
+_territory_list_cache = TTLCache(ttl_seconds=settings.territory_list_cache_seconds, max_entries=4)
+
 # ---------------------------------------------------------------------------
 # Role hierarchy (lowest 鈫?highest)
 # ---------------------------------------------------------------------------
@@ -142,82 +149,189 @@ def _guardian_rows_to_map(
 # ---------------------------------------------------------------------------
 
 
-def rebuild_territory_regions(db: Session) -> TerritoryRebuildResponse:
+# Cells are keyed by floor(lon / grid), floor(lat / grid), the same bucketing as
+# _cell_for_point, so the SQL rebuild and the per-POI path agree on cell codes.
+_REBUILD_REGIONS_SQL = """
+WITH cells AS (
+    SELECT
+        floor(ST_X(geom) / :grid)::bigint AS cell_x,
+        floor(ST_Y(geom) / :grid)::bigint AS cell_y,
+        count(*) AS poi_count
+    FROM pois
+    GROUP BY 1, 2
+    HAVING count(*) >= :min_pois
+),
+ranked AS (
+    SELECT
+        cell_x,
+        cell_y,
+        poi_count,
+        row_number() OVER (ORDER BY poi_count DESC, cell_x, cell_y) AS rank,
+        ST_MakeEnvelope(cell_x * :grid, cell_y * :grid, (cell_x + 1) * :grid, (cell_y + 1) * :grid, 4326) AS boundary,
+        ST_SetSRID(ST_MakePoint((cell_x + 0.5) * :grid, (cell_y + 0.5) * :grid), 4326) AS centroid
+    FROM cells
+)
+INSERT INTO territory_regions (
+    id, code, name, status, boundary_geom, centroid_geom, boundary_wkt, centroid_wkt, poi_count
+)
+SELECT
+    gen_random_uuid(),
+    'cell_' || cell_x || '_' || cell_y,
+    :name_prefix || lpad(rank::text, 3, '0'),
+    'active',
+    boundary,
+    centroid,
+    ST_AsText(boundary),
+    ST_AsText(centroid),
+    poi_count
+FROM ranked
+ON CONFLICT (code) DO UPDATE SET
+    status = 'active',
+    poi_count = EXCLUDED.poi_count,
+    boundary_geom = EXCLUDED.boundary_geom,
+    centroid_geom = EXCLUDED.centroid_geom,
+    boundary_wkt = EXCLUDED.boundary_wkt,
+    centroid_wkt = EXCLUDED.centroid_wkt,
+    updated_at = now()
+RETURNING id, (xmax = 0) AS inserted, poi_count
+"""
+
+_DEACTIVATE_STALE_REGIONS_SQL = """
+UPDATE territory_regions
+SET status = 'inactive', poi_count = 0, updated_at = now()
+WHERE (status <> 'inactive' OR poi_count <> 0)
+  AND NOT (id = ANY(:active_ids))
+"""
+
+_ASSIGN_POIS_SQL = """
+UPDATE pois AS p
+SET territory_id = r.id
+FROM territory_regions AS r
+WHERE r.status = 'active'
+  AND r.code = 'cell_' || floor(ST_X(p.geom) / :grid)::bigint || '_' || floor(ST_Y(p.geom) / :grid)::bigint
+  AND p.territory_id IS DISTINCT FROM r.id
+"""
+
+_CLEAR_UNASSIGNED_POIS_SQL = """
+UPDATE pois AS p
+SET territory_id = NULL
+WHERE p.territory_id IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1
+      FROM territory_regions AS r
+      WHERE r.id = p.territory_id
+        AND r.status = 'active'
+        AND r.code = 'cell_' || floor(ST_X(p.geom) / :grid)::bigint || '_' || floor(ST_Y(p.geom) / :grid)::bigint
+  )
+"""
+
+
+def _territory_grid_settings() -> tuple[float, int]:
     grid_size = settings.territory_grid_size_deg
     min_pois = settings.territory_min_pois
     if grid_size <= 0:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Invalid territory grid size")
     if min_pois <= 0:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Invalid territory min_pois")
+    return grid_size, min_pois
 
-    poi_rows = db.execute(select(Poi.id, func.ST_AsText(Poi.geom))).all()
-    buckets: dict[tuple[int, int], list[UUID]] = {}
-    for poi_id, poi_wkt in poi_rows:
-        if not poi_wkt:
-            continue
-        lon, lat = _parse_point_text(poi_wkt)
-        cell = _cell_for_point(lon, lat, grid_size)
-        buckets.setdefault(cell, []).append(poi_id)
 
-    existing_regions = db.scalars(select(TerritoryRegion)).all()
-    region_by_code = {region.code: region for region in existing_regions}
+def rebuild_territory_regions(db: Session) -> TerritoryRebuildResponse:
+    grid_size, min_pois = _territory_grid_settings()
+    params = {"grid": grid_size, "min_pois": min_pois}
 
-    selected_cells = [(cell, poi_ids) for cell, poi_ids in buckets.items() if len(poi_ids) >= min_pois]
-    selected_cells.sort(key=lambda item: len(item[1]), reverse=True)
+    upserted = db.execute(
+        text(_REBUILD_REGIONS_SQL),
+        {**params, "name_prefix": settings.territory_region_name_prefix},
+    ).all()
+    inactive_regions = db.execute(
+        text(_DEACTIVATE_STALE_REGIONS_SQL), {"active_ids": [row.id for row in upserted]}
+    ).rowcount
+    db.execute(text(_ASSIGN_POIS_SQL), {"grid": grid_size})
+    db.execute(text(_CLEAR_UNASSIGNED_POIS_SQL), {"grid": grid_size})
+    bump_cache_version(db, TERRITORY_LIST_CACHE)
+    db.commit()
+    return TerritoryRebuildResponse(
+        generated_regions=sum(1 for row in upserted if row.inserted),
+        assigned_pois=sum(int(row.poi_count) for row in upserted),
+        inactive_regions=inactive_regions or 0,
+    )
 
-    active_codes: set[str] = set()
-    assigned_poi_ids: list[UUID] = []
-    generated_regions = 0
-    for index, (cell, poi_ids) in enumerate(selected_cells, start=1):
-        cell_x, cell_y = cell
-        code = f"cell_{cell_x}_{cell_y}"
-        active_codes.add(code)
-        region = region_by_code.get(code)
-        if region is None:
-            generated_regions += 1
-            region = TerritoryRegion(
-                id=uuid.uuid4(),
-                code=code,
-                name=f"{settings.territory_region_name_prefix}{index:03d}",
-                status="active",
-                boundary_geom=_polygon_for_cell(cell_x, cell_y, grid_size),
-                centroid_geom=_point_text((cell_x + 0.5) * grid_size, (cell_y + 0.5) * grid_size),
-                poi_count=len(poi_ids),
-            )
-            db.add(region)
-            db.flush()
-            region_by_code[code] = region
-        else:
-            region.status = "active"
-            region.poi_count = len(poi_ids)
-            region.boundary_geom = _polygon_for_cell(cell_x, cell_y, grid_size)
-            region.centroid_geom = _point_text((cell_x + 0.5) * grid_size, (cell_y + 0.5) * grid_size)
-            db.add(region)
 
-        db.execute(update(Poi).where(Poi.id.in_(poi_ids)).values(territory_id=region.id))
-        assigned_poi_ids.extend(poi_ids)
+def _poi_cell_clause(cell_x: int, cell_y: int, grid_size: float):
+    # The bounding-box test lets the pois geom GiST index narrow the scan; the floor()
+    # test then applies the exact half-open cell bounds used everywhere else.
+    envelope = func.ST_MakeEnvelope(
+        cell_x * grid_size,
+        cell_y * grid_size,
+        (cell_x + 1) * grid_size,
+        (cell_y + 1) * grid_size,
+        4326,
+    )
+    return and_(
+        Poi.geom.op("&&")(envelope),
+        func.floor(func.ST_X(Poi.geom) / grid_size) == cell_x,
+        func.floor(func.ST_Y(Poi.geom) / grid_size) == cell_y,
+    )
 
-    if assigned_poi_ids:
-        db.execute(update(Poi).where(~Poi.id.in_(assigned_poi_ids)).values(territory_id=None))
-    else:
-        db.execute(update(Poi).values(territory_id=None))
 
-    inactive_regions = 0
-    for region in existing_regions:
-        if region.code in active_codes:
+def sync_poi_territory_cells(db: Session, points: Iterable[tuple[float, float] | None]) -> None:
+    """Recompute the territory cells touched by a POI create, move or delete.
+
+    Pass the POI's old and/or new (longitude, latitude) after the change has been
+    flushed; the caller owns the commit.
+    """
+    grid_size, min_pois = _territory_grid_settings()
+    # Sample POIs in the list change with any POI write, so always invalidate.
+    bump_cache_version(db, TERRITORY_LIST_CACHE)
+    cells = {_cell_for_point(point[0], point[1], grid_size) for point in points if point is not None}
+    for cell_x, cell_y in sorted(cells):
+        in_cell = _poi_cell_clause(cell_x, cell_y, grid_size)
+        code = f"cell_{cell_x}_{cell_y}"
+        poi_count = db.scalar(select(func.count()).select_from(Poi).where(in_cell)) or 0
+        region = db.scalar(select(TerritoryRegion).where(TerritoryRegion.code == code))
+
+        if poi_count >= min_pois:
+            if region is None:
+                region_total = db.scalar(select(func.count()).select_from(TerritoryRegion)) or 0
+                boundary_wkt = _polygon_for_cell(cell_x, cell_y, grid_size)
+                centroid_wkt = _point_text((cell_x + 0.5) * grid_size, (cell_y + 0.5) * grid_size)
+                region = TerritoryRegion(
+                    id=uuid.uuid4(),
+                    code=code,
+                    name=f"{settings.territory_region_name_prefix}{region_total + 1:03d}",
+                    status="active",
+                    boundary_geom=boundary_wkt,
+                    centroid_geom=centroid_wkt,
+                    boundary_wkt=boundary_wkt,
+                    centroid_wkt=centroid_wkt,
+                    poi_count=poi_count,
+                )
+                db.add(region)
+                db.flush()
+            elif region.status != "active" or region.poi_count != poi_count:
+                region.status = "active"
+                region.poi_count = poi_count
+                db.add(region)
+            db.execute(
+                update(Poi)
+                .where(in_cell, Poi.territory_id.is_distinct_from(region.id))
+                .values(territory_id=region.id)
+                .execution_options(synchronize_session=False)
+            )
             continue
-        if region.status != "inactive" or region.poi_count != 0:
+
+        if region is not None and (region.status != "inactive" or region.poi_count != 0):
             region.status = "inactive"
             region.poi_count = 0
             db.add(region)
-            inactive_regions += 1
-
-    db.commit()
-    return TerritoryRebuildResponse(
-        generated_regions=generated_regions,
-        assigned_pois=len(assigned_poi_ids),
-        inactive_regions=inactive_regions,
-    )
+        # Covers both the region's remaining POIs and a POI that just moved in.
+        db.execute(
+            update(Poi)
+            .where(in_cell, Poi.territory_id.is_not(None))
+            .values(territory_id=None)
+            .execution_options(synchronize_session=False)
+        )
 
 
 def _bootstrap_territories_if_needed(db: Session) -> None:
@@ -232,11 +346,30 @@ def _bootstrap_territories_if_needed(db: Session) -> None:
     rebuild_territory_regions(db)
 
 
-def list_territories(db: Session) -> TerritoryRegionListResponse:
-    _bootstrap_territories_if_needed(db)
-    evaluate_guardian_governance(db)
+def _region_wkt_columns():
+    return (
+        func.coalesce(TerritoryRegion.boundary_wkt, func.ST_AsText(TerritoryRegion.boundary_geom)),
+        func.coalesce(TerritoryRegion.centroid_wkt, func.ST_AsText(TerritoryRegion.centroid_geom)),
+    )
+
+
+def get_territory_list_version(db: Session) -> int:
+    return get_cache_version(db, TERRITORY_LIST_CACHE)
+
+
+def territory_list_etag(version: int) -> str:
+    return f'W/"territories-{version}"'
+
+
+def list_territories(db: Session, *, version: int | None = None) -> TerritoryRegionListResponse:
+    if version is None:
+        version = get_territory_list_version(db)
+    cached = _territory_list_cache.get(version)
+    if cached is not None:
+        return cached
+
     rows = db.execute(
-        select(TerritoryRegion, func.ST_AsText(TerritoryRegion.boundary_geom), func.ST_AsText(TerritoryRegion.centroid_geom))
+        select(TerritoryRegion, *_region_wkt_columns())
         .where(TerritoryRegion.status == "active")
         .order_by(TerritoryRegion.poi_count.desc(), TerritoryRegion.created_at.asc())
     ).all()
@@ -281,13 +414,14 @@ def list_territories(db: Session) -> TerritoryRegionListResponse:
         )
         for region, boundary_wkt, centroid_wkt in rows
     ]
-    return TerritoryRegionListResponse(items=items)
+    response = TerritoryRegionListResponse(items=items)
+    _territory_list_cache.set(version, response)
+    return response
 
 
 def get_territory(db: Session, territory_id: UUID) -> TerritoryRegionItem:
-    evaluate_guardian_governance(db)
     row = db.execute(
-        select(TerritoryRegion, func.ST_AsText(TerritoryRegion.boundary_geom), func.ST_AsText(TerritoryRegion.centroid_geom))
+        select(TerritoryRegion, *_region_wkt_columns())
         .where(TerritoryRegion.id == territory_id)
         .limit(1)
     ).first()
@@ -481,6 +615,7 @@ def review_guardian_application(
             guardian.revoked_by_user_id = None
             guardian.granted_by_user_id = current_user.id
         db.add(guardian)
+        bump_cache_version(db, TERRITORY_LIST_CACHE)
 
     db.commit()
     db.refresh(row)
@@ -616,6 +751,7 @@ def _touch_guardian_active(db: Session, user_id: UUID, territory_id: UUID) -> No
     # Auto-recover from dormancy when user becomes active again
     if guardian.state == "dormant":
         guardian.state = "active"
+        bump_cache_version(db, TERRITORY_LIST_CACHE)
     db.add(guardian)
 
 
@@ -687,6 +823,7 @@ def evaluate_user_territory_role(
         )
         db.add(guardian)
         db.flush()
+        bump_cache_version(db, TERRITORY_LIST_CACHE)
 
     # Calculate account age
     user = db.get(User, user_id)
@@ -714,6 +851,7 @@ def evaluate_user_territory_role(
     if _role_index(target_role) > _role_index(guardian.role):
         guardian.role = target_role
         db.add(guardian)
+        bump_cache_version(db, TERRITORY_LIST_CACHE)
 
     return guardian
 
@@ -751,6 +889,7 @@ def record_territory_contribution(
         )
         db.add(guardian)
         db.flush()
+        bump_cache_version(db, TERRITORY_LIST_CACHE)
 
     # Log the activity
     db.add(
@@ -769,6 +908,7 @@ def record_territory_contribution(
     guardian.last_active_at = now
     if guardian.state == "dormant":
         guardian.state = "active"
+        bump_cache_version(db, TERRITORY_LIST_CACHE)
     db.add(guardian)
 
     # Evaluate role promotion
@@ -780,30 +920,46 @@ def record_territory_contribution(
 # ---------------------------------------------------------------------------
 
 
-def evaluate_guardian_governance(db: Session) -> None:
+GUARDIAN_GOVERNANCE_JOB = "territory-guardian-governance"
+
+
+def evaluate_guardian_governance(db: Session) -> int:
     """
-    Evaluate all guardians and apply natural decay.
+    Apply natural decay to every unrevoked guardian in one UPDATE.
     - 90-day sliding window: guardians inactive beyond window become 'dormant'
-    - Dormant guardians keep their role 鈥?state simply turns grey
-    - Active guardians who were dormant auto-recover via _touch_guardian_active
+    - Dormant guardians keep their role; state simply turns grey
+    - Dormant guardians active again within the window recover to 'active'
+    Honorary guardians are left alone. Runs as a scheduled job; returns the
+    number of guardians whose state changed.
     """
     now = datetime.now(UTC)
     dormant_cutoff = now - timedelta(days=settings.guardian_dormant_window_days)
-
-    guardians = db.scalars(
-        select(TerritoryGuardian).where(TerritoryGuardian.revoked_at.is_(None))
-    ).all()
-    for guardian in guardians:
-        effective_last_active = guardian.last_active_at or guardian.granted_at
-        if effective_last_active < dormant_cutoff:
-            if guardian.state == "active":
-                guardian.state = "dormant"
-                db.add(guardian)
-        elif guardian.state == "dormant":
-            # Auto-recover if last_active_at is within window
-            guardian.state = "active"
-            db.add(guardian)
+    target_state = case(
+        (func.coalesce(TerritoryGuardian.last_active_at, TerritoryGuardian.granted_at) < dormant_cutoff, "dormant"),
+        else_="active",
+    )
+    result = db.execute(
+        update(TerritoryGuardian)
+        .where(
+            TerritoryGuardian.revoked_at.is_(None),
+            TerritoryGuardian.state.in_(("active", "dormant")),
+            TerritoryGuardian.state != target_state,
+        )
+        .values(state=target_state)
+        .execution_options(synchronize_session=False)
+    )
+    changed = result.rowcount or 0
+    if changed:
+        bump_cache_version(db, TERRITORY_LIST_CACHE)
+    set_job_watermark(db, GUARDIAN_GOVERNANCE_JOB, now)
     db.commit()
+    return changed
+
+
+def run_territory_governance(db: Session) -> int:
+    """Scheduled entry point: seed regions on an empty install, then apply guardian decay."""
+    _bootstrap_territories_if_needed(db)
+    return evaluate_guardian_governance(db)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,62 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass
+class PendingView:
+    view_count: int
+    last_viewed_at: datetime
+
+
+class ItineraryViewBuffer:
+    def __init__(self) -> None:
+        self._pending: dict[tuple[UUID, UUID], PendingView] = {}
+        self._lock = threading.Lock()
+
+    def record(self, itinerary_id: UUID, viewer_user_id: UUID, viewed_at: datetime) -> int:
+        key = (itinerary_id, viewer_user_id)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = PendingView(view_count=0, last_viewed_at=viewed_at)
+                self._pending[key] = pending
+            pending.view_count += 1
+            pending.last_viewed_at = max(pending.last_viewed_at, viewed_at)
+            return pending.view_count
+
+    def pending_count(self, itinerary_id: UUID, viewer_user_id: UUID) -> int:
+        with self._lock:
+            pending = self._pending.get((itinerary_id, viewer_user_id))
+            return pending.view_count if pending is not None else 0
+
+    def drain(self) -> dict[tuple[UUID, UUID], PendingView]:
+        with self._lock:
+            drained = self._pending
+            self._pending = {}
+        return drained
+
+    def restore(self, drained: dict[tuple[UUID, UUID], PendingView]) -> None:
+        with self._lock:
+            for key, item in drained.items():
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = item
+                    continue
+                pending.view_count += item.view_count
+                pending.last_viewed_at = max(pending.last_viewed_at, item.last_viewed_at)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+_buffer: ItineraryViewBuffer | None = None
+
+
+def get_itinerary_view_buffer() -> ItineraryViewBuffer:
+    global _buffer
+    if _buffer is None:
+        _buffer = ItineraryViewBuffer()
+    return _buffer
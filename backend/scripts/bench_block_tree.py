@@ -0,0 +1,145 @@
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import fields
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any
+
+import orjson
+
+from app.schemas.block import BlockResponse, BlockTreeResponse
+from app.services.block_service import BlockRow, _build_block_tree, _row_to_dict
+
+NUM_BLOCKS = int(os.getenv("ATLAS_BENCH_BLOCKS", "2000"))
+ROUNDS = int(os.getenv("ATLAS_BENCH_ROUNDS", "5"))
+LANES = ["core", "transit", "scenic", "dining", "lodging", "activity", "note"]
+
+
+def build_dataset(seed: int = 7) -> list[tuple[Any, ...]]:
+    """Rows in `_query_block_rows` column and ORDER BY order; about a third are nested."""
+    rng = random.Random(seed)
+    itinerary_id = uuid.uuid4()
+    base_time = datetime(2026, 1, 1, tzinfo=UTC)
+    containers: list[uuid.UUID] = []
+    rows: list[tuple[Any, ...]] = []
+    for index in range(NUM_BLOCKS):
+        block_id = uuid.UUID(int=rng.getrandbits(128))
+        parent_id = rng.choice(containers) if containers and index % 3 == 0 else None
+        is_container = parent_id is None and index % 10 == 0
+        if is_container:
+            containers.append(block_id)
+        created_at = base_time + timedelta(seconds=rng.randint(0, 2_000_000), microseconds=index)
+        rows.append(
+            (
+                block_id,
+                itinerary_id,
+                parent_id,
+                rng.randint(1, 40),
+                rng.randint(1, 10),
+                rng.choice(LANES),
+                540,
+                600,
+                "scenic",
+                f"Block {index}",
+                60,
+                round(rng.uniform(0, 500), 2) if index % 2 else None,
+                "Arrive early" if index % 4 == 0 else None,
+                "Somewhere",
+                [f"https://cdn.example.com/{index}.jpg"],
+                {"ticket_required": bool(index % 2)},
+                is_container,
+                None,
+                "draft",
+                "medium",
+                "low",
+                None,
+                ["day-trip", "family"],
+                {"collapsed": False},
+                created_at,
+                created_at,
+            )
+        )
+    rows.sort(key=lambda row: (row[4], row[5], row[3], str(row[0])))
+    return rows
+
+
+def _as_orm_rows(rows: list[tuple[Any, ...]]) -> list[SimpleNamespace]:
+    names = [f.name for f in fields(BlockRow) if f.init]
+    orm_rows = []
+    for row in rows:
+        values = dict(zip(names, row, strict=True))
+        # The ORM hands Numeric columns back as Decimal.
+        if values["cost"] is not None:
+            values["cost"] = Decimal(str(values["cost"]))
+        orm_rows.append(SimpleNamespace(**values))
+    return orm_rows
+
+
+def legacy_build_block_tree(rows: list[SimpleNamespace]) -> list[dict[str, Any]]:
+    block_map: dict[uuid.UUID, dict[str, Any]] = {}
+    for row in rows:
+        block_map[row.id] = _row_to_dict(row)
+
+    roots: list[dict[str, Any]] = []
+    for block in block_map.values():
+        pid = block["parent_block_id"]
+        if pid and pid in block_map:
+            block_map[pid]["children"].append(block)
+        else:
+            roots.append(block)
+
+    def sort_key(b: dict[str, Any]) -> tuple[Any, ...]:
+        return (b["day_index"], str(b.get("lane_key") or "core"), b["sort_order"], str(b["id"]))
+
+    for block in block_map.values():
+        block["children"].sort(key=sort_key)
+    roots.sort(key=sort_key)
+    return roots
+
+
+def legacy_end_to_end(orm_rows: list[SimpleNamespace]) -> bytes:
+    tree = legacy_build_block_tree(orm_rows)
+    return BlockTreeResponse(items=[BlockResponse(**b) for b in tree]).model_dump_json().encode()
+
+
+def compact_end_to_end(rows: list[tuple[Any, ...]]) -> bytes:
+    tree = _build_block_tree([BlockRow(*row) for row in rows])
+    return orjson.dumps({"items": tree}, option=orjson.OPT_UTC_Z)
+
+
+def _best_of(fn, *args) -> tuple[float, bytes]:
+    best = float("inf")
+    result = b""
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _report(label: str, legacy_seconds: float, compact_seconds: float) -> None:
+    print(
+        f"{label:<12} legacy {legacy_seconds * 1000:8.1f} ms | "
+        f"compact {compact_seconds * 1000:8.1f} ms | speedup {legacy_seconds / compact_seconds:6.1f}x"
+    )
+
+
+def main() -> None:
+    rows = build_dataset()
+    orm_rows = _as_orm_rows(rows)
+    print(f"blocks={NUM_BLOCKS} rounds={ROUNDS}")
+
+    legacy_seconds, legacy_body = _best_of(legacy_end_to_end, orm_rows)
+    compact_seconds, compact_body = _best_of(compact_end_to_end, rows)
+    if json.loads(legacy_body) != json.loads(compact_body):
+        raise RuntimeError("block tree payload mismatch")
+    _report("end-to-end", legacy_seconds, compact_seconds)
+    print(f"payload      legacy {len(legacy_body)} bytes | compact {len(compact_body)} bytes")
+
+
+if __name__ == "__main__":
+    main()
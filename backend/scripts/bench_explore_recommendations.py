@@ -0,0 +1,151 @@
+import os
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from app.services.recommendation_scorer import RecommendationScorer
+
+NUM_ITINERARIES = int(os.getenv("ATLAS_BENCH_ITINERARIES", "100000"))
+TOP_K = int(os.getenv("ATLAS_BENCH_TOP_K", "12"))
+ROUNDS = int(os.getenv("ATLAS_BENCH_ROUNDS", "5"))
+POI_TYPES = [
+    "sightseeing",
+    "museum",
+    "park",
+    "food",
+    "shopping",
+    "hotel",
+    "temple",
+    "nightlife",
+    "beach",
+    "hiking",
+    "theater",
+    "market",
+]
+
+
+def build_dataset(seed: int = 7) -> tuple[list[tuple[int, int, int, datetime]], list[tuple[int, str, int]]]:
+    rng = random.Random(seed)
+    base_time = datetime(2026, 1, 1, tzinfo=UTC)
+    rows: list[tuple[int, int, int, datetime]] = []
+    type_count_rows: list[tuple[int, str, int]] = []
+    for itinerary_id in range(NUM_ITINERARIES):
+        rows.append(
+            (
+                itinerary_id,
+                rng.randint(0, 30),
+                rng.randint(0, 400),
+                base_time + timedelta(minutes=rng.randint(0, 500_000)),
+            )
+        )
+        for poi_type in rng.sample(POI_TYPES, rng.randint(1, 4)):
+            type_count_rows.append((itinerary_id, poi_type, rng.randint(1, 5)))
+    return rows, type_count_rows
+
+
+def legacy_top_k(
+    rows: list[tuple[int, int, int, datetime]],
+    itinerary_type_map: dict[int, dict[str, int]],
+    preference_map: dict[str, int],
+) -> list[tuple[float, int]]:
+    scored_items = []
+    for row in rows:
+        itinerary_id, forked_count, view_count, _created_at = row
+        matched_weights = {
+            poi_type: preference_map.get(poi_type, 0) * poi_count
+            for poi_type, poi_count in itinerary_type_map.get(itinerary_id, {}).items()
+            if preference_map.get(poi_type, 0) > 0
+        }
+        score = float(sum(matched_weights.values())) + float(forked_count + view_count)
+        scored_items.append((score, row))
+    scored_items.sort(key=lambda item: (item[0], item[1][1], item[1][2], item[1][3]), reverse=True)
+    return [(score, row[0]) for score, row in scored_items[:TOP_K]]
+
+
+def legacy_end_to_end(
+    rows: list[tuple[int, int, int, datetime]],
+    type_count_rows: list[tuple[int, str, int]],
+    preference_map: dict[str, int],
+) -> list[tuple[float, int]]:
+    itinerary_type_map: dict[int, dict[str, int]] = {}
+    for itinerary_id, poi_type, type_count in type_count_rows:
+        itinerary_type_map.setdefault(itinerary_id, {})[poi_type] = type_count
+    return legacy_top_k(rows, itinerary_type_map, preference_map)
+
+
+def vectorized_end_to_end(
+    rows: list[tuple[int, int, int, datetime]],
+    type_count_rows: list[tuple[int, str, int]],
+    preference_map: dict[str, int],
+) -> list[tuple[float, int]]:
+    scorer = RecommendationScorer(preference_map)
+    keys = [row[0] for row in rows]
+    matrix = scorer.build_type_matrix(keys, type_count_rows)
+    ranked = scorer.top_k(
+        matrix,
+        [row[1] for row in rows],
+        [row[2] for row in rows],
+        [row[3].timestamp() for row in rows],
+        TOP_K,
+    )
+    return [(candidate.score, keys[candidate.index]) for candidate in ranked]
+
+
+def _best_of(fn, *args) -> tuple[float, list[tuple[float, int]]]:
+    best = float("inf")
+    result: list[tuple[float, int]] = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _report(label: str, legacy_seconds: float, vector_seconds: float) -> None:
+    print(
+        f"{label:<12} legacy {legacy_seconds * 1000:8.1f} ms | "
+        f"vectorized {vector_seconds * 1000:8.1f} ms | speedup {legacy_seconds / vector_seconds:6.1f}x"
+    )
+
+
+def main() -> None:
+    rows, type_count_rows = build_dataset()
+    preference_map = {"museum": 6, "temple": 3, "food": 2}
+    # The service fetches type counts with `Poi.type IN (<preferred types>)`, so the vectorized
+    # path only ever sees rows for preferred types; the legacy path fetched every type.
+    preferred_rows = [row for row in type_count_rows if row[1] in preference_map]
+    print(
+        f"itineraries={NUM_ITINERARIES} type_rows={len(type_count_rows)} "
+        f"preferred_type_rows={len(preferred_rows)} top_k={TOP_K} rounds={ROUNDS}"
+    )
+
+    legacy_seconds, legacy_result = _best_of(legacy_end_to_end, rows, type_count_rows, preference_map)
+    vector_seconds, vector_result = _best_of(vectorized_end_to_end, rows, preferred_rows, preference_map)
+    if legacy_result != vector_result:
+        raise RuntimeError(f"ranking mismatch: {legacy_result} != {vector_result}")
+    _report("end-to-end", legacy_seconds, vector_seconds)
+
+    itinerary_type_map: dict[int, dict[str, int]] = {}
+    for itinerary_id, poi_type, type_count in type_count_rows:
+        itinerary_type_map.setdefault(itinerary_id, {})[poi_type] = type_count
+    scorer = RecommendationScorer(preference_map)
+    keys = [row[0] for row in rows]
+    matrix = scorer.build_type_matrix(keys, preferred_rows)
+    forked_counts = np.asarray([row[1] for row in rows], dtype=np.float64)
+    view_counts = np.asarray([row[2] for row in rows], dtype=np.float64)
+    created_at_ts = np.asarray([row[3].timestamp() for row in rows], dtype=np.float64)
+
+    legacy_seconds, _ = _best_of(legacy_top_k, rows, itinerary_type_map, preference_map)
+    vector_seconds, _ = _best_of(
+        lambda: [
+            (candidate.score, keys[candidate.index])
+            for candidate in scorer.top_k(matrix, forked_counts, view_counts, created_at_ts, TOP_K)
+        ]
+    )
+    _report("scoring", legacy_seconds, vector_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import logging
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.services.storage.content_addressed import ContentAddressedStorageProvider
+from app.services.storage.gc import collect_orphan_blobs
+
+logging.basicConfig(level=logging.INFO)
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Remove content-addressed upload blobs no row references.")
+    parser.add_argument("--dry-run", action="store_true", help="only list orphan blobs")
+    parser.add_argument(
+        "--grace-seconds",
+        type=int,
+        default=settings.storage_gc_grace_seconds,
+        help="keep orphans younger than this (uploads whose rows are not committed yet)",
+    )
+    args = parser.parse_args()
+
+    storage = ContentAddressedStorageProvider(
+        root_dir=settings.storage_local_root,
+        public_base_url=settings.storage_public_base_url,
+    )
+    with SessionLocal() as db:
+        orphans = collect_orphan_blobs(db, storage, grace_seconds=args.grace_seconds, dry_run=args.dry_run)
+    for storage_key in orphans:
+        print(storage_key)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
+import asyncio
+import threading
 from types import SimpleNamespace
 from uuid import uuid4
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
 
 from app.models.itinerary import Itinerary
 from app.models.itinerary_item import ItineraryItem
@@ -16,8 +19,12 @@ from app.schemas.ai_engine import (
 from app.services.ai_engine_service import (
     _AiRawItem,
     _AiRawResponse,
+    _AmapPlace,
     _call_llm,
     _place_has_grounding,
+    _resolve_amap_places,
+    _resolve_local_pois,
+    _resolve_remote_places,
     import_ai_plan,
     preview_ai_plan,
 )
@@ -79,9 +86,15 @@ def test_preview_ai_plan_reorders_by_day(monkeypatch):
             ],
         )
 
-    def fake_local(_db, name):
-        if name == "春熙路":
-            return AiPreviewPoi(
+    local_calls = []
+    remote_calls = []
+
+    def fake_local(_db, names):
+        # Database lookups must not run on the event loop thread.
+        assert threading.current_thread() is not threading.main_thread()
+        local_calls.append(names)
+        return {
+            "春熙路": AiPreviewPoi(
                 poi_id=uuid4(),
                 name="春熙路",
                 type="shopping",
@@ -89,34 +102,122 @@ def test_preview_ai_plan_reorders_by_day(monkeypatch):
                 latitude=30.6571,
                 match_source="local",
             )
-        return None
+        }
 
-    def fake_amap(name, _destination, _fallback_type):
-        return AiPreviewPoi(
-            name=name,
-            type="scenic",
-            longitude=104.0,
-            latitude=30.0,
-            match_source="amap",
-        )
+    async def fake_remote(_db, names, destination):
+        remote_calls.append((names, destination))
+        return {"宽窄巷子": _AmapPlace(found=True, name="宽窄巷子", longitude=104.0, latitude=30.0)}
 
     monkeypatch.setattr("app.services.ai_engine_service._call_llm", fake_call)
-    monkeypatch.setattr("app.services.ai_engine_service._resolve_local_poi", fake_local)
-    monkeypatch.setattr("app.services.ai_engine_service._resolve_amap_poi", fake_amap)
-
-    result = preview_ai_plan(
-        db,
-        AiPreviewRequest(
-            raw_text="第一天去春熙路，第二天去宽窄巷子和杜甫草堂。",
-            itinerary_id=itinerary_id,
-        ),
-        user,
+    monkeypatch.setattr("app.services.ai_engine_service._resolve_local_pois", fake_local)
+    monkeypatch.setattr("app.services.ai_engine_service._resolve_remote_places", fake_remote)
+
+    result = asyncio.run(
+        preview_ai_plan(
+            db,
+            AiPreviewRequest(
+                raw_text="第一天去春熙路，第二天去宽窄巷子和杜甫草堂。",
+                itinerary_id=itinerary_id,
+            ),
+            user,
+        )
     )
 
     assert isinstance(result, AiPreviewResponse)
     assert [item.day_index for item in result.items] == [1, 2, 2]
     assert [item.sort_order for item in result.items] == [1, 1, 2]
+    assert [item.poi.match_source for item in result.items] == ["local", "amap", "unresolved"]
     assert result.days == 2
+    assert local_calls == [["宽窄巷子", "春熙路", "杜甫草堂"]]
+    assert remote_calls == [(["宽窄巷子", "杜甫草堂"], "成都")]
+
+
+def test_resolve_local_pois_batches_names_into_one_query():
+    newest, older = (
+        SimpleNamespace(
+            id=uuid4(),
+            name=name,
+            type="shopping",
+            address=None,
+            opening_hours=None,
+            ticket_price=None,
+        )
+        for name in ("Chunxi Road", "CHUNXI ROAD")
+    )
+    statements = []
+
+    class _Db:
+        def execute(self, stmt):
+            statements.append(stmt)
+            return _RowsResult([(newest, "POINT(104.08 30.65)"), (older, "POINT(1 1)")])
+
+    result = _resolve_local_pois(_Db(), ["chunxi road", " Chunxi Road ", "Kuanzhai Alley", "  "])
+
+    assert len(statements) == 1
+    sql = str(statements[0].compile(dialect=postgresql.dialect()))
+    assert "ORDER BY pois.updated_at DESC" in sql
+    assert "lower(pois.name) IN" in sql
+    assert statements[0].compile(dialect=postgresql.dialect()).params["lower_1"] == [
+        "chunxi road",
+        "kuanzhai alley",
+    ]
+    assert list(result) == ["chunxi road"]
+    assert result["chunxi road"].poi_id == newest.id
+    assert (result["chunxi road"].longitude, result["chunxi road"].latitude) == (104.08, 30.65)
+
+
+def test_resolve_remote_places_reads_cache_and_stores_only_real_answers(monkeypatch):
+    fetched = []
+    stored = {}
+
+    def fake_load(_db, city_key, name_keys):
+        assert threading.current_thread() is not threading.main_thread()
+        assert city_key == "成都"
+        assert name_keys == ["宽窄巷子", "杜甫草堂", "锦里"]
+        return {"锦里": _AmapPlace(found=True, name="锦里古街", longitude=104.05, latitude=30.64)}
+
+    def fake_store(_db, city_key, places):
+        assert threading.current_thread() is not threading.main_thread()
+        stored[city_key] = places
+
+    async def fake_amap(names, _destination):
+        fetched.append(names)
+        return {"宽窄巷子": _AmapPlace(found=False), "杜甫草堂": None}
+
+    monkeypatch.setattr("app.services.ai_engine_service._load_cached_places", fake_load)
+    monkeypatch.setattr("app.services.ai_engine_service._resolve_amap_places", fake_amap)
+    monkeypatch.setattr("app.services.ai_engine_service._store_cached_places", fake_store)
+
+    places = asyncio.run(_resolve_remote_places(object(), ["锦里", "宽窄巷子", " 宽窄巷子", "杜甫草堂"], " 成都"))
+
+    assert fetched == [{"宽窄巷子": "宽窄巷子", "杜甫草堂": "杜甫草堂"}]
+    assert stored == {"成都": {"宽窄巷子": _AmapPlace(found=False)}}
+    assert set(places) == {"锦里", "宽窄巷子"}
+    assert places["锦里"].name == "锦里古街"
+
+
+def test_resolve_amap_places_caps_concurrency(monkeypatch):
+    monkeypatch.setattr("app.services.ai_engine_service.settings.amap_web_service_key", "key")
+    monkeypatch.setattr("app.services.ai_engine_service.settings.amap_max_concurrency", 2)
+    monkeypatch.setattr("app.services.ai_engine_service.get_amap_client", lambda: object())
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch(_client, name, _destination):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return _AmapPlace(found=True, name=name.upper(), longitude=1.0, latitude=2.0)
+
+    monkeypatch.setattr("app.services.ai_engine_service._fetch_amap_place", fake_fetch)
+
+    names = {f"p{index}": f"p{index}" for index in range(6)}
+    places = asyncio.run(_resolve_amap_places(names, "chengdu"))
+
+    assert peak == 2
+    assert {key: place.name for key, place in places.items()} == {key: key.upper() for key in names}
 
 
 def test_import_ai_plan_appends_sort_order():
@@ -249,7 +350,7 @@ def test_preview_ai_plan_returns_structured_422_when_items_empty(monkeypatch):
 
     with pytest.raises(HTTPException) as exc:
         request = AiPreviewRequest(raw_text="只有一句话", itinerary_id=itinerary_id)
-        preview_ai_plan(db, request, user)
+        asyncio.run(preview_ai_plan(db, request, user))
 
     assert exc.value.status_code == 422
     assert isinstance(exc.value.detail, dict)
@@ -281,7 +382,7 @@ def test_preview_ai_plan_returns_422_when_items_have_no_grounding(monkeypatch):
             raw_text="这次就随便逛逛北京吧，时间看情况安排。",
             itinerary_id=itinerary_id,
         )
-        preview_ai_plan(db, request, user)
+        asyncio.run(preview_ai_plan(db, request, user))
 
     assert exc.value.status_code == 422
     assert isinstance(exc.value.detail, dict)
@@ -292,3 +393,46 @@ def test_place_grounding_with_exact_and_partial_match():
     assert _place_has_grounding("天安门广场", "第一天去天安门广场看升旗")
     assert _place_has_grounding("北京大栅栏", "晚上想去大栅栏吃点东西")
     assert not _place_has_grounding("烟袋斜街", "这次就随便逛逛北京吧")
+
+
+def test_import_ai_plan_syncs_territory_cells_for_created_pois(monkeypatch):
+    owner_id = uuid4()
+    itinerary_id = uuid4()
+    itinerary = SimpleNamespace(id=itinerary_id, creator_user_id=owner_id, days=2, status="draft")
+    db = _FakeDb(itinerary, owner_id)
+    existing = SimpleNamespace(id=uuid4())
+    db.poi_map = {existing.id: existing}
+    synced = []
+    monkeypatch.setattr(
+        "app.services.ai_engine_service.sync_poi_territory_cells",
+        lambda _db, points: synced.append(list(points)),
+    )
+
+    def item(day_index, name, **poi):
+        return {
+            "day_index": day_index,
+            "sort_order": 1,
+            "start_time": None,
+            "duration_minutes": None,
+            "cost": None,
+            "tips": None,
+            "poi": {"name": name, "type": "scenic", **poi},
+        }
+
+    preview = AiPreviewResponse(
+        title="测试",
+        destination="成都",
+        days=2,
+        items=[
+            item(1, "宽窄巷子", match_source="amap", longitude=104.05, latitude=30.66),
+            item(1, "武侯祠", match_source="local", poi_id=existing.id),
+            item(2, "杜甫草堂", match_source="amap", longitude=104.03, latitude=30.66),
+        ],
+    )
+
+    user = SimpleNamespace(id=owner_id)
+    import_ai_plan(db, AiImportRequest(itinerary_id=itinerary_id, preview=preview), user)
+
+    assert len([value for value in db.added if isinstance(value, Poi)]) == 2
+    assert synced == [[(104.05, 30.66), (104.03, 30.66)]]
+    assert db.committed is True
@@ -146,9 +146,10 @@ def test_get_board_api_returns_summary(client, fake_db, monkeypatch):
     edge_id = uuid4()
     now = datetime.now(UTC)
 
-    def _fake_list_board(db, actual_itinerary_id):
+    def _fake_list_board(db, actual_itinerary_id, since=None):
         assert db is fake_db
         assert str(actual_itinerary_id) == str(itinerary_id)
+        assert since is None
         return {
             "itinerary_id": itinerary_id,
             "items": [
@@ -255,3 +256,38 @@ def test_update_block_layout_api_calls_service(client, monkeypatch):
     assert response.status_code == 200
     assert str(seen["block_id"]) == str(block_id)
     assert seen["payload"].lane_key == "dining"
+
+
+def test_block_ops_api_passes_ordered_ops_and_maps_errors(client, fake_db, monkeypatch):
+    itinerary_id = uuid4()
+    block_id = uuid4()
+    seen = {}
+
+    def _fake_apply_block_ops(db, actual_itinerary_id, ops):
+        assert db is fake_db
+        seen["itinerary_id"] = actual_itinerary_id
+        seen["ops"] = [op.op for op in ops]
+        if len(ops) > 2:
+            raise ValueError("Block not found")
+        return 3
+
+    monkeypatch.setattr(blocks_api.block_service, "apply_block_ops", _fake_apply_block_ops)
+    ops = [
+        {"op": "reorder", "day_index": 1, "ordered_block_ids": [str(block_id)]},
+        {"op": "patch", "block_ids": [str(block_id)], "status": "done"},
+    ]
+
+    response = client.post(f"/api/v1/itineraries/{itinerary_id}/blocks/ops", json={"ops": ops})
+
+    assert response.status_code == 200
+    assert response.json() == {"itinerary_id": str(itinerary_id), "updated_count": 3}
+    assert seen["ops"] == ["reorder", "patch"]
+
+    failing = [*ops, {"op": "layout", "block_id": str(uuid4()), "sort_order": 2}]
+    response = client.post(f"/api/v1/itineraries/{itinerary_id}/blocks/ops", json={"ops": failing})
+    assert response.status_code == 400
+
+    response = client.post(
+        f"/api/v1/itineraries/{itinerary_id}/blocks/ops", json={"ops": [{"op": "delete"}]}
+    )
+    assert response.status_code == 422
@@ -0,0 +1,428 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import orjson
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.block import (
+    BlockBatchUpdateRequest,
+    BlockDependencyCreate,
+    BlockOpsRequest,
+    BlockTreeResponse,
+)
+from app.services import block_service
+from app.services.dependency_graph import DependencyGraph, block_node
+
+
+class _FakeDb:
+    def __init__(self, rows=None, rowcount=0):
+        self.rows = rows or []
+        self.rowcount = rowcount
+        self.updates = []
+        self.writes = []
+        self.committed = False
+
+    def execute(self, stmt, _params=None):
+        if stmt.is_update:
+            self.updates.append(stmt.compile(dialect=postgresql.dialect()))
+            return SimpleNamespace(rowcount=self.rowcount)
+        if stmt.is_insert or stmt.is_delete:
+            self.writes.append(stmt.table.name)
+            # Only the board version bump reads its result back.
+            return SimpleNamespace(scalar_one=lambda: 7)
+        return SimpleNamespace(
+            mappings=lambda: self.rows,
+            all=lambda: [SimpleNamespace(**row) for row in self.rows],
+        )
+
+    def flush(self):
+        return None
+
+    def commit(self):
+        self.committed = True
+
+
+def _state(**overrides):
+    row = {
+        "id": uuid4(),
+        "day_index": 1,
+        "lane_key": "core",
+        "sort_order": 1,
+        "start_minute": None,
+        "end_minute": None,
+        "status": "draft",
+        "priority": "medium",
+        "risk_level": "low",
+        "assignee_user_id": None,
+        "tags": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_reorder_blocks_writes_one_values_update():
+    db = _FakeDb()
+    itinerary_id = uuid4()
+    ordered = [uuid4() for _ in range(60)]
+
+    block_service.reorder_blocks(db, itinerary_id, None, 2, ordered)
+
+    assert len(db.updates) == 1
+    sql = str(db.updates[0])
+    assert "FROM (VALUES" in sql
+    assert "sort_order=CAST(patch.sort_order AS INTEGER)" in sql
+    assert "itinerary_blocks.itinerary_id = " in sql
+    params = db.updates[0].params
+    assert params["param_1"] == ordered[0]
+    assert (params["param_2"], params["param_3"]) == (1, 2)
+    assert params["param_179"] == 60
+    assert "board_version=%(board_version)s" in sql and params["board_version"] == 7
+    assert db.writes == ["cache_versions"]
+    assert db.committed is True
+
+
+def test_auto_layout_board_updates_only_moved_rows():
+    itinerary_id = uuid4()
+    late = _state(start_minute=600, sort_order=1)
+    early = _state(start_minute=540, sort_order=2)
+    settled = _state(lane_key="dining", sort_order=1)
+    db = _FakeDb([late, early, settled])
+
+    updated = block_service.auto_layout_board(db, itinerary_id)
+
+    assert updated == 2
+    assert len(db.updates) == 1
+    params = db.updates[0].params
+    assert {(params["param_1"], params["param_2"]), (params["param_3"], params["param_4"])} == {
+        (early["id"], 1),
+        (late["id"], 2),
+    }
+
+
+def test_batch_update_blocks_is_a_single_in_update():
+    db = _FakeDb()
+    payload = BlockBatchUpdateRequest(
+        itinerary_id=uuid4(), block_ids=[uuid4(), uuid4()], status="done", tags=["x"]
+    )
+
+    block_service.batch_update_blocks(db, payload)
+
+    sql = str(db.updates[0])
+    assert len(db.updates) == 1
+    assert "itinerary_blocks.id IN" in sql
+    assert "status=" in sql and "tags=" in sql and "priority" not in sql
+
+
+def test_apply_block_ops_merges_ops_into_one_update(monkeypatch):
+    written = []
+    bulk_update = block_service._bulk_update_blocks
+
+    def _recording_bulk_update(db, itinerary_id, columns, rows, board_version):
+        written.extend(dict(zip(["id", *columns], row, strict=True)) for row in rows)
+        return bulk_update(db, itinerary_id, columns, rows, board_version)
+
+    monkeypatch.setattr(block_service, "_bulk_update_blocks", _recording_bulk_update)
+    first = _state(sort_order=1)
+    second = _state(sort_order=2, tags=None)
+    db = _FakeDb([first, second], rowcount=2)
+    request = BlockOpsRequest.model_validate(
+        {
+            "ops": [
+                {
+                    "op": "reorder",
+                    "day_index": 1,
+                    "ordered_block_ids": [str(second["id"]), str(first["id"])],
+                },
+                {
+                    "op": "layout",
+                    "block_id": str(first["id"]),
+                    "lane_key": "dining",
+                    "start_minute": 600,
+                },
+                {"op": "patch", "block_ids": [str(first["id"])], "status": "ready"},
+            ]
+        }
+    )
+
+    updated = block_service.apply_block_ops(db, uuid4(), request.ops)
+
+    assert updated == 2
+    assert len(db.updates) == 1
+    sql = str(db.updates[0])
+    assert "AS patch (id, lane_key, sort_order, start_minute, status)" in sql
+    assert "tags" not in sql
+    assert db.writes == ["cache_versions", "itinerary_board_lanes", "itinerary_board_lanes"]
+    assert sorted(written, key=lambda row: row["sort_order"]) == [
+        {"id": second["id"], "lane_key": "core", "sort_order": 1, "start_minute": None, "status": "draft"},
+        {"id": first["id"], "lane_key": "dining", "sort_order": 2, "start_minute": 600, "status": "ready"},
+    ]
+    assert db.committed is True
+
+
+def test_apply_block_ops_validates_against_earlier_ops_and_writes_nothing():
+    block = _state(start_minute=None, end_minute=None)
+    db = _FakeDb([block])
+    request = BlockOpsRequest.model_validate(
+        {
+            "ops": [
+                {"op": "layout", "block_id": str(block["id"]), "end_minute": 600},
+                {"op": "layout", "block_id": str(block["id"]), "start_minute": 700},
+            ]
+        }
+    )
+
+    with pytest.raises(ValueError, match="end_minute"):
+        block_service.apply_block_ops(db, uuid4(), request.ops)
+
+    assert db.updates == []
+    assert db.committed is False
+
+
+def test_apply_block_ops_rejects_unknown_layout_block():
+    request = BlockOpsRequest.model_validate(
+        {"ops": [{"op": "layout", "block_id": str(uuid4()), "sort_order": 2}]}
+    )
+
+    with pytest.raises(ValueError, match="Block not found"):
+        block_service.apply_block_ops(_FakeDb(), uuid4(), request.ops)
+
+
+class _QueuedDb:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    def execute(self, stmt, params=None):
+        self.statements.append((stmt, params))
+        result = self.results.pop(0) if self.results else []
+        return SimpleNamespace(
+            all=lambda: result,
+            scalars=lambda: SimpleNamespace(all=lambda: result),
+            scalar_one_or_none=lambda: result,
+            scalar_one=lambda: 7,
+        )
+
+    def scalars(self, stmt):
+        return self.execute(stmt).scalars()
+
+    def flush(self):
+        return None
+
+    def add(self, obj):
+        self.added = obj
+
+    def refresh(self, _obj):
+        return None
+
+    def delete(self, obj):
+        self.deleted = obj
+
+    def commit(self):
+        self.committed = True
+
+
+def _summary(itinerary_id, version):
+    return {
+        "itinerary_id": itinerary_id,
+        "version": version,
+        "lanes": [],
+        "summary": {"block_count": 0, "dependency_count": 0, "blocked_count": 0},
+    }
+
+
+def test_list_board_since_returns_changes_and_tombstones(monkeypatch):
+    itinerary_id = uuid4()
+    removed_block, removed_edge = uuid4(), uuid4()
+    db = _QueuedDb([], [], [("block", removed_block), ("edge", removed_edge)])
+    monkeypatch.setattr(block_service, "get_board_summary", lambda _db, _id: _summary(itinerary_id, 9))
+
+    board = block_service.list_board(db, itinerary_id, since=5)
+
+    assert board["delta"] is True
+    assert board["version"] == 9
+    assert board["removed_block_ids"] == [removed_block]
+    assert board["removed_edge_ids"] == [removed_edge]
+    for stmt, _ in db.statements:
+        assert "board_version > " in str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_list_board_since_ahead_of_version_returns_full_board(monkeypatch):
+    itinerary_id = uuid4()
+    monkeypatch.setattr(block_service, "get_board_summary", lambda _db, _id: _summary(itinerary_id, 3))
+    monkeypatch.setattr(block_service, "_query_block_rows", lambda _db, _id: [])
+    monkeypatch.setattr(block_service, "list_dependencies", lambda _db, _id: [])
+
+    board = block_service.list_board(object(), itinerary_id, since=8)
+
+    assert board["delta"] is False
+    assert board["version"] == 3
+
+
+def test_refresh_board_lanes_recounts_and_drops_empty_lanes():
+    db = _QueuedDb()
+
+    block_service.refresh_board_lanes(db, uuid4())
+
+    upsert, prune = (str(stmt.compile(dialect=postgresql.dialect())) for stmt, _ in db.statements)
+    assert "INSERT INTO itinerary_board_lanes" in upsert
+    assert "count(*) FILTER (WHERE itinerary_blocks.status = " in upsert
+    assert "ON CONFLICT (itinerary_id, lane_key) DO UPDATE" in upsert
+    assert "DELETE FROM itinerary_board_lanes" in prune and "NOT IN" in prune
+
+
+def test_delete_block_tombstones_subtree_and_cascaded_edges(monkeypatch):
+    itinerary_id = uuid4()
+    container = SimpleNamespace(id=uuid4(), itinerary_id=itinerary_id)
+    child_id, edge_id = uuid4(), uuid4()
+    # Block lookup, board version bump, then the edges the delete will cascade to.
+    db = _QueuedDb(container, None, [edge_id])
+    monkeypatch.setattr(block_service, "_subtree_block_ids", lambda _db, _id: [container.id, child_id])
+
+    assert block_service.delete_block(db, container.id) is True
+
+    tombstones = next(params for stmt, params in db.statements if params is not None)
+    assert [(row["entity_type"], row["entity_id"], row["board_version"]) for row in tombstones] == [
+        ("block", container.id, 7),
+        ("block", child_id, 7),
+        ("edge", edge_id, 7),
+    ]
+    assert db.deleted is container
+    assert db.committed is True
+
+
+
+def _block_row(block_id, parent_id=None, **overrides):
+    values = {
+        "id": block_id,
+        "itinerary_id": uuid4(),
+        "parent_block_id": parent_id,
+        "sort_order": 1,
+        "day_index": 1,
+        "lane_key": "core",
+        "start_minute": None,
+        "end_minute": None,
+        "block_type": "scenic",
+        "title": "西湖",
+        "duration_minutes": 90,
+        "cost": 12.5,
+        "tips": None,
+        "address": None,
+        "photos": ["a.jpg"],
+        "type_data": {"ticket": True},
+        "is_container": parent_id is None,
+        "source_template_id": None,
+        "status": "draft",
+        "priority": "medium",
+        "risk_level": "low",
+        "assignee_user_id": None,
+        "tags": None,
+        "ui_meta": None,
+        "created_at": datetime(2026, 3, 1, 8, 30, tzinfo=UTC),
+        "updated_at": datetime(2026, 3, 1, 8, 30, 0, 250000, tzinfo=UTC),
+    }
+    values.update(overrides)
+    return block_service.BlockRow(**values)
+
+
+def test_build_block_tree_nests_in_query_order_without_sorting():
+    root_a, root_b, child_1, child_2 = uuid4(), uuid4(), uuid4(), uuid4()
+    rows = [
+        _block_row(root_b, sort_order=1),
+        _block_row(child_2, root_a, sort_order=1),
+        _block_row(root_a, sort_order=2),
+        _block_row(child_1, root_a, sort_order=2),
+        _block_row(uuid4(), uuid4(), title="orphan"),
+    ]
+
+    tree = block_service._build_block_tree(rows)
+
+    assert [row.id for row in tree] == [root_b, root_a, rows[4].id]
+    assert [row.id for row in tree[1].children] == [child_2, child_1]
+
+
+def test_query_block_rows_orders_like_the_legacy_sort():
+    db = _QueuedDb([])
+
+    block_service._query_block_rows(db, uuid4(), since=4)
+
+    sql = str(db.statements[0][0].compile(dialect=postgresql.dialect()))
+    assert "CAST(itinerary_blocks.cost AS FLOAT) AS cost" in sql
+    assert "itinerary_blocks.board_version > " in sql
+    assert sql.endswith(
+        'ORDER BY itinerary_blocks.day_index, itinerary_blocks.lane_key COLLATE "C", '
+        "itinerary_blocks.sort_order, itinerary_blocks.id"
+    )
+
+
+def test_block_rows_serialize_like_the_response_model():
+    root_id = uuid4()
+    root = _block_row(root_id, cost=None, tags=["湖"], assignee_user_id=uuid4())
+    root.children.append(_block_row(uuid4(), root_id, cost=float(Decimal("19.90"))))
+
+    encoded = orjson.dumps({"items": [root]}, option=orjson.OPT_UTC_Z)
+
+    assert encoded == BlockTreeResponse.model_validate(
+        {"items": [root]}, from_attributes=True
+    ).model_dump_json().encode()
+
+
+def test_create_dependency_checks_the_cached_graph_and_caches_the_next_version(monkeypatch):
+    itinerary_id = uuid4()
+    a, b, c = uuid4(), uuid4(), uuid4()
+    node = block_node(1, None, None, 30)
+    cached = DependencyGraph({a: node, b: node, c: node}, [(a, b), (b, c)])
+    monkeypatch.setattr(block_service, "_dependency_graph_cache", block_service.TTLCache(60))
+    block_service._dependency_graph_cache.set(itinerary_id, (6, cached))
+    monkeypatch.setattr(block_service, "_load_dependency_graph", pytest.fail)
+
+    def _blocks(source, target):
+        return _QueuedDb(
+            SimpleNamespace(id=source, itinerary_id=itinerary_id),
+            SimpleNamespace(id=target, itinerary_id=itinerary_id),
+        )
+
+    with pytest.raises(ValueError, match="cycle"):
+        block_service.create_dependency(
+            _blocks(c, a), itinerary_id, c, BlockDependencyCreate(to_block_id=a)
+        )
+
+    db = _blocks(a, c)
+    block_service.create_dependency(db, itinerary_id, a, BlockDependencyCreate(to_block_id=c))
+
+    assert db.added.board_version == 7
+    version, graph = block_service._dependency_graph_cache.get(itinerary_id)
+    assert version == 7 and graph.has_edge(a, c)
+    assert not cached.has_edge(a, c)
+
+
+def test_dependency_schedule_reloads_after_the_board_version_moves(monkeypatch):
+    itinerary_id = uuid4()
+    block_id = uuid4()
+    loads = []
+    versions = iter([3, 3, 4])
+
+    def _load(_db, _id):
+        loads.append(_id)
+        return DependencyGraph({block_id: block_node(2, 60, None, 30)}, [])
+
+    monkeypatch.setattr(block_service, "_dependency_graph_cache", block_service.TTLCache(60))
+    monkeypatch.setattr(block_service, "_load_dependency_graph", _load)
+    monkeypatch.setattr(block_service, "get_board_version", lambda _db, _id: next(versions))
+
+    for _ in range(3):
+        schedule = block_service.get_dependency_schedule(object(), itinerary_id)
+
+    assert len(loads) == 2
+    assert schedule["version"] == 4
+    assert schedule["items"] == [
+        {
+            "block_id": block_id,
+            "earliest_start_minute": 1500,
+            "earliest_finish_minute": 1530,
+            "critical": True,
+        }
+    ]
+    assert schedule["critical_path"] == [block_id]
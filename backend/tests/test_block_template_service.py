@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import block_template_service
+from app.services.block_service import _BLOCK_ROW_COLUMNS
+
+
+class _ReturnedRow(tuple):
+    @property
+    def id(self):
+        return self[0]
+
+
+def _returned_rows(stmt):
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    count = sum(1 for key in params if key.startswith("title"))
+
+    def value(name, index):
+        return params.get(f"{name}_m{index}", params.get(name) if index == 0 else None)
+
+    return [
+        _ReturnedRow(value(column.name, index) for column in _BLOCK_ROW_COLUMNS)
+        for index in range(count)
+    ]
+
+
+class _ForkDb:
+    def __init__(self, template):
+        self.template = template
+        self.statements = []
+        self.committed = False
+
+    def get(self, _model, _key):
+        return self.template
+
+    def execute(self, stmt, _params=None):
+        self.statements.append(stmt)
+        if stmt.is_insert and stmt.table.name == "itinerary_blocks":
+            # Postgres does not promise RETURNING order for multi-row inserts.
+            return SimpleNamespace(all=lambda: list(reversed(_returned_rows(stmt))))
+        return SimpleNamespace(scalar_one=lambda: 4)
+
+    def flush(self):
+        return None
+
+    def commit(self):
+        self.committed = True
+
+
+def test_fork_group_template_inserts_container_and_children_in_one_statement():
+    template = SimpleNamespace(
+        is_group=True,
+        block_type="group",
+        title="Old Town Walk",
+        content_snapshot={"theme": "walk"},
+        children_snapshot=[
+            {"block_type": "scenic", "title": f"Stop {index}", "duration_minutes": 30}
+            for index in range(30)
+        ],
+    )
+    db = _ForkDb(template)
+    itinerary_id = uuid4()
+
+    created = block_template_service.fork_template_to_blocks(
+        db, uuid4(), itinerary_id, day_index=2, sort_order=3, lane_key="core", parent_block_id=None
+    )
+
+    block_inserts = [
+        stmt for stmt in db.statements if stmt.is_insert and stmt.table.name == "itinerary_blocks"
+    ]
+    assert len(block_inserts) == 1
+    container, *children = created
+    assert container.is_container is True and container.type_data == {"theme": "walk"}
+    assert (container.block_type, container.sort_order, container.day_index) == ("scenic", 3, 2)
+    assert [child.title for child in children] == [f"Stop {index}" for index in range(30)]
+    assert {child.parent_block_id for child in children} == {container.id}
+    params = block_inserts[0].compile(dialect=postgresql.dialect()).params
+    assert {value for key, value in params.items() if key.startswith("board_version")} == {4}
+    assert db.committed is True
+
+
+def test_fork_increments_fork_count_in_sql_as_the_last_write():
+    template = SimpleNamespace(
+        is_group=False,
+        block_type="dining",
+        title="Noodles",
+        content_snapshot={"cost": 18},
+        children_snapshot=None,
+    )
+    db = _ForkDb(template)
+
+    created = block_template_service.fork_template_to_blocks(
+        db, uuid4(), uuid4(), day_index=1, sort_order=1, lane_key="dining", parent_block_id=None
+    )
+
+    assert [block.title for block in created] == ["Noodles"]
+    sql = str(db.statements[-1].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE block_templates SET fork_count=(block_templates.fork_count + ")
@@ -154,6 +154,31 @@ def test_submit_bounty_task_api_returns_service_result(client, monkeypatch):
     assert response.json()["submission"]["id"] == str(submission_id)
 
 
+def test_submit_bounty_task_api_accepts_a_direct_upload_key(client, monkeypatch):
+    task_id = uuid4()
+    received = {}
+    expected = BountySubmitResponse(
+        task=_sample_task_item(task_id),
+        submission=_sample_submission_item(uuid4(), task_id),
+        auto_approved=False,
+    )
+
+    async def _fake_submit_bounty_task(**kwargs):
+        received.update(kwargs)
+        return expected
+
+    monkeypatch.setattr(bounties_api, "submit_bounty_task", _fake_submit_bounty_task)
+
+    response = client.post(
+        f"/api/v1/bounties/{task_id}/submit",
+        data={"submit_longitude": "104.1", "submit_latitude": "30.6", "photo_storage_key": "ab/cd.jpg"},
+    )
+
+    assert response.status_code == 200
+    assert received["photo"] is None
+    assert received["photo_storage_key"] == "ab/cd.jpg"
+
+
 def test_list_my_bounty_submissions_api_returns_service_result(client, monkeypatch):
     task_id = uuid4()
     submission_id = uuid4()
@@ -1,6 +1,13 @@
 from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
 
 from app.services import bounty_service
+from app.services.geo_index import GridIndex
 
 
 def test_haversine_distance_meters_returns_zero_for_same_point():
@@ -57,3 +64,156 @@ def test_evaluate_risk_returns_normal_when_all_checks_pass(monkeypatch):
     )
     assert risk == "normal"
     assert reasons == []
+
+
+class _NearbyDb:
+    def __init__(self, dialect, *, scalar_results=(), execute_results=()):
+        self._dialect = dialect
+        self.scalar_results = list(scalar_results)
+        self.execute_results = list(execute_results)
+        self.statements = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name=self._dialect))
+
+    def scalar(self, stmt):
+        self.statements.append(stmt)
+        return self.scalar_results.pop(0)
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(all=lambda rows=self.execute_results.pop(0): rows)
+
+
+def test_grid_index_returns_points_within_radius_nearest_first():
+    index = GridIndex(cell_size_deg=0.01)
+    index.insert("far", 104.2, 30.67)
+    index.insert("near", 104.0715, 30.67)
+    index.insert("nearer", 104.0711, 30.67)
+    index.insert("neighbour_cell", 104.079, 30.672)
+
+    matches = index.within(104.071, 30.67, 1000)
+
+    assert [key for key, _ in matches] == ["nearer", "near", "neighbour_cell"]
+    assert matches[0][1] < matches[1][1] < 1000
+
+
+def test_nearby_scope_uses_dwithin_and_knn_order_on_postgis(monkeypatch):
+    monkeypatch.setattr(bounty_service.settings, "bounty_nearby_radius_meters", 1500)
+    task = SimpleNamespace(id=uuid4())
+    db = _NearbyDb("postgresql", scalar_results=[3], execute_results=[[(task, "POI A", None, 12.5)]])
+
+    total, rows = bounty_service._list_nearby_open_tasks(db, longitude=104.07, latitude=30.67, offset=0, limit=2)
+
+    assert total == 3
+    assert rows == [(task, "POI A", None, 12.5)]
+    sql = str(db.statements[1].compile(dialect=postgresql.dialect()))
+    assert "ST_DWithin(CAST(pois.geom AS GEOGRAPHY)" in sql
+    assert "ORDER BY CAST(pois.geom AS GEOGRAPHY) <-> CAST(ST_SetSRID(ST_MakePoint(" in sql
+    assert "LIMIT" in sql and "OFFSET" in sql
+
+
+def test_nearby_scope_skips_page_query_past_total():
+    db = _NearbyDb("postgresql", scalar_results=[2])
+
+    assert bounty_service._list_nearby_open_tasks(db, longitude=104.07, latitude=30.67, offset=2, limit=2) == (2, [])
+    assert len(db.statements) == 1
+
+
+def test_nearby_scope_falls_back_to_grid_index_without_postgis(monkeypatch):
+    monkeypatch.setattr(bounty_service.settings, "bounty_nearby_radius_meters", 1500)
+    near = SimpleNamespace(id=uuid4())
+    nearer = SimpleNamespace(id=uuid4())
+    far = SimpleNamespace(id=uuid4())
+    db = _NearbyDb(
+        "sqlite",
+        execute_results=[
+            [
+                (near, "Near", None, "POINT(104.08 30.67)"),
+                (far, "Far", None, "POINT(105 30.67)"),
+                (nearer, "Nearer", "Region", "POINT(104.071 30.67)"),
+            ]
+        ],
+    )
+
+    total, rows = bounty_service._list_nearby_open_tasks(db, longitude=104.07, latitude=30.67, offset=0, limit=1)
+
+    assert total == 2
+    assert [(task, name, territory) for task, name, territory, _ in rows] == [(nearer, "Nearer", "Region")]
+    assert 90 <= rows[0][3] <= 100
+
+
+def test_mine_scope_filters_and_pages_in_sql_with_keyset_cursor():
+    user = SimpleNamespace(id=uuid4())
+    generated_at = datetime(2026, 3, 1, tzinfo=UTC)
+    tasks = [
+        SimpleNamespace(
+            id=uuid4(),
+            poi_id=uuid4(),
+            territory_id=None,
+            status="claimed",
+            reward_points=20,
+            stale_days_snapshot=45,
+            generated_at=generated_at - timedelta(hours=index),
+            expires_at=None,
+            claimed_by_user_id=user.id,
+            claimed_at=generated_at,
+        )
+        for index in range(3)
+    ]
+    db = _NearbyDb("postgresql", scalar_results=[5], execute_results=[[(task, "POI", None) for task in tasks]])
+    cursor = bounty_service._encode_task_cursor(SimpleNamespace(generated_at=generated_at, id=uuid4()))
+
+    result = bounty_service.list_bounty_tasks(
+        db, user, scope="mine", offset=0, limit=2, longitude=None, latitude=None, cursor=cursor
+    )
+
+    assert result.total == 5
+    assert [item.id for item in result.items] == [tasks[0].id, tasks[1].id]
+    assert bounty_service._decode_task_cursor(result.next_cursor) == (tasks[1].generated_at, tasks[1].id)
+    count_sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "JOIN" not in count_sql and "claimed_by_user_id" in count_sql
+    page_sql = str(db.statements[1].compile(dialect=postgresql.dialect()))
+    assert "(bounty_tasks.generated_at, bounty_tasks.id) < (" in page_sql
+    assert "OFFSET" not in page_sql
+    assert db.statements[1]._limit == 3
+
+
+def test_decode_task_cursor_rejects_garbage():
+    with pytest.raises(HTTPException) as exc:
+        bounty_service._decode_task_cursor("not-a-cursor")
+
+    assert exc.value.status_code == 400
+
+
+def test_generate_stale_bounty_tasks_inserts_only_newly_stale_pois(monkeypatch):
+    monkeypatch.setattr(bounty_service.settings, "bounty_stale_days", 30)
+    previous_cutoff = datetime(2026, 1, 1, tzinfo=UTC)
+    watermarks = []
+    monkeypatch.setattr(bounty_service, "get_job_watermark", lambda _db, _name: previous_cutoff)
+    monkeypatch.setattr(
+        bounty_service,
+        "set_job_watermark",
+        lambda _db, name, last_run_at: watermarks.append((name, last_run_at)),
+    )
+    executed = []
+    db = SimpleNamespace(
+        execute=lambda stmt: executed.append(stmt) or SimpleNamespace(rowcount=4),
+        commit=lambda: executed.append("commit"),
+    )
+
+    generated = bounty_service.generate_stale_bounty_tasks(db)
+
+    assert generated == 4
+    assert executed[-1] == "commit"
+    sql = str(executed[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO bounty_tasks (id, poi_id, territory_id, status")
+    assert "SELECT gen_random_uuid()" in sql
+    assert "WHERE pois.updated_at < %(updated_at_1)s" in sql
+    assert "AND pois.updated_at >= %(updated_at_2)s" in sql
+    assert "ON CONFLICT (poi_id) WHERE status IN" in sql
+    assert sql.rstrip().endswith("DO NOTHING")
+    assert executed[0].compile().params["updated_at_2"] == previous_cutoff
+    [(name, cutoff)] = watermarks
+    assert name == bounty_service.STALE_BOUNTY_JOB
+    assert timedelta(days=30) <= datetime.now(UTC) - cutoff < timedelta(days=31)
@@ -0,0 +1,89 @@
+from pycrdt import Doc, Map, Text
+
+from app.services.collab_document import (
+    compact_document_state,
+    merge_document_updates,
+    should_compact,
+)
+
+
+def _doc_with_map() -> tuple[Doc, Map]:
+    doc = Doc()
+    doc["items"] = items = Map()
+    return doc, items
+
+
+def test_merge_document_updates_keeps_concurrent_edits():
+    doc_a, items_a = _doc_with_map()
+    items_a["title"] = "Beijing"
+    base = doc_a.get_update()
+    doc_b = Doc()
+    doc_b.apply_update(base)
+    doc_b.get("items", type=Map)["days"] = 3
+    items_a["title"] = "Shanghai"
+
+    merged = merge_document_updates(base, [doc_b.get_update(), doc_a.get_update()])
+
+    joined = Doc()
+    joined.apply_update(merged)
+    assert dict(joined.get("items", type=Map)) == {"title": "Shanghai", "days": 3.0}
+
+
+def test_merge_document_updates_skips_undecodable_update():
+    doc, items = _doc_with_map()
+    items["title"] = "Beijing"
+    update = doc.get_update()
+
+    merged = merge_document_updates(None, [b"garbage", update])
+
+    joined = Doc()
+    joined.apply_update(merged)
+    assert dict(joined.get("items", type=Map)) == {"title": "Beijing"}
+
+
+def test_merge_document_updates_without_updates_returns_base():
+    assert merge_document_updates(None, []) is None
+    assert merge_document_updates(b"state", []) == b"state"
+
+
+def test_compact_document_state_drops_overwritten_content():
+    doc, items = _doc_with_map()
+    incremental_updates: list[bytes] = []
+    doc.observe(lambda event: incremental_updates.append(event.update))
+    for index in range(50):
+        items["note"] = f"draft {index} " * 20
+    history = merge_document_updates(None, incremental_updates)
+
+    compacted = compact_document_state(history)
+
+    joined = Doc()
+    joined.apply_update(compacted)
+    assert joined.get("items", type=Map)["note"] == "draft 49 " * 20
+    assert len(compacted) < len(history)
+
+
+def test_compact_document_state_keeps_updates_waiting_for_earlier_ones():
+    doc = Doc()
+    doc["text"] = text = Text()
+    incremental_updates: list[bytes] = []
+    doc.observe(lambda event: incremental_updates.append(event.update))
+    text += "hello"
+    text += " world"
+    text += "!"
+    del text[0:2]
+    first, *rest = incremental_updates
+    out_of_order = merge_document_updates(None, rest)
+
+    compacted = compact_document_state(out_of_order)
+
+    assert compacted == out_of_order
+    joined = Doc()
+    joined.apply_update(compacted)
+    joined.apply_update(first)
+    assert str(joined.get("text", type=Text)) == "llo world!"
+
+
+def test_should_compact_on_interval_boundary():
+    assert should_compact(199, 201, 200) is True
+    assert should_compact(201, 250, 200) is False
+    assert should_compact(10, 500, 0) is False
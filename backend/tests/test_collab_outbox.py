@@ -0,0 +1,161 @@
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+from app.core.metrics import LatencyHistogram
+from app.services.collab_outbox import SLOW_CONSUMER_CLOSE_CODE, ConnectionOutbox
+from app.services.collab_runtime import CollabRuntime, RuntimeConnection, _merge_presence_diffs
+
+
+class _FakeWebSocket:
+    def __init__(self, *, gate: asyncio.Event | None = None):
+        self.sent: list[str] = []
+        self.close_codes: list[int] = []
+        self._gate = gate
+
+    async def send_text(self, text: str) -> None:
+        if self._gate is not None:
+            await self._gate.wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_codes.append(code)
+
+
+async def _drain() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def test_outbox_coalesces_presence_while_client_is_busy():
+    async def scenario():
+        gate = asyncio.Event()
+        websocket = _FakeWebSocket(gate=gate)
+        counters: dict[str, int] = {}
+        outbox = ConnectionOutbox(websocket, max_size=8, send_timeout_seconds=5, counters=counters)
+        outbox.start()
+        outbox.put("update-1")
+        await _drain()
+        for index in range(5):
+            outbox.put(f"presence-{index}", coalesce_key="presence")
+        outbox.put("update-2")
+        gate.set()
+        await _drain()
+        await outbox.stop()
+        return websocket.sent, counters
+
+    sent, counters = asyncio.run(scenario())
+
+    assert sent == ["update-1", "presence-4", "update-2"]
+    assert counters == {"coalesced_messages": 4}
+
+
+def test_outbox_drops_oldest_coalescible_message_when_full():
+    outbox = ConnectionOutbox(_FakeWebSocket(), max_size=2, send_timeout_seconds=5)
+
+    assert outbox.put("presence", coalesce_key="presence")
+    assert outbox.put("update-1")
+    assert outbox.put("update-2")
+
+    assert [message.text for message in outbox._queue] == ["update-1", "update-2"]
+    assert outbox._counters == {"dropped_messages": 1}
+
+
+def test_outbox_merges_queued_presence_diffs_per_session():
+    outbox = ConnectionOutbox(_FakeWebSocket(), max_size=2, send_timeout_seconds=5)
+
+    def diff(*participants):
+        return json.dumps({"type": "collab:presence_diff", "participants": list(participants)})
+
+    for text in (
+        diff({"session_id": "a", "cursor": 1}, {"session_id": "b", "cursor": 1}),
+        diff({"session_id": "a", "cursor": 2}),
+        diff({"session_id": "c", "cursor": 1}),
+    ):
+        assert outbox.put(text, coalesce_key="presence_diff", merge=_merge_presence_diffs)
+    # Diffs are droppable, so a burst of cursor traffic never closes the connection.
+    assert outbox.put("update-1")
+    assert outbox.put("update-2")
+
+    assert outbox.closed is False
+    assert [message.text for message in outbox._queue] == ["update-1", "update-2"]
+
+
+def test_merge_presence_diffs_keeps_latest_entry_per_session():
+    merged = json.loads(
+        _merge_presence_diffs(
+            json.dumps({"participants": [{"session_id": "a", "cursor": 1}, {"session_id": "b"}]}),
+            json.dumps({"participants": [{"session_id": "a", "cursor": 2}, {"session_id": "c"}]}),
+        )
+    )
+
+    assert merged == {
+        "type": "collab:presence_diff",
+        "participants": [{"session_id": "a", "cursor": 2}, {"session_id": "b"}, {"session_id": "c"}],
+    }
+
+
+def test_outbox_closes_slow_consumer_instead_of_dropping_updates():
+    async def scenario():
+        websocket = _FakeWebSocket(gate=asyncio.Event())
+        outbox = ConnectionOutbox(websocket, max_size=1, send_timeout_seconds=5)
+        outbox.start()
+        outbox.put("update-1")
+        await _drain()
+        outbox.put("update-2")
+        accepted = outbox.put("update-3")
+        await _drain()
+        return accepted, outbox.closed, websocket.close_codes
+
+    accepted, closed, close_codes = asyncio.run(scenario())
+
+    assert accepted is False
+    assert closed is True
+    assert close_codes == [SLOW_CONSUMER_CLOSE_CODE]
+
+
+def test_broadcast_serializes_once_and_skips_sender():
+    runtime = CollabRuntime()
+    itinerary_id = uuid.uuid4()
+    queued: dict[str, list[tuple[str, str | None]]] = {}
+
+    def _conn(connection_id: str) -> RuntimeConnection:
+        outbox = SimpleNamespace(
+            put=lambda text, coalesce_key=None, merge=None: queued.setdefault(connection_id, []).append(
+                (text, coalesce_key)
+            )
+        )
+        return RuntimeConnection(
+            connection_id=connection_id,
+            session_id=uuid.uuid4(),
+            itinerary_id=itinerary_id,
+            websocket=None,
+            identity=None,
+            outbox=outbox,
+        )
+
+    runtime._connections[itinerary_id] = {name: _conn(name) for name in ("a", "b", "c")}
+
+    asyncio.run(
+        runtime._broadcast(itinerary_id, {"type": "collab:update", "update_b64": "AA=="}, exclude_connection_id="a")
+    )
+
+    assert set(queued) == {"b", "c"}
+    assert queued["b"][0][0] is queued["c"][0][0]
+    assert json.loads(queued["b"][0][0]) == {"type": "collab:update", "update_b64": "AA=="}
+
+
+def test_latency_histogram_reports_bucketed_quantiles():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.observe(0.003)
+    histogram.observe(0.2)
+    histogram.observe(0.8)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 100
+    assert snapshot["p50_ms"] == 5.0
+    assert snapshot["p99_ms"] == 250.0
+    assert snapshot["max_ms"] == 800.0
@@ -0,0 +1,363 @@
+import asyncio
+import base64
+import contextlib
+import json
+import uuid
+from types import SimpleNamespace
+
+import fakeredis
+from pycrdt import Doc, Map
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import get_settings
+from app.models.itinerary_collab import ItineraryCollabDocument, ItineraryCollabEventLog
+from app.services import collab_runtime
+from app.services.collab_bus import decode_envelope, room_channel
+from app.services.collab_runtime import CollabRuntime, RuntimeConnection
+
+
+class _FakeDb:
+    def __init__(self, doc_row=None):
+        self.doc_row = doc_row
+        self.added = []
+        self.unlocked_reads = 0
+        self.inserts = []
+
+    def get(self, _model, _key, *, with_for_update=False):
+        if not with_for_update:
+            self.unlocked_reads += 1
+        return self.doc_row
+
+    def execute(self, stmt):
+        # Stands in for INSERT ... ON CONFLICT DO NOTHING on the document row.
+        self.inserts.append(str(stmt.compile(dialect=postgresql.dialect())))
+        if self.doc_row is None:
+            itinerary_id = stmt.compile(dialect=postgresql.dialect()).params["itinerary_id"]
+            self.doc_row = ItineraryCollabDocument(
+                itinerary_id=itinerary_id, state_update=None, update_count=0
+            )
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def flush(self):
+        return None
+
+
+def _queued(update: bytes, **extra) -> bytes:
+    payload = {
+        "update_b64": base64.b64encode(update).decode("ascii"),
+        "participant_type": "user",
+        "actor_user_id": str(uuid.uuid4()),
+        "meta": {"origin": "local"},
+        **extra,
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def _title_update(title: str) -> bytes:
+    doc = Doc()
+    doc["items"] = items = Map()
+    items["title"] = title
+    return doc.get_update()
+
+
+def test_apply_room_items_counts_dropped_and_duplicate_updates():
+    runtime = CollabRuntime()
+    db = _FakeDb()
+    update = _title_update("Beijing")
+    item = _queued(update)
+
+    runtime._apply_room_items(
+        db,
+        uuid.uuid4(),
+        [item, item, b"{not json", json.dumps({"update_b64": "%%%"}).encode("utf-8")],
+    )
+
+    metrics = runtime.metrics()
+    assert metrics["flushed_updates"] == 1
+    assert metrics["duplicate_updates"] == 1
+    assert metrics["dropped_updates"] == 2
+    assert db.unlocked_reads == 0
+    assert len(db.inserts) == 1 and "ON CONFLICT (itinerary_id) DO NOTHING" in db.inserts[0]
+    assert db.doc_row.update_count == 1
+    joined = Doc()
+    joined.apply_update(db.doc_row.state_update)
+    assert dict(joined.get("items", type=Map)) == {"title": "Beijing"}
+    event_logs = [obj for obj in db.added if isinstance(obj, ItineraryCollabEventLog)]
+    assert len(event_logs) == 1
+    assert event_logs[0].payload["updates"] == 1
+
+
+def test_write_direct_update_merges_into_the_locked_existing_row():
+    runtime = CollabRuntime()
+    itinerary_id = uuid.uuid4()
+    existing = ItineraryCollabDocument(
+        itinerary_id=itinerary_id, state_update=_title_update("Beijing"), update_count=1
+    )
+    db = _FakeDb(existing)
+    conn = SimpleNamespace(
+        itinerary_id=itinerary_id,
+        connection_id="c1",
+        identity=SimpleNamespace(participant_type="user", actor_user_id=None, guest_name=None),
+    )
+
+    runtime._write_direct_update(db, conn, _title_update("Shanghai"), "local", {"skip_history": True})
+
+    assert db.unlocked_reads == 0 and db.inserts == []
+    assert db.doc_row is existing and existing.update_count == 2
+
+
+def test_apply_room_items_skips_document_when_nothing_decodes():
+    runtime = CollabRuntime()
+    db = _FakeDb()
+
+    runtime._apply_room_items(db, uuid.uuid4(), [b"[]", b"\xff"])
+
+    assert db.doc_row is None
+    assert db.added == []
+    assert runtime.metrics()["dropped_updates"] == 2
+
+
+class _FakeBus:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, itinerary_id, kind, body):
+        self.published.append((itinerary_id, kind, body))
+
+
+class _RecordingOutbox:
+    def __init__(self):
+        self.texts = []
+
+    def put(self, text, coalesce_key=None, merge=None):
+        self.texts.append(text)
+        return True
+
+
+def _runtime_with_local_room(itinerary_id):
+    runtime = CollabRuntime()
+    runtime._bus = _FakeBus()
+    conn = RuntimeConnection(
+        connection_id="local",
+        session_id=uuid.uuid4(),
+        itinerary_id=itinerary_id,
+        websocket=None,
+        identity=SimpleNamespace(
+            participant_type="user",
+            actor_user_id=None,
+            display_name="Local",
+            permission="edit",
+        ),
+        outbox=_RecordingOutbox(),
+    )
+    runtime._connections[itinerary_id] = {"local": conn}
+    return runtime, conn
+
+
+def test_bus_presence_merges_remote_roster_and_answers_new_node():
+    itinerary_id = uuid.uuid4()
+    runtime, conn = _runtime_with_local_room(itinerary_id)
+    remote = {"session_id": "remote", "display_name": "Remote", "joined_at": "2000-01-01T00:00:00Z"}
+
+    asyncio.run(
+        runtime._handle_bus_message(itinerary_id, {"node": "node-b", "kind": "presence", "participants": [remote]})
+    )
+    asyncio.run(
+        runtime._handle_bus_message(itinerary_id, {"node": "node-b", "kind": "presence", "participants": [remote]})
+    )
+
+    presence = json.loads(conn.outbox.texts[-1])
+    assert [item["session_id"] for item in presence["participants"]] == ["remote", "local"]
+    assert [kind for _, kind, _ in runtime._bus.published] == ["presence"]
+    assert runtime._bus.published[0][2]["participants"][0]["session_id"] == "local"
+
+    asyncio.run(runtime._handle_bus_message(itinerary_id, {"node": "node-b", "kind": "presence", "participants": []}))
+
+    presence = json.loads(conn.outbox.texts[-1])
+    assert [item["session_id"] for item in presence["participants"]] == ["local"]
+
+
+def test_bus_update_is_relayed_verbatim_to_local_connections():
+    itinerary_id = uuid.uuid4()
+    runtime, conn = _runtime_with_local_room(itinerary_id)
+
+    asyncio.run(runtime._handle_bus_message(itinerary_id, {"node": "node-b", "kind": "update", "text": '{"type":"collab:update"}'}))
+    asyncio.run(runtime._handle_bus_message(uuid.uuid4(), {"node": "node-b", "kind": "update", "text": "other room"}))
+
+    assert conn.outbox.texts == ['{"type":"collab:update"}']
+    assert runtime._bus.published == []
+
+
+def test_decode_envelope_skips_own_node_and_foreign_channels():
+    itinerary_id = uuid.uuid4()
+    data = json.dumps({"node": "node-a", "kind": "update", "text": "x"}).encode("utf-8")
+
+    assert decode_envelope(room_channel(itinerary_id).encode("utf-8"), data, "node-b") == (
+        itinerary_id,
+        {"node": "node-a", "kind": "update", "text": "x"},
+    )
+    assert decode_envelope(room_channel(itinerary_id), data, "node-a") is None
+    assert decode_envelope(b"other:channel", data, "node-b") is None
+
+
+def test_cursor_moves_are_batched_into_one_diff_per_tick():
+    itinerary_id = uuid.uuid4()
+    runtime, conn = _runtime_with_local_room(itinerary_id)
+    other = RuntimeConnection(
+        connection_id="other",
+        session_id=uuid.uuid4(),
+        itinerary_id=itinerary_id,
+        websocket=None,
+        identity=conn.identity,
+        outbox=_RecordingOutbox(),
+    )
+    runtime._connections[itinerary_id]["other"] = other
+    roster = runtime._participants(itinerary_id)
+
+    for index in range(3):
+        asyncio.run(runtime.broadcast_cursor(conn, {"clientId": "local", "index": index}))
+
+    assert other.outbox.texts == []
+    assert runtime._participants(itinerary_id) is not roster
+
+    asyncio.run(runtime._flush_presence_diffs())
+    asyncio.run(runtime._flush_presence_diffs())
+
+    assert len(other.outbox.texts) == 1
+    diff = json.loads(other.outbox.texts[0])
+    assert diff["type"] == "collab:presence_diff"
+    assert [(item["session_id"], item["cursor"]["index"]) for item in diff["participants"]] == [("local", 2)]
+    assert [kind for _, kind, _ in runtime._bus.published] == ["presence_diff"]
+    assert runtime._participants(itinerary_id) is runtime._participants(itinerary_id)
+
+
+def _redis_runtime():
+    runtime = CollabRuntime()
+    runtime._redis = fakeredis.FakeAsyncRedis()
+    runtime._drain_script = runtime._redis.register_script(collab_runtime._DRAIN_ROOM_SCRIPT)
+    runtime._quarantine_script = runtime._redis.register_script(
+        collab_runtime._QUARANTINE_ROOM_SCRIPT
+    )
+    return runtime
+
+
+def _drain(runtime, itinerary_id, node_id):
+    return runtime._drain_script(
+        keys=[
+            f"{collab_runtime._PENDING_LIST_PREFIX}{itinerary_id}",
+            f"{collab_runtime._PROCESSING_LIST_PREFIX}{itinerary_id}",
+            collab_runtime._PENDING_ROOMS_KEY,
+            f"{collab_runtime._FLUSH_LEASE_PREFIX}{itinerary_id}",
+        ],
+        args=[str(itinerary_id), node_id, 30000],
+    )
+
+
+def test_drain_script_appends_to_leftover_processing_list_and_respects_lease():
+    runtime = _redis_runtime()
+    client = runtime._redis
+    itinerary_id = uuid.uuid4()
+    pending = f"{collab_runtime._PENDING_LIST_PREFIX}{itinerary_id}"
+    processing = f"{collab_runtime._PROCESSING_LIST_PREFIX}{itinerary_id}"
+
+    async def scenario():
+        await client.rpush(processing, b"left-over")
+        await client.rpush(pending, b"one", b"two")
+        await client.sadd(collab_runtime._PENDING_ROOMS_KEY, str(itinerary_id))
+        drained = await _drain(runtime, itinerary_id, "node-a")
+        await client.rpush(pending, b"three")
+        refused = await _drain(runtime, itinerary_id, "node-b")
+        return drained, refused, await client.exists(pending), await client.smembers(
+            collab_runtime._PENDING_ROOMS_KEY
+        )
+
+    drained, refused, pending_exists, rooms = asyncio.run(scenario())
+
+    assert drained == [b"left-over", b"one", b"two"]
+    assert refused is None
+    assert pending_exists == 1
+    assert rooms == set()
+
+
+class _FlushDb(_FakeDb):
+    def __init__(self, poisoned):
+        super().__init__()
+        self.poisoned = poisoned
+
+    def execute(self, stmt):
+        super().execute(stmt)
+        if self.doc_row.itinerary_id in self.poisoned:
+            raise IntegrityError("INSERT", {}, Exception("itinerary is gone"))
+
+
+class _FakeAsyncSession:
+    def __init__(self, poisoned, written):
+        self.poisoned = poisoned
+        self.written = written
+        self.current = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc):
+        return False
+
+    @contextlib.asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def run_sync(self, fn, *args):
+        self.current = _FlushDb(self.poisoned)
+        fn(self.current, *args)
+        self.written.append(self.current.doc_row.itinerary_id)
+
+    async def commit(self):
+        return None
+
+
+def test_flush_rooms_isolates_a_failing_room_and_quarantines_it(monkeypatch):
+    runtime = _redis_runtime()
+    client = runtime._redis
+    healthy, poisoned = uuid.uuid4(), uuid.uuid4()
+    written = []
+    monkeypatch.setattr(
+        collab_runtime, "AsyncSessionLocal", lambda: _FakeAsyncSession({poisoned}, written)
+    )
+    monkeypatch.setattr(get_settings(), "collab_flush_max_failures", 2)
+    poisoned_processing = f"{collab_runtime._PROCESSING_LIST_PREFIX}{poisoned}"
+
+    async def push(itinerary_id, title):
+        pending = f"{collab_runtime._PENDING_LIST_PREFIX}{itinerary_id}"
+        await client.rpush(pending, _queued(_title_update(title)))
+        await client.sadd(collab_runtime._PENDING_ROOMS_KEY, str(itinerary_id))
+
+    async def scenario():
+        await push(healthy, "Beijing")
+        await push(poisoned, "Gone")
+        await runtime._flush_rooms([healthy, poisoned])
+        after_first = (
+            await client.exists(f"{collab_runtime._PROCESSING_LIST_PREFIX}{healthy}"),
+            await client.llen(poisoned_processing),
+            await client.smembers(collab_runtime._PENDING_ROOMS_KEY),
+        )
+        await runtime._flush_rooms([poisoned])
+        after_second = (
+            await client.exists(poisoned_processing),
+            await client.llen(f"{collab_runtime._QUARANTINE_LIST_PREFIX}{poisoned}"),
+            await client.smembers(collab_runtime._PENDING_ROOMS_KEY),
+            await client.smembers(collab_runtime._QUARANTINE_ROOMS_KEY),
+        )
+        return after_first, after_second
+
+    after_first, after_second = asyncio.run(scenario())
+
+    assert written == [healthy]
+    assert after_first == (0, 1, {str(poisoned).encode()})
+    assert after_second == (0, 1, set(), {str(poisoned).encode()})
+    metrics = runtime.metrics()
+    assert metrics["flushed_rooms"] == 1
+    assert metrics["room_flush_failures"] == 2
+    assert metrics["quarantined_rooms"] == 1
@@ -0,0 +1,108 @@
+import os
+import time
+from collections import Counter
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.storage import gc as storage_gc
+from app.services.storage.content_addressed import ContentAddressedStorageProvider
+
+
+def test_save_bytes_deduplicates_identical_content(tmp_path):
+    storage = ContentAddressedStorageProvider(root_dir=str(tmp_path), public_base_url="/uploads/")
+
+    first_key, first_url = storage.save_bytes(content=b"photo", extension=".JPG", content_type="image/jpeg")
+    second_key, _ = storage.save_bytes(content=b"photo", extension="jpg", content_type="image/jpeg")
+    other_key, _ = storage.save_bytes(content=b"other", extension="jpg", content_type="image/jpeg")
+
+    assert first_key == second_key != other_key
+    digest = first_key.rsplit("/", 1)[1].split(".")[0]
+    assert first_key == f"cas/{digest[:2]}/{digest[2:4]}/{digest}.jpg"
+    assert first_url == f"/uploads/{first_key}"
+    assert (tmp_path / first_key).read_bytes() == b"photo"
+    assert sorted(key for key, _ in storage.iter_blobs()) == sorted([first_key, other_key])
+
+
+def test_iter_blobs_skips_in_flight_temp_files(tmp_path):
+    storage = ContentAddressedStorageProvider(root_dir=str(tmp_path), public_base_url="/uploads")
+    key, _ = storage.save_bytes(content=b"photo", extension="png", content_type="image/png")
+    (tmp_path / key).with_name(".tmp-abc").write_bytes(b"partial")
+
+    assert [blob_key for blob_key, _ in storage.iter_blobs()] == [key]
+
+
+def test_collect_orphan_blobs_keeps_referenced_and_recent_blobs(tmp_path, monkeypatch):
+    storage = ContentAddressedStorageProvider(root_dir=str(tmp_path), public_base_url="/uploads")
+    referenced, _ = storage.save_bytes(content=b"kept", extension="jpg", content_type="image/jpeg")
+    orphan, _ = storage.save_bytes(content=b"orphan", extension="jpg", content_type="image/jpeg")
+    recent, _ = storage.save_bytes(content=b"recent", extension="jpg", content_type="image/jpeg")
+    old = time.time() - 7200
+    for key in (referenced, orphan):
+        os.utime(tmp_path / key, (old, old))
+    monkeypatch.setattr(
+        storage_gc, "count_blob_references", lambda _db, _keys=None: Counter({referenced: 2})
+    )
+
+    assert storage_gc.collect_orphan_blobs(None, storage, grace_seconds=3600, dry_run=True) == [orphan]
+    assert (tmp_path / orphan).exists()
+
+    assert storage_gc.collect_orphan_blobs(None, storage, grace_seconds=3600) == [orphan]
+    assert not (tmp_path / orphan).exists()
+    assert (tmp_path / referenced).exists() and (tmp_path / recent).exists()
+
+
+def test_collect_orphan_blobs_spares_candidates_reused_after_listing(tmp_path, monkeypatch):
+    storage = ContentAddressedStorageProvider(root_dir=str(tmp_path), public_base_url="/uploads")
+    touched, _ = storage.save_bytes(content=b"touched", extension="jpg", content_type="image/jpeg")
+    claimed, _ = storage.save_bytes(content=b"claimed", extension="jpg", content_type="image/jpeg")
+    orphan, _ = storage.save_bytes(content=b"orphan", extension="jpg", content_type="image/jpeg")
+    old = time.time() - 7200
+    for key in (touched, claimed, orphan):
+        os.utime(tmp_path / key, (old, old))
+    recounts = []
+
+    def count(_db, keys=None):
+        if keys is None:
+            return Counter()
+        recounts.append(sorted(keys))
+        # Between listing and deletion: the same bytes are uploaded again (refreshing the
+        # mtime) and another upload's row commits.
+        storage.save_bytes(content=b"touched", extension="jpg", content_type="image/jpeg")
+        return Counter({claimed: 1})
+
+    monkeypatch.setattr(storage_gc, "count_blob_references", count)
+
+    assert storage_gc.collect_orphan_blobs(None, storage, grace_seconds=3600) == [orphan]
+    assert recounts == [sorted([touched, claimed, orphan])]
+    assert (tmp_path / touched).exists() and (tmp_path / claimed).exists()
+    assert not (tmp_path / orphan).exists()
+
+
+def test_count_blob_references_limits_to_requested_keys():
+    captured = []
+
+    class _Db:
+        def execute(self, stmt):
+            captured.append(stmt)
+            return type("Result", (), {"all": lambda self: []})()
+
+    storage_gc.count_blob_references(_Db(), ["cas/ab/cd/x.jpg"])
+
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert sql.count("poi_corrections.photo_storage_key IN (__[POSTCOMPILE_") == 1
+    assert sql.count(" IN (__[POSTCOMPILE_") == 4
+
+
+def test_count_blob_references_unions_all_photo_key_columns():
+    captured = []
+
+    class _Db:
+        def execute(self, stmt):
+            captured.append(stmt)
+            return type("Result", (), {"all": lambda self: [("cas/ab/cd/x.jpg", 3)]})()
+
+    assert storage_gc.count_blob_references(_Db()) == Counter({"cas/ab/cd/x.jpg": 3})
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert sql.count("UNION ALL") == 3
+    for column in ("bounty_submissions.photo_thumbnail_storage_key", "poi_corrections.photo_storage_key"):
+        assert column in sql
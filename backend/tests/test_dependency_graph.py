@@ -0,0 +1,95 @@
+import random
+from uuid import uuid4
+
+import pytest
+
+from app.services.dependency_graph import DependencyGraph, block_node
+
+
+def _graph(count, edges=(), **timings):
+    ids = [uuid4() for _ in range(count)]
+    nodes = {
+        block_id: timings.get(f"n{index}", block_node(1, None, None, 0))
+        for index, block_id in enumerate(ids)
+    }
+    return ids, DependencyGraph(nodes, [(ids[a], ids[b]) for a, b in edges])
+
+
+def _assert_topological(graph):
+    rank = {node_id: index for index, node_id in enumerate(graph.order)}
+    for from_id, successors in graph.successors.items():
+        for to_id in successors:
+            assert rank[from_id] < rank[to_id]
+
+
+def test_initial_order_respects_edges_and_keeps_node_order_for_ties():
+    ids, graph = _graph(4, [(3, 0)])
+
+    assert graph.order == [ids[1], ids[2], ids[3], ids[0]]
+
+
+def test_add_edge_reranks_only_to_stay_topological_and_rejects_cycles():
+    ids, graph = _graph(5, [(0, 1), (1, 2)])
+
+    graph.add_edge(ids[4], ids[0])
+    graph.add_edge(ids[2], ids[3])
+
+    _assert_topological(graph)
+    with pytest.raises(ValueError, match="cycle"):
+        graph.add_edge(ids[3], ids[4])
+    assert not graph.has_edge(ids[3], ids[4])
+
+
+def test_incremental_order_matches_brute_force_cycle_checks():
+    rng = random.Random(11)
+    ids, graph = _graph(30)
+    reachable = {node_id: {node_id} for node_id in ids}
+    for _ in range(300):
+        from_id, to_id = rng.sample(ids, 2)
+        creates_cycle = from_id in reachable[to_id]
+        copy = graph.copy()
+        if creates_cycle:
+            with pytest.raises(ValueError):
+                copy.add_edge(from_id, to_id)
+            continue
+        copy.add_edge(from_id, to_id)
+        graph = copy
+        for node_id in ids:
+            if from_id in reachable[node_id]:
+                reachable[node_id] |= reachable[to_id]
+        _assert_topological(graph)
+
+
+def test_schedule_pushes_starts_past_predecessors_and_traces_critical_path():
+    ids, graph = _graph(
+        4,
+        [(0, 1), (2, 1), (1, 3)],
+        n0=block_node(1, 540, None, 120),
+        n1=block_node(1, 600, 690, None),
+        n2=block_node(1, 480, None, 30),
+        n3=block_node(2, None, None, 60),
+    )
+
+    schedule = graph.schedule()
+
+    assert schedule.earliest_start[ids[1]] == 660
+    assert schedule.earliest_finish[ids[1]] == 750
+    # Day 2 starts at minute 1440, after everything on day 1 has finished.
+    assert schedule.earliest_start[ids[3]] == 1440
+    assert schedule.critical_path == [ids[3]]
+    assert schedule.finish_minute == 1500
+
+
+def test_schedule_critical_path_follows_binding_predecessors():
+    ids, graph = _graph(
+        3,
+        [(0, 2), (1, 2)],
+        n0=block_node(1, 540, None, 30),
+        n1=block_node(1, 500, None, 120),
+        n2=block_node(1, 560, None, 15),
+    )
+
+    schedule = graph.schedule()
+
+    assert schedule.critical_path == [ids[1], ids[2]]
+    assert schedule.finish_minute == 635
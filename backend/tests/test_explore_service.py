@@ -5,17 +5,20 @@ from uuid import uuid4
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
 
 from app.services import itinerary_service
 from app.services.itinerary_service import (
     get_public_itinerary,
     get_public_itinerary_share_meta,
     list_explore_heatmap,
+    list_explore_heatmap_grid,
     list_explore_recommendations,
     list_public_items_with_poi,
     list_public_itineraries,
     record_public_itinerary_view,
 )
+from app.services.view_buffer import ItineraryViewBuffer
 
 
 class _RowsResult:
@@ -92,6 +95,60 @@ def test_get_public_itinerary_returns_forked_count(monkeypatch):
     assert result.forked_count == 5
 
 
+class _ForkCountDb:
+    """Keeps itinerary_popularity.forked_count and itinerary_forks the way Postgres would."""
+
+    def __init__(self):
+        self.forks = {}
+        self.forked_counts = {}
+        self.itineraries = {}
+
+    def execute(self, stmt):
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        if stmt.is_insert:
+            source_id = params["itinerary_id"]
+            self.forked_counts[source_id] = self.forked_counts.get(source_id, 0) + 1
+        else:
+            sql = str(
+                stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            )
+            assert "forked_count=greatest(itinerary_popularity.forked_count - 1, 0)" in sql
+            source_id = self.forks.get(params["forked_itinerary_id_1"])
+            if source_id in self.forked_counts:
+                self.forked_counts[source_id] = max(self.forked_counts[source_id] - 1, 0)
+
+    def get(self, _model, itinerary_id):
+        return self.itineraries.get(itinerary_id)
+
+    def delete(self, row):
+        # ON DELETE CASCADE on itinerary_forks.forked_itinerary_id.
+        self.itineraries.pop(row.id)
+        self.forks.pop(row.id, None)
+
+    def commit(self):
+        return None
+
+
+def test_deleting_a_fork_lowers_the_source_forked_count():
+    db = _ForkCountDb()
+    owner = SimpleNamespace(id=uuid4())
+    source_id = uuid4()
+    forks = [SimpleNamespace(id=uuid4(), creator_user_id=owner.id) for _ in range(2)]
+    for fork in forks:
+        db.itineraries[fork.id] = fork
+        db.forks[fork.id] = source_id
+        itinerary_service._bump_itinerary_fork_count(db, source_id)
+    unrelated = SimpleNamespace(id=uuid4(), creator_user_id=owner.id)
+    db.itineraries[unrelated.id] = unrelated
+
+    itinerary_service.delete_itinerary(db, forks[0].id, owner)
+    itinerary_service.delete_itinerary(db, unrelated.id, owner)
+
+    assert db.forked_counts == {source_id: 1}
+    itinerary_service.delete_itinerary(db, forks[1].id, owner)
+    assert db.forked_counts == {source_id: 0}
+
+
 def test_get_public_itinerary_share_meta_returns_share_fields(monkeypatch):
     itinerary = SimpleNamespace(
         id=uuid4(),
@@ -168,27 +225,81 @@ def test_list_public_items_with_poi_returns_items():
 def test_record_public_itinerary_view_returns_visit_log(monkeypatch):
     itinerary = SimpleNamespace(id=uuid4())
     current_user = SimpleNamespace(id=uuid4())
-    now = datetime.now(UTC)
+    view_buffer = ItineraryViewBuffer()
     db = SimpleNamespace()
-    db.execute = lambda _stmt: _RowsResult([(now, 2)])
-    db.commit = lambda: None
+    db.scalar = lambda _stmt: 2
+    monkeypatch.setattr(itinerary_service, "get_itinerary_view_buffer", lambda: view_buffer)
     monkeypatch.setattr(
         itinerary_service,
         "_ensure_public_itinerary",
         lambda _db, _itinerary_id: (itinerary, "alice"),
     )
 
-    result = record_public_itinerary_view(db, itinerary.id, current_user)
+    first = record_public_itinerary_view(db, itinerary.id, current_user)
+    second = record_public_itinerary_view(db, itinerary.id, current_user)
+
+    assert first.itinerary_id == itinerary.id
+    assert first.view_count == 3
+    assert second.view_count == 4
+    assert view_buffer.pending_count(itinerary.id, current_user.id) == 2
+
+
+def test_flush_itinerary_views_batches_pending_views(monkeypatch):
+    itinerary_id = uuid4()
+    viewer_ids = [uuid4(), uuid4()]
+    view_buffer = ItineraryViewBuffer()
+    now = datetime.now(UTC)
+    view_buffer.record(itinerary_id, viewer_ids[0], now)
+    view_buffer.record(itinerary_id, viewer_ids[0], now)
+    view_buffer.record(itinerary_id, viewer_ids[1], now)
+    statements = []
+    db = SimpleNamespace()
+    db.scalars = lambda _stmt: _RowsResult([itinerary_id])
+    db.execute = statements.append
+    db.commit = lambda: None
+    monkeypatch.setattr(itinerary_service, "get_itinerary_view_buffer", lambda: view_buffer)
+
+    flushed = itinerary_service.flush_itinerary_views(db)
+
+    assert flushed == 3
+    assert len(statements) == 2
+    assert len(view_buffer) == 0
 
-    assert result.itinerary_id == itinerary.id
-    assert result.view_count == 2
-    assert result.last_viewed_at == now
+
+def test_flush_itinerary_views_restores_buffer_on_failure(monkeypatch):
+    itinerary_id = uuid4()
+    viewer_id = uuid4()
+    view_buffer = ItineraryViewBuffer()
+    view_buffer.record(itinerary_id, viewer_id, datetime.now(UTC))
+    rolled_back = []
+    db = SimpleNamespace()
+    db.scalars = lambda _stmt: _RowsResult([itinerary_id])
+
+    def _execute(_stmt):
+        raise RuntimeError("database unavailable")
+
+    db.execute = _execute
+    db.rollback = lambda: rolled_back.append(True)
+    monkeypatch.setattr(itinerary_service, "get_itinerary_view_buffer", lambda: view_buffer)
+
+    with pytest.raises(RuntimeError):
+        itinerary_service.flush_itinerary_views(db)
+
+    assert rolled_back == [True]
+    assert view_buffer.pending_count(itinerary_id, viewer_id) == 1
+
+
+@pytest.fixture(autouse=True)
+def _clear_heatmap_cache():
+    itinerary_service._heatmap_cache.clear()
+    yield
+    itinerary_service._heatmap_cache.clear()
 
 
 def test_list_explore_heatmap_returns_ranked_points():
     poi_id = uuid4()
     db = SimpleNamespace()
-    db.execute = lambda _stmt: _RowsResult([(poi_id, "Temple of Heaven", "POINT(116.4105 39.8812)", 9)])
+    db.execute = lambda _stmt: _RowsResult([(poi_id, "Temple of Heaven", Decimal("116.4105"), Decimal("39.8812"), 9)])
 
     result = list_explore_heatmap(db, 10)
 
@@ -196,6 +307,103 @@ def test_list_explore_heatmap_returns_ranked_points():
     assert result.items[0].poi_id == poi_id
     assert result.items[0].heat_score == 9
     assert result.items[0].name == "Temple of Heaven"
+    assert result.items[0].longitude == 116.4105
+
+
+def test_list_explore_heatmap_serves_cached_response():
+    calls = []
+    db = SimpleNamespace()
+
+    def _execute(stmt):
+        calls.append(stmt)
+        return _RowsResult([(uuid4(), "Temple of Heaven", 116.4105, 39.8812, 9)])
+
+    db.execute = _execute
+
+    first = list_explore_heatmap(db, 10)
+    second = list_explore_heatmap(db, 10)
+
+    assert second is first
+    assert len(calls) == 1
+
+
+def test_refresh_explore_heatmap_clears_cache():
+    statements = []
+    db = SimpleNamespace()
+    db.commit = lambda: None
+    db.scalar = lambda _stmt: True
+
+    def _execute(stmt):
+        statements.append(stmt)
+        return SimpleNamespace(rowcount=3)
+
+    db.execute = _execute
+    itinerary_service._heatmap_cache.set(("top", 10), "stale")
+
+    refreshed = itinerary_service.refresh_explore_heatmap(db)
+
+    assert refreshed == 3
+    assert len(statements) == 2
+    assert itinerary_service._heatmap_cache.get(("top", 10)) is None
+
+
+def test_refresh_explore_heatmap_skips_when_another_worker_holds_the_lock():
+    locks = []
+    db = SimpleNamespace()
+    db.scalar = lambda stmt: locks.append(stmt) or False
+    db.execute = lambda _stmt: pytest.fail("heatmap rebuilt without the lock")
+    itinerary_service._heatmap_cache.set(("top", 10), "fresh")
+
+    assert itinerary_service.refresh_explore_heatmap(db) == 0
+    assert "pg_try_advisory_xact_lock" in str(locks[0])
+    assert itinerary_service._heatmap_cache.get(("top", 10)) == "fresh"
+
+
+def test_list_explore_heatmap_grid_returns_buckets_and_reuses_snapped_box():
+    calls = []
+    db = SimpleNamespace()
+
+    def _execute(stmt):
+        calls.append(stmt)
+        return _RowsResult([(116.41, 39.88, 12, 3)])
+
+    db.execute = _execute
+
+    result = list_explore_heatmap_grid(
+        db,
+        min_longitude=116.0,
+        min_latitude=39.5,
+        max_longitude=117.0,
+        max_latitude=40.5,
+        zoom=10,
+    )
+    list_explore_heatmap_grid(
+        db,
+        min_longitude=116.0001,
+        min_latitude=39.5001,
+        max_longitude=116.9999,
+        max_latitude=40.4999,
+        zoom=10,
+    )
+
+    assert result.zoom == 10
+    assert result.items[0].heat_score == 12
+    assert result.items[0].poi_count == 3
+    assert len(calls) == 1
+
+
+def test_list_explore_heatmap_grid_rejects_inverted_box():
+    with pytest.raises(HTTPException) as exc_info:
+        list_explore_heatmap_grid(
+            SimpleNamespace(),
+            min_longitude=117.0,
+            min_latitude=39.5,
+            max_longitude=116.0,
+            max_latitude=40.5,
+            zoom=10,
+        )
+
+    assert exc_info.value.status_code == 400
 
 
 def test_list_explore_recommendations_falls_back_to_popularity(monkeypatch):
@@ -213,13 +421,8 @@ def test_list_explore_recommendations_falls_back_to_popularity(monkeypatch):
     db = SimpleNamespace()
     monkeypatch.setattr(
         itinerary_service,
-        "_list_public_itinerary_rows_with_metrics",
-        lambda _db, **_kwargs: [(itinerary, "alice", 4, 7, None)],
-    )
-    monkeypatch.setattr(
-        itinerary_service,
-        "_sort_public_rows_by_popularity",
-        lambda rows: rows,
+        "_list_popular_public_itinerary_rows",
+        lambda _db, _limit, **_kwargs: [(itinerary, "alice", 4, 7, None)],
     )
 
     result = list_explore_recommendations(db, None, 6)
@@ -230,6 +433,46 @@ def test_list_explore_recommendations_falls_back_to_popularity(monkeypatch):
     assert "被借鉴 4 次" in result.items[0].reasons
 
 
+def test_list_popular_public_itinerary_rows_tops_up_with_untracked_itineraries():
+    ranked = SimpleNamespace(id=uuid4(), created_at=datetime.now(UTC))
+    fresh = SimpleNamespace(id=uuid4(), created_at=datetime.now(UTC))
+    now = datetime.now(UTC)
+    results = [
+        _RowsResult([(ranked, "alice", 2, 5, now)]),
+        _RowsResult([(fresh, "bob")]),
+    ]
+    statements = []
+    db = SimpleNamespace()
+
+    def _execute(stmt):
+        statements.append(stmt)
+        return results.pop(0)
+
+    db.execute = _execute
+
+    rows = itinerary_service._list_popular_public_itinerary_rows(db, 3)
+
+    assert len(statements) == 2
+    assert rows == [(ranked, "alice", 2, 5, now), (fresh, "bob", 0, 0, None)]
+
+
+def test_list_popular_public_itinerary_rows_skips_top_up_when_full():
+    ranked = SimpleNamespace(id=uuid4(), created_at=datetime.now(UTC))
+    statements = []
+    db = SimpleNamespace()
+
+    def _execute(stmt):
+        statements.append(stmt)
+        return _RowsResult([(ranked, "alice", 1, 0, None)])
+
+    db.execute = _execute
+
+    rows = itinerary_service._list_popular_public_itinerary_rows(db, 1)
+
+    assert len(statements) == 1
+    assert rows[0][2] == 1
+
+
 def test_list_explore_recommendations_prefers_matching_type(monkeypatch):
     user = SimpleNamespace(id=uuid4())
     itinerary_match = SimpleNamespace(
@@ -262,16 +505,71 @@ def test_list_explore_recommendations_prefers_matching_type(monkeypatch):
     monkeypatch.setattr(itinerary_service, "_get_viewed_itinerary_ids", lambda _db, _user_id: set())
     monkeypatch.setattr(itinerary_service, "_get_user_preferred_poi_types", lambda _db, _user_id: {"museum": 3})
     monkeypatch.setattr(itinerary_service, "_list_public_itinerary_rows_with_metrics", lambda _db, **_kwargs: rows)
+    monkeypatch.setattr(itinerary_service, "_list_popular_public_itinerary_rows", lambda _db, _limit, **_kwargs: [])
     monkeypatch.setattr(
         itinerary_service,
-        "_get_itinerary_poi_type_count_map",
-        lambda _db, _ids: {
-            itinerary_match.id: {"museum": 2},
-            itinerary_plain.id: {"park": 2},
-        },
+        "_get_itinerary_poi_type_count_rows",
+        lambda _db, _ids, _types: [
+            (itinerary_match.id, "museum", 2),
+            (itinerary_plain.id, "park", 2),
+        ],
     )
 
     result = list_explore_recommendations(db, user, 2)
 
     assert result.items[0].itinerary.id == itinerary_match.id
     assert any(reason.startswith("偏好匹配：") for reason in result.items[0].reasons)
+
+
+def test_list_explore_recommendations_merges_popular_candidates(monkeypatch):
+    user = SimpleNamespace(id=uuid4())
+    now = datetime.now(UTC)
+    itinerary_match = SimpleNamespace(
+        id=uuid4(),
+        title="Museum Route",
+        destination="Beijing",
+        days=1,
+        status="published",
+        visibility="public",
+        cover_image_url=None,
+        created_at=now,
+        updated_at=now,
+    )
+    itinerary_popular = SimpleNamespace(
+        id=uuid4(),
+        title="Classic Route",
+        destination="Beijing",
+        days=1,
+        status="published",
+        visibility="public",
+        cover_image_url=None,
+        created_at=now,
+        updated_at=now,
+    )
+    matched_row = (itinerary_match, "alice", 0, 0, None)
+    popular_row = (itinerary_popular, "bob", 5, 20, None)
+    db = SimpleNamespace()
+    monkeypatch.setattr(itinerary_service, "_get_viewed_itinerary_ids", lambda _db, _user_id: set())
+    monkeypatch.setattr(itinerary_service, "_get_user_preferred_poi_types", lambda _db, _user_id: {"museum": 3})
+    monkeypatch.setattr(
+        itinerary_service,
+        "_list_public_itinerary_rows_with_metrics",
+        lambda _db, **_kwargs: [matched_row],
+    )
+    monkeypatch.setattr(
+        itinerary_service,
+        "_list_popular_public_itinerary_rows",
+        lambda _db, _limit, **_kwargs: [popular_row, matched_row],
+    )
+    monkeypatch.setattr(
+        itinerary_service,
+        "_get_itinerary_poi_type_count_rows",
+        lambda _db, _ids, _types: [(itinerary_match.id, "museum", 2)],
+    )
+
+    result = list_explore_recommendations(db, user, 5)
+
+    assert [item.itinerary.id for item in result.items] == [itinerary_popular.id, itinerary_match.id]
+    assert result.items[0].score == 25
+    assert result.items[1].score == 6
+    assert result.items[1].reasons[0] == "偏好匹配：museum"
@@ -23,6 +23,7 @@ class _FakeDb:
         self.fork_rel = fork_rel
         self.owned_itinerary = owned_itinerary
         self.added = []
+        self.executed = []
         self.committed = False
 
     def get(self, model, entity_id):
@@ -44,6 +45,9 @@ class _FakeDb:
     def flush(self):
         return None
 
+    def execute(self, stmt):
+        self.executed.append(stmt)
+
     def commit(self):
         self.committed = True
 
@@ -100,6 +104,7 @@ def test_fork_public_itinerary_copies_snapshot_items(monkeypatch):
     new_itinerary = next(value for value in db.added if isinstance(value, Itinerary))
     assert new_itinerary.status == "in_progress"
     assert new_itinerary.visibility == "private"
+    assert len(db.executed) == 1
     assert db.committed is True
 
 
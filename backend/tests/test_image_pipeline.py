@@ -0,0 +1,59 @@
+import asyncio
+from datetime import UTC, datetime
+from io import BytesIO
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import ExifTags, Image
+from starlette.datastructures import Headers
+
+from app.services import image_pipeline
+
+
+def _upload(data: bytes, content_type: str = "image/jpeg") -> UploadFile:
+    return UploadFile(file=BytesIO(data), filename="photo", headers=Headers({"content-type": content_type}))
+
+
+def _jpeg_with_exif(size=(1200, 800)) -> bytes:
+    exif = Image.Exif()
+    exif[0x010E] = "Test EXIF"
+    exif.get_ifd(ExifTags.IFD.Exif)[36867] = "2026:03:01 08:30:00"
+    exif.get_ifd(ExifTags.IFD.GPSInfo).update({1: "N", 2: (30.0, 40.0, 12.0), 3: "E", 4: (104.0, 4.0, 15.6)})
+    output = BytesIO()
+    Image.new("RGB", size, color=(0, 128, 255)).save(output, format="JPEG", exif=exif)
+    return output.getvalue()
+
+
+def test_process_image_upload_strips_metadata_and_emits_thumbnail(monkeypatch):
+    monkeypatch.setattr(image_pipeline.settings, "image_thumbnail_max_px", 300)
+
+    processed = asyncio.run(image_pipeline.process_image_upload(_upload(_jpeg_with_exif())))
+
+    assert (processed.extension, processed.content_type) == ("jpg", "image/jpeg")
+    assert b"Exif" not in processed.content
+    with Image.open(BytesIO(processed.content)) as full, Image.open(BytesIO(processed.thumbnail)) as thumb:
+        assert full.size == (1200, 800)
+        assert thumb.size == (300, 200)
+    assert processed.exif_captured_at == datetime(2026, 3, 1, 8, 30, tzinfo=UTC)
+    assert processed.exif_latitude == pytest.approx(30.67, abs=1e-4)
+    assert processed.exif_longitude == pytest.approx(104.071, abs=1e-4)
+
+
+def test_spool_upload_rejects_oversized_stream():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(image_pipeline.spool_upload(_upload(b"x" * (200 * 1024)), max_bytes=100 * 1024))
+
+    assert exc.value.status_code == 413
+
+
+def test_process_image_upload_rejects_empty_and_invalid_files():
+    with pytest.raises(HTTPException) as empty:
+        asyncio.run(image_pipeline.process_image_upload(_upload(b"")))
+    with pytest.raises(HTTPException) as invalid:
+        asyncio.run(image_pipeline.process_image_upload(_upload(b"not an image")))
+    with pytest.raises(HTTPException) as unsupported:
+        asyncio.run(image_pipeline.process_image_upload(_upload(b"GIF89a", "image/gif")))
+
+    assert (empty.value.status_code, empty.value.detail) == (400, "Photo file is empty")
+    assert (invalid.value.status_code, invalid.value.detail) == (400, "Invalid image file")
+    assert unsupported.value.detail == "Only JPEG/PNG/WEBP images are supported"
@@ -10,12 +10,12 @@ from PIL import Image
 from app.models.poi import Poi
 from app.models.poi_correction import PoiCorrection
 from app.models.poi_correction_type import PoiCorrectionType
-from app.services.poi_correction_service import review_correction, strip_exif_bytes
+from app.services.image_pipeline import strip_exif_bytes
+from app.services.poi_correction_service import review_correction
 
 
 @pytest.fixture(autouse=True)
 def _patch_guardian_dependencies(monkeypatch):
-    monkeypatch.setattr("app.services.poi_correction_service.evaluate_guardian_governance", lambda _db: None)
     monkeypatch.setattr(
         "app.services.poi_correction_service.can_review_correction_in_territory",
         lambda _db, _user, _territory_id: True,
@@ -87,6 +87,7 @@ def test_review_correction_accept_updates_ticket_price():
         submitter_user_id=uuid4(),
         details="价格已调整",
         photo_url=None,
+        photo_thumbnail_url=None,
         created_at=datetime.now(UTC),
         updated_at=datetime.now(UTC),
         before_snapshot=None,
@@ -136,6 +137,7 @@ def test_review_correction_opening_hours_rejects_invalid_format():
         submitter_user_id=uuid4(),
         details=None,
         photo_url=None,
+        photo_thumbnail_url=None,
         created_at=datetime.now(UTC),
         updated_at=datetime.now(UTC),
         before_snapshot=None,
@@ -181,6 +183,7 @@ def test_review_correction_opening_hours_accepts_time_range():
         submitter_user_id=uuid4(),
         details=None,
         photo_url=None,
+        photo_thumbnail_url=None,
         created_at=datetime.now(UTC),
         updated_at=datetime.now(UTC),
         before_snapshot=None,
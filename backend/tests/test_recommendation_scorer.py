@@ -0,0 +1,35 @@
+from app.services.recommendation_scorer import RecommendationScorer
+
+
+def test_build_type_matrix_ignores_unknown_keys_and_types():
+    scorer = RecommendationScorer({"museum": 3, "park": 1, "food": 0})
+
+    matrix = scorer.build_type_matrix(
+        ["a", "b"],
+        [("a", "museum", 2), ("b", "park", 4), ("b", "food", 9), ("c", "museum", 1)],
+    )
+
+    assert scorer.poi_types == ["museum", "park"]
+    assert matrix.tolist() == [[2.0, 0.0], [0.0, 4.0]]
+
+
+def test_top_k_scores_match_plus_popularity():
+    scorer = RecommendationScorer({"museum": 3, "park": 1})
+    matrix = scorer.build_type_matrix(["a", "b", "c"], [("a", "museum", 2), ("b", "park", 1)])
+
+    ranked = scorer.top_k(matrix, [0, 1, 0], [0, 1, 10], [1.0, 2.0, 3.0], 2)
+
+    assert [candidate.index for candidate in ranked] == [2, 0]
+    assert ranked[0].score == 10
+    assert ranked[0].preferred_type is None
+    assert ranked[1].score == 6
+    assert ranked[1].preferred_type == "museum"
+
+
+def test_top_k_keeps_tie_breakers_at_the_cut():
+    scorer = RecommendationScorer({"museum": 1})
+    matrix = scorer.build_type_matrix(["a", "b", "c", "d"], [])
+
+    ranked = scorer.top_k(matrix, [1, 0, 2, 0], [4, 5, 3, 1], [1.0, 2.0, 3.0, 4.0], 2)
+
+    assert [candidate.index for candidate in ranked] == [2, 0]
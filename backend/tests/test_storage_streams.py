@@ -0,0 +1,186 @@
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from PIL import ExifTags, Image
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.api.v1 import uploads as uploads_api
+from app.db.session import get_db
+from app.security.deps import get_current_user
+from app.services import direct_upload_service
+from app.services.storage.base import StorageLimitExceeded
+from app.services.storage.content_addressed import ContentAddressedStorageProvider
+from app.services.storage.local import LocalStorageProvider
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _read_all(storage, storage_key: str) -> bytes:
+    return b"".join([chunk async for chunk in storage.open_stream(storage_key, chunk_size=3)])
+
+
+def test_local_save_stream_round_trips_through_open_stream_and_stat(tmp_path):
+    storage = LocalStorageProvider(root_dir=str(tmp_path), public_base_url="/uploads")
+
+    async def scenario():
+        key, url = await storage.save_stream(_chunks(b"hello ", b"world"), extension="jpg", content_type="image/jpeg")
+        return key, url, await _read_all(storage, key), await storage.stat(key), await storage.stat("missing.jpg")
+
+    key, url, body, stored, missing = asyncio.run(scenario())
+
+    assert url == f"/uploads/{key}" and key.endswith(".jpg")
+    assert body == b"hello world"
+    assert stored.size == 11
+    assert missing is None
+
+
+def test_save_stream_over_limit_leaves_no_partial_file(tmp_path):
+    storage = ContentAddressedStorageProvider(root_dir=str(tmp_path), public_base_url="/uploads")
+
+    with pytest.raises(StorageLimitExceeded):
+        asyncio.run(
+            storage.save_stream(_chunks(b"1234", b"5678"), extension="png", content_type="image/png", max_bytes=6)
+        )
+
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+
+
+def test_content_addressed_stream_matches_byte_key_and_rejects_escaping_keys(tmp_path):
+    storage = ContentAddressedStorageProvider(root_dir=str(tmp_path), public_base_url="/uploads")
+
+    streamed_key, _ = asyncio.run(
+        storage.save_stream(_chunks(b"same ", b"bytes"), extension="webp", content_type="image/webp")
+    )
+    saved_key, _ = storage.save_bytes(content=b"same bytes", extension="webp", content_type="image/webp")
+
+    assert streamed_key == saved_key == ContentAddressedStorageProvider.storage_key_for(b"same bytes", "webp")
+    with pytest.raises(ValueError):
+        asyncio.run(storage.stat("../outside.txt"))
+
+
+class _UploadDb:
+    """Just enough of a Session for direct uploads: the jti primary key is enforced on commit."""
+
+    def __init__(self):
+        self.rows = {}
+        self._pending = []
+
+    def add(self, row):
+        self._pending.append(row)
+
+    def commit(self):
+        pending, self._pending = self._pending, []
+        for row in pending:
+            if self.rows.setdefault(row.jti, row) is not row:
+                raise IntegrityError("INSERT INTO direct_uploads", {}, Exception("duplicate jti"))
+
+    def rollback(self):
+        self._pending = []
+
+    def get(self, _model, jti):
+        return self.rows.get(jti)
+
+
+def _jpeg_with_gps() -> bytes:
+    exif = Image.Exif()
+    exif.get_ifd(ExifTags.IFD.GPSInfo).update({1: "N", 2: (30.0, 40.0, 12.0), 3: "E", 4: (104.0, 4.0, 15.6)})
+    output = BytesIO()
+    Image.new("RGB", (40, 30), color=(0, 128, 255)).save(output, format="JPEG", exif=exif)
+    return output.getvalue()
+
+
+def _stored_files(root):
+    return [path for path in root.rglob("*") if path.is_file()]
+
+
+@pytest.fixture
+def upload_client(tmp_path, monkeypatch):
+    storage = ContentAddressedStorageProvider(root_dir=str(tmp_path), public_base_url="/uploads")
+    db = _UploadDb()
+    monkeypatch.setattr(direct_upload_service, "get_storage_provider", lambda: storage)
+    monkeypatch.setattr(direct_upload_service.get_settings(), "upload_max_photo_bytes", 4096)
+    api = FastAPI()
+    api.include_router(uploads_api.router, prefix="/api/v1")
+    api.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=uuid4(), role="user")
+    api.dependency_overrides[get_db] = lambda: db
+    return TestClient(api), tmp_path, db
+
+
+def test_signed_upload_token_stores_a_stripped_image_and_records_it(upload_client):
+    client, root, db = upload_client
+
+    grant = client.post("/api/v1/uploads/tokens", json={"content_type": "image/JPEG"}).json()
+    response = client.put(
+        grant["upload_url"], content=_jpeg_with_gps(), headers={"Content-Type": "image/jpeg"}
+    )
+
+    assert grant["content_type"] == "image/jpeg" and grant["max_bytes"] == 4096
+    assert response.status_code == 200
+    body = response.json()
+    stored = (root / body["storage_key"]).read_bytes()
+    assert body["size"] == len(stored) and body["storage_key"].endswith(".jpg")
+    assert b"Exif" not in stored
+    [upload] = db.rows.values()
+    assert upload.storage_key == body["storage_key"]
+    assert upload.thumbnail_url == body["thumbnail_url"]
+    assert upload.exif_latitude == pytest.approx(30.67, abs=1e-4)
+    assert upload.claimed_at is None
+
+
+def test_direct_put_rejects_bad_token_type_mismatch_and_oversize(upload_client):
+    client, root, _ = upload_client
+    grant = client.post("/api/v1/uploads/tokens", json={"content_type": "image/jpeg"}).json()
+
+    forged = client.put(f"{grant['upload_url']}x", content=b"x", headers={"Content-Type": "image/jpeg"})
+    mismatch = client.put(grant["upload_url"], content=b"x", headers={"Content-Type": "image/png"})
+    oversize = client.put(grant["upload_url"], content=b"x" * 4097, headers={"Content-Type": "image/jpeg"})
+
+    assert forged.status_code == 403
+    assert mismatch.status_code == 415
+    assert oversize.status_code == 413
+    assert client.post("/api/v1/uploads/tokens", json={"content_type": "image/gif"}).status_code == 400
+    assert _stored_files(root) == []
+
+
+def test_direct_put_token_is_single_use_and_non_images_are_never_stored(upload_client):
+    client, root, _ = upload_client
+    headers = {"Content-Type": "image/jpeg"}
+    first = client.post("/api/v1/uploads/tokens", json={"content_type": "image/jpeg"}).json()
+    second = client.post("/api/v1/uploads/tokens", json={"content_type": "image/jpeg"}).json()
+
+    empty = client.put(first["upload_url"], content=b"", headers=headers)
+    replay = client.put(first["upload_url"], content=_jpeg_with_gps(), headers=headers)
+    not_an_image = client.put(second["upload_url"], content=b"<?php echo 1; ?>", headers=headers)
+
+    assert empty.status_code == 400
+    assert replay.status_code == 409
+    assert not_an_image.status_code == 400
+    assert _stored_files(root) == []
+
+
+def test_claim_direct_upload_marks_the_upload_used_or_rejects_unknown_keys():
+    upload = SimpleNamespace(storage_key="ab/cd.jpg", claimed_at=None)
+    statements = []
+
+    def scalars(rows):
+        return lambda stmt: statements.append(stmt) or SimpleNamespace(first=lambda: rows)
+
+    user = SimpleNamespace(id=uuid4())
+    db = SimpleNamespace(scalars=scalars(upload), add=lambda _row: None)
+
+    assert direct_upload_service.claim_direct_upload(db, user, "ab/cd.jpg") is upload
+    assert upload.claimed_at is not None
+    assert "FOR UPDATE SKIP LOCKED" in str(statements[0].compile(dialect=postgresql.dialect()))
+    missing = SimpleNamespace(scalars=scalars(None))
+    with pytest.raises(HTTPException) as exc:
+        direct_upload_service.claim_direct_upload(missing, user, "ab/cd.jpg")
+    assert exc.value.status_code == 400
@@ -98,17 +98,34 @@ def test_list_territories_api_returns_service_result(client, fake_db, monkeypatc
     expected = TerritoryRegionListResponse(items=[_sample_region(territory_id)])
     seen = {}
 
-    def _fake_list_territories(db):
+    def _fake_list_territories(db, *, version):
         seen["db"] = db
+        seen["version"] = version
         return expected
 
+    monkeypatch.setattr(territories_api, "get_territory_list_version", lambda _db: 7)
     monkeypatch.setattr(territories_api, "list_territories", _fake_list_territories)
 
     response = client.get("/api/v1/territories")
 
     assert response.status_code == 200
+    assert response.headers["etag"] == 'W/"territories-7"'
     assert response.json()["items"][0]["id"] == str(territory_id)
-    assert seen["db"] is fake_db
+    assert seen == {"db": fake_db, "version": 7}
+
+
+def test_list_territories_api_returns_304_for_matching_etag(client, monkeypatch):
+    monkeypatch.setattr(territories_api, "get_territory_list_version", lambda _db: 7)
+    monkeypatch.setattr(
+        territories_api,
+        "list_territories",
+        lambda *_args, **_kwargs: pytest.fail("matching ETag must not rebuild the list"),
+    )
+
+    response = client.get("/api/v1/territories", headers={"If-None-Match": 'W/"territories-7"'})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"territories-7"'
 
 
 def test_get_my_profile_api_returns_service_result(client, fake_db, monkeypatch):
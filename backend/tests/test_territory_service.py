@@ -119,3 +119,65 @@ def test_role_never_demotes_by_index():
     assert _role_index(target_role) <= _role_index(current_role)
     # The service only promotes if _role_index(target) > _role_index(current)
     # So no demotion would occur
+
+
+# ---------------------------------------------------------------------------
+# Incremental cell maintenance (sync_poi_territory_cells)
+# ---------------------------------------------------------------------------
+
+
+class _CellDb:
+    def __init__(self, scalars):
+        self._scalars = list(scalars)
+        self.added = []
+        self.executed = []
+
+    def scalar(self, _stmt):
+        return self._scalars.pop(0)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def flush(self):
+        return None
+
+    def execute(self, stmt):
+        self.executed.append(stmt)
+
+
+def test_sync_poi_territory_cells_creates_region_when_cell_reaches_min_pois(monkeypatch):
+    bumps = []
+    monkeypatch.setattr(territory_service, "bump_cache_version", lambda _db, name: bumps.append(name))
+    monkeypatch.setattr(territory_service.settings, "territory_grid_size_deg", 0.1)
+    monkeypatch.setattr(territory_service.settings, "territory_min_pois", 3)
+    # poi count in cell, existing region lookup, total region count
+    db = _CellDb([3, None, 7])
+
+    territory_service.sync_poi_territory_cells(db, [(116.405, 39.915)])
+
+    region = db.added[0]
+    assert region.code == "cell_1164_399"
+    assert region.status == "active"
+    assert region.poi_count == 3
+    assert region.name.endswith("008")
+    assert len(db.executed) == 1
+    assert db.executed[0].compile().params["territory_id"] == region.id
+    assert bumps == [territory_service.TERRITORY_LIST_CACHE]
+
+
+def test_sync_poi_territory_cells_deactivates_old_cell_after_move(monkeypatch):
+    bumps = []
+    monkeypatch.setattr(territory_service, "bump_cache_version", lambda _db, name: bumps.append(name))
+    monkeypatch.setattr(territory_service.settings, "territory_grid_size_deg", 0.1)
+    monkeypatch.setattr(territory_service.settings, "territory_min_pois", 3)
+    old_region = SimpleNamespace(id=uuid4(), status="active", poi_count=3)
+    new_region = SimpleNamespace(id=uuid4(), status="active", poi_count=4)
+    # Cells are visited in sorted order: (1164, 399) first, then (1170, 400).
+    db = _CellDb([2, old_region, 5, new_region])
+
+    territory_service.sync_poi_territory_cells(db, [(116.405, 39.915), (117.05, 40.05), None])
+
+    assert (old_region.status, old_region.poi_count) == ("inactive", 0)
+    assert (new_region.status, new_region.poi_count) == ("active", 5)
+    assert db.executed[0].compile().params["territory_id"] is None
+    assert db.executed[1].compile().params["territory_id"] == new_region.id
@@ -3,6 +3,7 @@ from types import SimpleNamespace
 from uuid import uuid4
 
 import pytest
+import sqlalchemy as sa
 from fastapi import HTTPException, status
 
 from app.models.poi import Poi
@@ -80,6 +81,14 @@ class _FakeDb:
         return None
 
 
+@pytest.fixture(autouse=True)
+def cache_bumps(monkeypatch):
+    bumps = []
+    monkeypatch.setattr(territory_service, "bump_cache_version", lambda _db, name: bumps.append(name))
+    territory_service._territory_list_cache.clear()
+    return bumps
+
+
 def test_submit_guardian_application_success():
     territory_id = uuid4()
     user_id = uuid4()
@@ -149,7 +158,7 @@ def test_submit_guardian_application_rejects_duplicate_pending():
     assert exc.value.detail == "Pending application already exists"
 
 
-def test_review_guardian_application_approve_creates_guardian():
+def test_review_guardian_application_approve_creates_guardian(cache_bumps):
     territory_id = uuid4()
     applicant_id = uuid4()
     reviewer_id = uuid4()
@@ -192,6 +201,7 @@ def test_review_guardian_application_approve_creates_guardian():
     assert created_guardians[0].state == "active"
     assert created_guardians[0].role == "regular"
     assert db.commits == 1
+    assert cache_bumps == [territory_service.TERRITORY_LIST_CACHE]
 
 
 def test_review_guardian_application_rejects_non_pending():
@@ -242,28 +252,123 @@ def test_guardian_check_in_reactivates_dormant_guardian():
     assert db.commits == 1
 
 
+def test_evaluate_guardian_governance_applies_one_set_based_update(monkeypatch):
+    db = _FakeDb(execute_results=[SimpleNamespace(rowcount=2)])
+    watermarks = []
+    monkeypatch.setattr(territory_service.settings, "guardian_dormant_window_days", 90)
+    monkeypatch.setattr(
+        territory_service,
+        "set_job_watermark",
+        lambda _db, name, last_run_at: watermarks.append((name, last_run_at)),
+    )
+
+    changed = territory_service.evaluate_guardian_governance(db)
+
+    assert changed == 2
+    assert db.execute_results == []
+    assert db.added == []
+    assert db.commits == 1
+    assert [name for name, _ in watermarks] == [territory_service.GUARDIAN_GOVERNANCE_JOB]
+
+
 def test_evaluate_guardian_governance_marks_dormant_and_recovers(monkeypatch):
+    # Run the real UPDATE against an in-memory table holding the columns it touches.
+    metadata = sa.MetaData()
+    guardians = sa.Table(
+        "territory_guardians",
+        metadata,
+        sa.Column("name", sa.String, primary_key=True),
+        sa.Column("state", sa.String, nullable=False),
+        sa.Column("last_active_at", sa.DateTime(timezone=True)),
+        sa.Column("granted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    engine = sa.create_engine("sqlite://")
+    metadata.create_all(engine)
     now = datetime.now(UTC)
-    old_guardian = SimpleNamespace(
-        state="active",
-        revoked_at=None,
-        last_active_at=now - timedelta(days=120),
-        granted_at=now - timedelta(days=200),
+
+    def days_ago(days):
+        return now - timedelta(days=days)
+
+    columns = ("name", "state", "last_active_at", "granted_at", "revoked_at")
+    rows = [
+        ("inactive", "active", days_ago(120), days_ago(200), None),
+        ("never_active", "active", None, days_ago(100), None),
+        ("recovering", "dormant", days_ago(10), days_ago(60), None),
+        ("steady", "active", days_ago(10), days_ago(60), None),
+        ("still_dormant", "dormant", days_ago(120), days_ago(200), None),
+        ("honorary", "honorary", days_ago(300), days_ago(400), None),
+        ("revoked", "active", days_ago(300), days_ago(400), days_ago(5)),
+    ]
+    monkeypatch.setattr(territory_service.settings, "guardian_dormant_window_days", 90)
+    monkeypatch.setattr(territory_service, "set_job_watermark", lambda *_args: None)
+    monkeypatch.setattr(territory_service, "bump_cache_version", lambda *_args: None)
+
+    with engine.begin() as connection:
+        connection.execute(
+            guardians.insert(),
+            [dict(zip(columns, row, strict=True)) for row in rows],
+        )
+        db = SimpleNamespace(execute=connection.execute, commit=lambda: None)
+
+        changed = territory_service.evaluate_guardian_governance(db)
+
+        states = dict(connection.execute(sa.select(guardians.c.name, guardians.c.state)).all())
+
+    assert changed == 3
+    assert states == {
+        "inactive": "dormant",
+        "never_active": "dormant",
+        "recovering": "active",
+        "steady": "active",
+        "still_dormant": "dormant",
+        "honorary": "honorary",
+        "revoked": "active",
+    }
+
+
+def test_territory_reads_do_not_run_governance(monkeypatch):
+    monkeypatch.setattr(
+        territory_service,
+        "evaluate_guardian_governance",
+        lambda _db: pytest.fail("read path must not run governance"),
     )
-    recovering_guardian = SimpleNamespace(
-        state="dormant",
-        revoked_at=None,
-        last_active_at=now - timedelta(days=10),
-        granted_at=now - timedelta(days=60),
+    region = SimpleNamespace(
+        id=uuid4(), code="cell_1_2", name="Region", status="active", poi_count=4
+    )
+    db = _FakeDb(
+        execute_results=[_ExecuteResult([(region, "POLYGON((0 0,1 0,1 1,0 1,0 0))", "POINT(0.5 0.5)")]), _ExecuteResult([])],
+        scalars_results=[_ScalarResult(all_value=["POI A"])],
     )
-    db = _FakeDb(scalars_results=[_ScalarResult(all_value=[old_guardian, recovering_guardian])])
-    monkeypatch.setattr(territory_service.settings, "guardian_dormant_window_days", 90)
 
-    territory_service.evaluate_guardian_governance(db)
+    result = territory_service.get_territory(db, region.id)
 
-    assert old_guardian.state == "dormant"
-    assert recovering_guardian.state == "active"
-    assert db.commits == 1
+    assert result.sample_pois == ["POI A"]
+    assert db.commits == 0
+
+
+def test_list_territories_reuses_cached_response_for_same_version():
+    region = SimpleNamespace(
+        id=uuid4(), code="cell_1_2", name="Region", status="active", poi_count=4
+    )
+    db = _FakeDb(
+        execute_results=[
+            _ExecuteResult([(region, "POLYGON((0 0,1 0,1 1,0 1,0 0))", "POINT(0.5 0.5)")]),
+            _ExecuteResult([]),
+            _ExecuteResult([(region.id, "POI A")]),
+        ],
+    )
+
+    first = territory_service.list_territories(db, version=3)
+    second = territory_service.list_territories(db, version=3)
+
+    assert second is first
+    assert first.items[0].boundary_wkt == "POLYGON((0 0,1 0,1 1,0 1,0 0))"
+    assert first.items[0].sample_pois == ["POI A"]
+    assert db.execute_results == []
+    with pytest.raises(AssertionError, match="Unexpected db.execute call"):
+        territory_service.list_territories(db, version=4)
 
 
 def test_get_task_center_counts_pending_reviews_correctly():
@@ -154,6 +154,19 @@ export type ExploreHeatPointListResponse = {
   items: ExploreHeatPointResponse[];
 };
 
+export type ExploreHeatGridCellResponse = {
+  longitude: number;
+  latitude: number;
+  heat_score: number;
+  poi_count: number;
+};
+
+export type ExploreHeatGridResponse = {
+  zoom: number;
+  cell_size_deg: number;
+  items: ExploreHeatGridCellResponse[];
+};
+
 export type ExploreRecommendationItemResponse = {
   itinerary: PublicItineraryResponse;
   score: number;
@@ -255,6 +268,7 @@ export type PoiCorrectionResponse = {
   proposed_value: string | null;
   details: string | null;
   photo_url: string | null;
+  photo_thumbnail_url: string | null;
   status: "pending" | "accepted" | "rejected";
   submitter_user_id: string;
   reviewer_user_id: string | null;
@@ -422,6 +436,7 @@ export type BountyTaskListResponse = {
   offset: number;
   limit: number;
   nearby_radius_meters: number | null;
+  next_cursor: string | null;
 };
 
 export type BountySubmissionResponse = {
@@ -433,6 +448,7 @@ export type BountySubmissionResponse = {
   distance_meters: number;
   gps_verified: boolean;
   photo_url: string | null;
+  photo_thumbnail_url: string | null;
   photo_exif_captured_at: string | null;
   photo_exif_longitude: number | null;
   photo_exif_latitude: number | null;
@@ -1029,6 +1045,7 @@ export async function fetchBounties(
     scope?: "all" | "nearby" | "mine";
     offset?: number;
     limit?: number;
+    cursor?: string;
     longitude?: number;
     latitude?: number;
   }
@@ -1041,6 +1058,9 @@ export async function fetchBounties(
     offset: String(offset),
     limit: String(limit)
   });
+  if (options?.cursor) {
+    params.set("cursor", options.cursor);
+  }
   if (options?.longitude !== undefined && options?.latitude !== undefined) {
     params.set("longitude", String(options.longitude));
     params.set("latitude", String(options.latitude));
@@ -1288,6 +1308,24 @@ export async function fetchExploreHeatmap(limit = 20): Promise<ExploreHeatPointL
   return parseJsonResponse<ExploreHeatPointListResponse>(response, "List explore heatmap request");
 }
 
+export async function fetchExploreHeatmapGrid(params: {
+  minLongitude: number;
+  minLatitude: number;
+  maxLongitude: number;
+  maxLatitude: number;
+  zoom: number;
+}): Promise<ExploreHeatGridResponse> {
+  const query = new URLSearchParams({
+    min_longitude: String(params.minLongitude),
+    min_latitude: String(params.minLatitude),
+    max_longitude: String(params.maxLongitude),
+    max_latitude: String(params.maxLatitude),
+    zoom: String(params.zoom)
+  });
+  const response = await fetch(`${API_BASE_URL}/explore/heatmap/grid?${query.toString()}`);
+  return parseJsonResponse<ExploreHeatGridResponse>(response, "List explore heatmap grid request");
+}
+
 export async function fetchExploreRecommendations(
   limit = 12,
   token?: string
@@ -1535,18 +1573,47 @@ export type BoardLaneSummary = {
   label: string;
   block_count: number;
   done_count: number;
+  blocked_count: number;
+};
+
+export type BoardSummary = {
+  block_count: number;
+  dependency_count: number;
+  blocked_count: number;
 };
 
 export type BoardResponse = {
   itinerary_id: string;
+  version: number;
+  delta: boolean;
   items: BlockResponse[];
   dependencies: BlockDependencyResponse[];
+  removed_block_ids: string[];
+  removed_edge_ids: string[];
   lanes: BoardLaneSummary[];
-  summary: {
-    block_count: number;
-    dependency_count: number;
-    blocked_count: number;
-  };
+  summary: BoardSummary;
+};
+
+export type BoardSummaryResponse = {
+  itinerary_id: string;
+  version: number;
+  lanes: BoardLaneSummary[];
+  summary: BoardSummary;
+};
+
+export type DependencyScheduleItem = {
+  block_id: string;
+  earliest_start_minute: number;
+  earliest_finish_minute: number;
+  critical: boolean;
+};
+
+export type DependencyScheduleResponse = {
+  itinerary_id: string;
+  version: number;
+  items: DependencyScheduleItem[];
+  critical_path: string[];
+  finish_minute: number;
 };
 
 export type BlockCreatePayload = {
@@ -1611,6 +1678,16 @@ export type BoardAutoLayoutResponse = {
   updated_count: number;
 };
 
+export type BlockOp =
+  | ({ op: "reorder" } & BlockReorderPayload)
+  | ({ op: "layout"; block_id: string } & BlockLayoutUpdatePayload)
+  | ({ op: "patch" } & Omit<BlockBatchUpdatePayload, "itinerary_id">);
+
+export type BlockOpsResponse = {
+  itinerary_id: string;
+  updated_count: number;
+};
+
 export async function fetchBlocks(
   itineraryId: string,
   token: string,
@@ -1625,14 +1702,38 @@ export async function fetchBlocks(
 export async function fetchBoard(
   itineraryId: string,
   token: string,
-  collabGrant?: string
+  collabGrant?: string,
+  since?: number
 ): Promise<BoardResponse> {
-  const response = await fetch(`${API_BASE_URL}/itineraries/${itineraryId}/board`, {
+  const query = since === undefined ? "" : `?since=${since}`;
+  const response = await fetch(`${API_BASE_URL}/itineraries/${itineraryId}/board${query}`, {
     headers: authHeaders(token, collabGrant),
   });
   return parseJsonResponse<BoardResponse>(response, "Fetch board");
 }
 
+export async function fetchBoardSummary(
+  itineraryId: string,
+  token: string,
+  collabGrant?: string
+): Promise<BoardSummaryResponse> {
+  const response = await fetch(`${API_BASE_URL}/itineraries/${itineraryId}/board/summary`, {
+    headers: authHeaders(token, collabGrant),
+  });
+  return parseJsonResponse<BoardSummaryResponse>(response, "Fetch board summary");
+}
+
+export async function fetchBoardSchedule(
+  itineraryId: string,
+  token: string,
+  collabGrant?: string
+): Promise<DependencyScheduleResponse> {
+  const response = await fetch(`${API_BASE_URL}/itineraries/${itineraryId}/board/schedule`, {
+    headers: authHeaders(token, collabGrant),
+  });
+  return parseJsonResponse<DependencyScheduleResponse>(response, "Fetch board schedule");
+}
+
 export async function createBlock(
   itineraryId: string,
   payload: BlockCreatePayload,
@@ -1751,6 +1852,20 @@ export async function reorderBlocks(
   }
 }
 
+export async function applyBlockOps(
+  itineraryId: string,
+  ops: BlockOp[],
+  token: string,
+  collabGrant?: string
+): Promise<BlockOpsResponse> {
+  const response = await fetch(`${API_BASE_URL}/itineraries/${itineraryId}/blocks/ops`, {
+    method: "POST",
+    headers: { ...authHeaders(token, collabGrant), "Content-Type": "application/json; charset=utf-8" },
+    body: JSON.stringify({ ops }),
+  });
+  return parseJsonResponse<BlockOpsResponse>(response, "Apply block ops");
+}
+
 export async function migrateLegacyItems(
   itineraryId: string,
   token: string,
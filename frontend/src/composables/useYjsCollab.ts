@@ -24,6 +24,11 @@ type JoinedPayload = {
   needs_seed: boolean;
 };
 
+type PresenceDiffPayload = {
+  type: "collab:presence_diff";
+  participants: CollabParticipant[];
+};
+
 type UpdatePayload = {
   type: "collab:update";
   update_b64: string;
@@ -69,11 +74,32 @@ export function useYjsCollab(options: UseYjsCollabOptions) {
   const connected = ref(false);
   const error = ref("");
   const remoteCursors = ref<Map<string, { clientId: string; timestamp: number }>>(new Map());
+  // Raw roster keyed by session so presence diffs can be merged before dedup by user.
+  const rosterBySession = new Map<string, CollabParticipant>();
 
   let suppressLocalEmit = false;
   let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
   let connectKey = "";
 
+  function applyRoster() {
+    const roster = [...rosterBySession.values()];
+    participants.value = normalizeParticipants(roster);
+
+    // Extract cursors from presence
+    const newCursors = new Map<string, { clientId: string; timestamp: number }>();
+    for (const p of roster) {
+      const participantId = p.participant_user_id || p.session_id;
+      const cursorClientId = resolveCursorClientId(p.cursor);
+      if (cursorClientId) {
+        newCursors.set(participantId, {
+          clientId: cursorClientId,
+          timestamp: Date.now()
+        });
+      }
+    }
+    remoteCursors.value = newCursors;
+  }
+
   function normalizeParticipants(items: CollabParticipant[]): CollabParticipant[] {
     const dedup = new Map<string, CollabParticipant>();
     for (const item of items) {
@@ -223,23 +249,23 @@ export function useYjsCollab(options: UseYjsCollabOptions) {
         error.value = message || "实时协作错误";
         return;
       }
+      if (type === "collab:presence_diff") {
+        // Only participants whose cursor changed since the last server tick.
+        for (const p of (payload as PresenceDiffPayload).participants || []) {
+          if (rosterBySession.has(p.session_id)) {
+            rosterBySession.set(p.session_id, p);
+          }
+        }
+        applyRoster();
+        return;
+      }
       if (type === "collab:presence" || type === "collab:joined") {
         const payloadJoinedOrPresence = payload as unknown as { participants: CollabParticipant[] };
-        participants.value = normalizeParticipants(payloadJoinedOrPresence.participants || []);
-
-        // Extract cursors from presence
-        const newCursors = new Map<string, { clientId: string; timestamp: number }>();
+        rosterBySession.clear();
         for (const p of payloadJoinedOrPresence.participants || []) {
-          const participantId = p.participant_user_id || p.session_id;
-          const cursorClientId = resolveCursorClientId(p.cursor);
-          if (cursorClientId) {
-            newCursors.set(participantId, {
-              clientId: cursorClientId,
-              timestamp: Date.now()
-            });
-          }
+          rosterBySession.set(p.session_id, p);
         }
-        remoteCursors.value = newCursors;
+        applyRoster();
 
         if (type === "collab:joined") {
           const joined = payload as unknown as JoinedPayload;